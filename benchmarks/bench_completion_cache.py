@@ -0,0 +1,145 @@
+"""
+Benchmark: the client API's LLM completion cache.
+
+Builds an agent conversation of ``--turns`` tool-calling turns against the
+documentation server's tool schemas and, for every turn's prompt, times:
+
+- make_key: hashing model, messages, tools and parameters
+- memory_hit: a lookup served from the in-memory LRU
+- disk_hit: a lookup served from SQLite by a fresh cache, as after a restart
+
+and compares them with ``--llm-latency-ms``, the provider round trip an
+uncached turn pays.
+
+    uv run python benchmarks/bench_completion_cache.py --turns 20 --llm-latency-ms 800
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+
+from mcp_hello.benchmark import summarize
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "dsp", "mcp-client", "api"))
+from utils.completion_cache import CompletionCache  # noqa: E402
+
+MODEL = "meta/llama-3.1-70b-instruct"
+PARAMS = {"max_tokens": 1000}
+TOOLS = [
+    {
+        "type": "function",
+        "function": {
+            "name": name,
+            "description": description,
+            "parameters": {"type": "object", "properties": properties, "required": list(properties)},
+        },
+    }
+    for name, description, properties in [
+        ("search_documentation", "Full-text search over the documentation index",
+         {"query": {"type": "string"}, "limit": {"type": "integer"}}),
+        ("get_documentation_from_database", "Index statistics and recently added documents", {}),
+        ("add_documentation", "Add or update a document", {"title": {"type": "string"}, "content": {"type": "string"}}),
+    ]
+]
+
+
+def make_prompts(turns: int):
+    """The prompt of every turn of one agent run: each turn appends an
+    assistant tool call and its (~2 KB) result"""
+    messages = [{"role": "user", "content": "Summarise what the docs say about deployment"}]
+    prompts = []
+    for turn in range(turns):
+        prompts.append(list(messages))
+        call_id = f"call_{turn}"
+        messages.append({
+            "role": "assistant",
+            "content": None,
+            "tool_calls": [{
+                "id": call_id,
+                "type": "function",
+                "function": {"name": "search_documentation", "arguments": json.dumps({"query": f"deployment {turn}"})},
+            }],
+        })
+        messages.append({"role": "tool", "tool_call_id": call_id, "content": json.dumps({
+            "results": [{"id": f"doc-{turn}-{i}", "snippet": "deploy the server with docker " * 8} for i in range(8)],
+        })})
+    return prompts
+
+
+def make_completion(turn: int) -> str:
+    return json.dumps({
+        "id": f"chatcmpl-{turn}",
+        "object": "chat.completion",
+        "created": 0,
+        "model": MODEL,
+        "choices": [{
+            "index": 0,
+            "finish_reason": "tool_calls",
+            "message": {"role": "assistant", "content": None, "tool_calls": [{
+                "id": f"call_{turn}",
+                "type": "function",
+                "function": {"name": "search_documentation", "arguments": json.dumps({"query": f"deployment {turn}"})},
+            }]},
+        }],
+    })
+
+
+def latency(latencies):
+    return summarize(latencies, 0, sum(latencies))["latency_ms"]
+
+
+async def run(args):
+    prompts = make_prompts(args.turns)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "completions.db")
+        cache = CompletionCache(path=path)
+        key_latencies, memory_latencies = [], []
+        keys = []
+        for turn, prompt in enumerate(prompts):
+            start = time.perf_counter()
+            key = cache.make_key(MODEL, prompt, TOOLS, PARAMS)
+            key_latencies.append(time.perf_counter() - start)
+            keys.append(key)
+            await cache.put(key, make_completion(turn))
+        for _ in range(args.runs):
+            for key in keys:
+                start = time.perf_counter()
+                await cache.get(key)
+                memory_latencies.append(time.perf_counter() - start)
+        cache.close()
+
+        # max_size=0: every lookup goes to SQLite
+        restarted = CompletionCache(path=path, max_size=0)
+        disk_latencies = []
+        for _ in range(args.runs):
+            for key in keys:
+                start = time.perf_counter()
+                assert await restarted.get(key) is not None
+                disk_latencies.append(time.perf_counter() - start)
+        restarted.close()
+
+    return {
+        "turns": args.turns,
+        "prompt_kb": round(len(json.dumps(prompts[-1])) / 1024, 1),
+        "make_key": latency(key_latencies),
+        "memory_hit": latency(memory_latencies),
+        "disk_hit": latency(disk_latencies),
+        "miss_llm_ms": args.llm_latency_ms,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LLM completion cache benchmark")
+    parser.add_argument("--turns", type=int, default=20)
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--llm-latency-ms", type=float, default=800.0)
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
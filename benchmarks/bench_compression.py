@@ -0,0 +1,92 @@
+"""
+Benchmark: response compression, bytes on the wire vs latency.
+
+Starts the server in-process and calls say_hello_batch with small, medium
+and large batches, once per response encoding (identity plus every
+encoding the server has installed). Reports the response size as sent,
+the p50 latency including decompression on loopback, and the estimated
+time to transfer the response over a ``--bandwidth-mbps`` link.
+
+    uv run python benchmarks/bench_compression.py --bandwidth-mbps 100
+"""
+
+import argparse
+import asyncio
+import json
+import time
+import zlib
+
+import aiohttp
+
+from mcp_hello.benchmark import InProcessServer, summarize
+from mcp_hello.compression import available_encodings
+from mcp_hello.http_client_example import MCPHttpClient
+
+HOST, PORT = "127.0.0.1", 3012
+SIZES = {"small": 1, "medium": 100, "large": 5000}
+
+
+def decompress(body: bytes, encoding: str) -> bytes:
+    if encoding == "gzip":
+        return zlib.decompress(body, 31)
+    if encoding == "br":
+        import brotli
+
+        return brotli.decompress(body)
+    if encoding == "zstd":
+        import zstandard
+
+        return zstandard.ZstdDecompressor().decompressobj().decompress(body)
+    return body
+
+
+async def measure(session: aiohttp.ClientSession, url: str, headers, payload, encoding: str, runs: int):
+    headers = {**headers, "Accept-Encoding": encoding}
+    latencies, sizes = [], []
+    start = time.perf_counter()
+    for _ in range(runs):
+        call_start = time.perf_counter()
+        async with session.post(url, json=payload, headers=headers) as response:
+            body = await response.read()
+            used = response.headers.get("Content-Encoding", "identity")
+        decompress(body, used)
+        latencies.append(time.perf_counter() - call_start)
+        sizes.append(len(body))
+    stats = summarize(latencies, 0, time.perf_counter() - start)
+    return {"encoding": used, "wire_bytes": max(sizes), "p50_ms": stats["latency_ms"]["p50"]}
+
+
+async def run(args):
+    server = InProcessServer(HOST, PORT)
+    await server.start()
+    url = f"http://{HOST}:{PORT}/mcp/"
+    results = {}
+    try:
+        async with MCPHttpClient(url, verbose=False) as client:
+            headers = {key: value for key, value in client._headers.items() if key != "Accept-Encoding"}
+        # auto_decompress=False keeps the body as it was sent
+        async with aiohttp.ClientSession(auto_decompress=False) as session:
+            for label, count in SIZES.items():
+                payload = client._make_request("tools/call", client._tool_params("say_hello_batch", {
+                    "requests": [{"name": f"User {i}", "language": "fr"} for i in range(count)],
+                }))
+                results[label] = {}
+                for encoding in ["identity"] + available_encodings():
+                    stats = await measure(session, url, headers, payload, encoding, args.runs)
+                    stats["transfer_ms"] = round(stats["wire_bytes"] * 8 / (args.bandwidth_mbps * 1e3), 3)
+                    results[label][encoding] = stats
+    finally:
+        await server.stop()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Response compression benchmark")
+    parser.add_argument("--runs", type=int, default=50)
+    parser.add_argument("--bandwidth-mbps", type=float, default=100.0)
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Benchmark: documentation index ingestion and search on a synthetic corpus.
+
+Generates ``--documents`` documents from a fixed vocabulary (Zipf-like word
+frequencies, so common and rare terms both occur), then measures:
+
+- bulk ingestion and an incremental re-ingest where ~1% of documents changed
+- search latency for uncached and cached queries
+- concurrent search throughput with 1 vs ``--pool-size`` read connections
+
+    uv run python benchmarks/bench_docs_search.py --documents 100000
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import random
+import tempfile
+import time
+
+from mcp_hello.benchmark import summarize
+from mcp_hello.docs_store import DocumentStore
+
+
+def make_vocabulary(size: int, rng: random.Random):
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    words = set()
+    while len(words) < size:
+        words.add("".join(rng.choice(letters) for _ in range(rng.randint(3, 10))))
+    return sorted(words)
+
+
+def make_corpus(count: int, vocabulary, rng: random.Random):
+    cum_weights = list(itertools.accumulate(1 / (rank + 1) for rank in range(len(vocabulary))))
+    for index in range(count):
+        words = rng.choices(vocabulary, cum_weights=cum_weights, k=rng.randint(80, 250))
+        yield {
+            "id": f"doc-{index}",
+            "title": " ".join(rng.choices(vocabulary, cum_weights=cum_weights, k=6)),
+            "body": " ".join(words),
+            "source": f"synthetic/{index // 1000}/{index}.md",
+        }
+
+
+def make_queries(count: int, vocabulary, rng: random.Random):
+    # Mostly one or two mid-frequency terms, like typical lookups
+    middle = vocabulary[50:2000]
+    return [" ".join(rng.sample(middle, rng.randint(1, 2))) for _ in range(count)]
+
+
+def timed_searches(store: DocumentStore, queries):
+    latencies = []
+    start = time.perf_counter()
+    for query in queries:
+        call_start = time.perf_counter()
+        store.search(query, limit=10)
+        latencies.append(time.perf_counter() - call_start)
+    return summarize(latencies, 0, time.perf_counter() - start)
+
+
+async def concurrent_searches(store: DocumentStore, queries, concurrency: int):
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def search(query):
+        async with semaphore:
+            call_start = time.perf_counter()
+            await asyncio.to_thread(store.search, query, 10, 0)
+            latencies.append(time.perf_counter() - call_start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(search(query) for query in queries))
+    return summarize(latencies, 0, time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Documentation index ingest and search benchmark")
+    parser.add_argument("--documents", type=int, default=100_000)
+    parser.add_argument("--vocabulary", type=int, default=20_000)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--pool-size", type=int, default=4)
+    parser.add_argument("--db", help="Index file (default: a temporary file)")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    vocabulary = make_vocabulary(args.vocabulary, rng)
+    directory = tempfile.mkdtemp(prefix="docs-bench-")
+    path = args.db or os.path.join(directory, "docs.db")
+    results = {}
+
+    store = DocumentStore(path, pool_size=args.pool_size, cache_ttl=0)
+    start = time.perf_counter()
+    counts = store.ingest(make_corpus(args.documents, vocabulary, random.Random(args.seed)))
+    store.optimize()
+    elapsed = time.perf_counter() - start
+    results["ingest"] = {**counts, "seconds": round(elapsed, 2), "docs_per_s": round(args.documents / elapsed)}
+
+    # Re-ingest the same corpus with 1% of the documents edited
+    changed = set(rng.sample(range(args.documents), args.documents // 100))
+
+    def edited():
+        for index, document in enumerate(make_corpus(args.documents, vocabulary, random.Random(args.seed))):
+            if index in changed:
+                document["body"] += " revised"
+            yield document
+
+    start = time.perf_counter()
+    counts = store.ingest(edited())
+    results["reingest_1pct_changed"] = {**counts, "seconds": round(time.perf_counter() - start, 2)}
+    results["index_mb"] = round(os.path.getsize(path) / 1e6, 1)
+
+    queries = make_queries(args.queries, vocabulary, rng)
+    timed_searches(store, queries[:50])
+    results["search_uncached"] = timed_searches(store, queries)
+
+    store.cache_ttl, store.cache_size = 300, len(queries)
+    timed_searches(store, queries)
+    results["search_cached"] = timed_searches(store, queries)
+    store.cache_ttl = 0
+
+    for pool_size in sorted({1, args.pool_size}):
+        store.close()
+        store.pool_size = pool_size
+        results[f"concurrent_pool_{pool_size}"] = asyncio.run(
+            concurrent_searches(store, queries, args.concurrency)
+        )
+    store.close()
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Benchmark: streaming a large file resource in chunks over HTTP.
+
+Writes a ``--size-mb`` file of random bytes, serves it from an in-process
+server and reads it back with ``MCPHttpClient.iter_resource`` for several
+chunk sizes and read-ahead depths. Reports throughput and the peak Python
+heap of the process (client and server together), which should depend on
+the chunk size and read-ahead but not on the file size.
+
+    uv run python benchmarks/bench_file_resources.py --size-mb 200
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+import tracemalloc
+
+from mcp_hello.benchmark import InProcessServer
+from mcp_hello.http_client_example import MCPHttpClient
+
+HOST, PORT = "127.0.0.1", 3011
+
+
+def write_file(path: str, size: int) -> str:
+    digest = hashlib.sha256()
+    with open(path, "wb") as output:
+        remaining = size
+        while remaining:
+            block = os.urandom(min(remaining, 4 * 1024 * 1024))
+            digest.update(block)
+            output.write(block)
+            remaining -= len(block)
+    return digest.hexdigest()
+
+
+async def run(args):
+    directory = tempfile.mkdtemp(prefix="file-bench-")
+    os.environ["MCP_FILES_DIR"] = directory
+    size = args.size_mb * 1024 * 1024
+    expected = write_file(os.path.join(directory, "data.bin"), size)
+
+    from mcp_hello.server import files
+
+    server = InProcessServer(HOST, PORT)
+    await server.start()
+    results = {"size_mb": args.size_mb}
+    try:
+        async with MCPHttpClient(f"http://{HOST}:{PORT}/mcp/", verbose=False) as client:
+            for chunk_kb in args.chunk_kb:
+                files.chunk_size = chunk_kb * 1024
+                for readahead in args.readahead:
+                    digest = hashlib.sha256()
+                    tracemalloc.start()
+                    start = time.perf_counter()
+                    async for chunk in client.iter_resource("file://files/data.bin", readahead):
+                        digest.update(chunk)
+                    elapsed = time.perf_counter() - start
+                    peak = tracemalloc.get_traced_memory()[1]
+                    tracemalloc.stop()
+                    results[f"chunk_{chunk_kb}kb_readahead_{readahead}"] = {
+                        "seconds": round(elapsed, 2),
+                        "mb_per_s": round(args.size_mb / elapsed, 1),
+                        "peak_heap_mb": round(peak / 1e6, 1),
+                        "intact": digest.hexdigest() == expected,
+                    }
+    finally:
+        await server.stop()
+        files.close()
+        shutil.rmtree(directory, ignore_errors=True)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Chunked file resource streaming benchmark")
+    parser.add_argument("--size-mb", type=int, default=200)
+    parser.add_argument("--chunk-kb", type=int, nargs="+", default=[256, 1024, 4096])
+    parser.add_argument("--readahead", type=int, nargs="+", default=[1, 4])
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Micro-benchmark: per-call say_hello vs batched say_hello_batch.
+
+Runs against the Hello World server in-process through the FastMCP
+in-memory client, so the numbers reflect MCP request handling rather
+than network latency.
+
+    uv run python benchmarks/bench_greetings.py --names 1000
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+from fastmcp import Client
+
+from mcp_hello.server import SUPPORTED_LANGUAGES, mcp
+
+
+def make_requests(count: int):
+    return [
+        {"name": f"user-{i}", "language": SUPPORTED_LANGUAGES[i % len(SUPPORTED_LANGUAGES)]}
+        for i in range(count)
+    ]
+
+
+async def bench_per_call(client: Client, requests) -> float:
+    start = time.perf_counter()
+    for request in requests:
+        await client.call_tool("say_hello", {"request": request})
+    return time.perf_counter() - start
+
+
+async def bench_batch(client: Client, requests, batch_size: int) -> float:
+    start = time.perf_counter()
+    for offset in range(0, len(requests), batch_size):
+        await client.call_tool(
+            "say_hello_batch", {"requests": requests[offset:offset + batch_size]}
+        )
+    return time.perf_counter() - start
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Per-call vs batched greetings")
+    parser.add_argument("--names", type=int, default=1000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    requests = make_requests(args.names)
+
+    async with Client(mcp) as client:
+        # Warm up both code paths
+        await bench_per_call(client, requests[:10])
+        await bench_batch(client, requests[:10], 10)
+
+        per_call = min([await bench_per_call(client, requests) for _ in range(args.repeat)])
+        batch = min(
+            [await bench_batch(client, requests, args.batch_size) for _ in range(args.repeat)]
+        )
+
+    print(json.dumps({
+        "names": args.names,
+        "batch_size": args.batch_size,
+        "per_call_s": round(per_call, 4),
+        "per_call_greetings_per_s": round(args.names / per_call, 1),
+        "batch_s": round(batch, 4),
+        "batch_greetings_per_s": round(args.names / batch, 1),
+        "speedup": round(per_call / batch, 1),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
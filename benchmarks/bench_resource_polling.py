@@ -0,0 +1,91 @@
+"""
+Micro-benchmark: cost of polling an idle ``file://server-status``.
+
+Compares a dashboard that re-reads the resource every time with one that
+uses ``read_resource_if_modified`` and one that subscribes and waits for
+``notifications/resources/updated``. Reports latency and the size of the
+JSON-RPC results each approach receives while nothing changes.
+
+    uv run python benchmarks/bench_resource_polling.py --polls 500
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+import mcp.types as types
+from mcp.shared.memory import create_connected_server_and_client_session
+
+from mcp_hello.benchmark import summarize
+from mcp_hello.server import mcp, versions
+
+URI = "file://server-status"
+
+
+def result_bytes(result) -> int:
+    return len(result.model_dump_json(by_alias=True, exclude_none=True))
+
+
+async def poll(polls: int, read):
+    latencies, received = [], 0
+    start = time.perf_counter()
+    for _ in range(polls):
+        call_start = time.perf_counter()
+        received += await read()
+        latencies.append(time.perf_counter() - call_start)
+    stats = summarize(latencies, 0, time.perf_counter() - start)
+    stats["bytes_per_poll"] = round(received / polls)
+    return stats
+
+
+async def run(polls: int, idle_seconds: float):
+    notifications = []
+
+    async def on_message(message):
+        if isinstance(message, types.ServerNotification):
+            notifications.append(message.root)
+
+    results = {}
+    async with create_connected_server_and_client_session(mcp._mcp_server, message_handler=on_message) as session:
+
+        async def full_read():
+            return result_bytes(await session.read_resource(URI))
+
+        etag = ""
+
+        async def conditional_read():
+            nonlocal etag
+            result = await session.call_tool("read_resource_if_modified", {"uri": URI, "etag": etag})
+            etag = result.structuredContent["etag"]
+            return result_bytes(result)
+
+        results["full_read"] = await poll(polls, full_read)
+        results["conditional_read"] = await poll(polls, conditional_read)
+
+        # Subscribed clients receive nothing while the server is idle, then
+        # one notification once a tool call changes the status
+        await session.subscribe_resource(URI)
+        await asyncio.sleep(idle_seconds)
+        idle = len(notifications)
+        await session.call_tool("say_hello", {"request": {"name": "World"}})
+        await asyncio.sleep(versions.interval * 2)
+        results["subscription"] = {
+            "idle_seconds": idle_seconds,
+            "notifications_while_idle": idle,
+            "notifications_after_change": len(notifications) - idle,
+        }
+        await session.unsubscribe_resource(URI)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Resource polling benchmark")
+    parser.add_argument("--polls", type=int, default=500)
+    parser.add_argument("--idle-seconds", type=float, default=3.0)
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run(args.polls, args.idle_seconds)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
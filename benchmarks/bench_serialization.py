@@ -0,0 +1,93 @@
+"""
+Micro-benchmark: JSON work on the hot paths, stdlib json vs orjson.
+
+Builds a large say_hello_batch result (``--greetings`` items) and times,
+per backend of the serialization modules:
+
+- tool_result_text: turning the MCP tool result into the tool message
+  (compared with the previous ``str(result.content)`` repr)
+- dump_messages: encoding a conversation for the journal and store
+- load_response: parsing a JSON-RPC response body in MCPHttpClient
+- tool_serializer: the server rendering a tool result as text (compared
+  with FastMCP's default pydantic_core serializer)
+
+    uv run python benchmarks/bench_serialization.py --greetings 10000
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import pydantic_core
+from mcp.types import CallToolResult, TextContent
+
+from mcp_hello import serialization as server_serialization
+from mcp_hello.benchmark import summarize
+from mcp_hello.server import GreetingRequest, build_greeting
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "dsp", "mcp-client", "api"))
+from utils import serialization as client_serialization  # noqa: E402
+
+LANGUAGES = ["en", "es", "fr", "de", "it", "pt", "ru", "ja", "ko", "zh"]
+
+
+def timed(fn, runs: int):
+    fn()
+    latencies = []
+    start = time.perf_counter()
+    for _ in range(runs):
+        call_start = time.perf_counter()
+        fn()
+        latencies.append(time.perf_counter() - call_start)
+    return summarize(latencies, 0, time.perf_counter() - start)["latency_ms"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JSON serialization benchmark")
+    parser.add_argument("--greetings", type=int, default=10_000)
+    parser.add_argument("--runs", type=int, default=50)
+    args = parser.parse_args()
+
+    payload = {
+        "greetings": [
+            build_greeting(GreetingRequest(name=f"User {i}", language=LANGUAGES[i % len(LANGUAGES)]))
+            for i in range(args.greetings)
+        ],
+        "count": args.greetings,
+    }
+    text = json.dumps(payload)
+    result = CallToolResult(content=[TextContent(type="text", text=text)], structuredContent=payload)
+    messages = [
+        {"role": "user", "content": "Greet everyone"},
+        {"role": "tool", "tool_call_id": "call_0", "content": text},
+        {"role": "assistant", "content": "Done."},
+    ]
+    response = json.dumps({"jsonrpc": "2.0", "id": "1", "result": result.model_dump(mode="json")}).encode()
+
+    results = {
+        "payload_kb": round(len(text) / 1024),
+        # Size of the tool message the LLM sees
+        "tool_message_kb": {
+            "repr": round(len(str(result.content)) / 1024),
+            "structured": round(len(client_serialization.tool_result_text(result)) / 1024),
+        },
+        "tool_result_text": {"repr": timed(lambda: str(result.content), args.runs)},
+        "dump_messages": {},
+        "load_response": {},
+        "tool_serializer": {"pydantic_core": timed(lambda: pydantic_core.to_json(payload, fallback=str).decode(), args.runs)},
+    }
+    backends = ["json"] + (["orjson"] if client_serialization.orjson is not None else [])
+    for backend in backends:
+        client_serialization.BACKEND = server_serialization.BACKEND = backend
+        results["tool_result_text"][backend] = timed(lambda: client_serialization.tool_result_text(result), args.runs)
+        results["dump_messages"][backend] = timed(lambda: client_serialization.dumps(messages), args.runs)
+        results["load_response"][backend] = timed(lambda: server_serialization.loads(response), args.runs)
+        results["tool_serializer"][backend] = timed(lambda: server_serialization.dumps(payload), args.runs)
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""
+Benchmark: parsing large tool results from MCP HTTP responses.
+
+Compares, on synthetic responses of increasing size,
+- the previous line-by-line approach (``async for line in response.content``,
+  decode + strip every line, json.loads every ``data:`` line regardless of
+  its request id),
+- the incremental SSEParser used by MCPHttpClient, and
+- a plain application/json body (FASTMCP_JSON_RESPONSE=true on the server).
+
+Each SSE stream interleaves progress notifications for other requests with
+the final response. The body is fed in fixed-size chunks into a real
+aiohttp StreamReader, which is what ``response.content`` is. With aiohttp's
+default read limit the line-by-line approach fails outright on lines over
+128 KiB ("Chunk too big"); it is then re-timed with a raised limit.
+
+    uv run python benchmarks/bench_sse_parser.py --sizes 10000,1000000,10000000
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+import aiohttp
+from aiohttp.base_protocol import BaseProtocol
+
+from mcp_hello.sse import SSEParser
+
+DEFAULT_LIMIT = 2 ** 16
+
+REQUEST_ID = "5f0c6a8e-3f8b-4e0a-9a49-6a3a0c1d2e7f"
+
+
+def make_result(size: int) -> dict:
+    text = "x" * size
+    return {
+        "jsonrpc": "2.0",
+        "id": REQUEST_ID,
+        "result": {"content": [{"type": "text", "text": text}], "isError": False},
+    }
+
+
+def make_sse_stream(response: dict, notifications: int) -> bytes:
+    events = []
+    for i in range(notifications):
+        note = {
+            "jsonrpc": "2.0",
+            "method": "notifications/progress",
+            "params": {"progressToken": f"other-{i}", "progress": i, "total": notifications},
+        }
+        events.append(b"event: message\r\ndata: " + json.dumps(note).encode() + b"\r\n\r\n")
+    events.append(b"event: message\r\ndata: " + json.dumps(response).encode() + b"\r\n\r\n")
+    return b"".join(events)
+
+
+def stream_reader(body: bytes, chunk_size: int, limit: int = DEFAULT_LIMIT):
+    loop = asyncio.get_running_loop()
+    reader = aiohttp.StreamReader(BaseProtocol(loop), limit, loop=loop)
+    for offset in range(0, len(body), chunk_size):
+        reader.feed_data(body[offset:offset + chunk_size])
+    reader.feed_eof()
+    return reader
+
+
+async def parse_line_by_line(reader):
+    """The previous MCPHttpClient._send_request loop"""
+    async for line in reader:
+        line = line.decode("utf-8").strip()
+        if line.startswith("data: "):
+            data = line[6:]
+            if data == "[DONE]":
+                break
+            try:
+                result = json.loads(data)
+                if result.get("id") == REQUEST_ID:
+                    return result.get("result", result)
+            except json.JSONDecodeError:
+                continue
+    raise Exception("No valid response received")
+
+
+async def parse_incremental(reader):
+    parser = SSEParser()
+    marker = REQUEST_ID.encode()
+    async for chunk in reader.iter_any():
+        for event in parser.feed(chunk):
+            if marker not in event.data:
+                continue
+            result = json.loads(event.data)
+            if result.get("id") == REQUEST_ID:
+                return result.get("result", result)
+    raise Exception("No valid response received")
+
+
+def parse_json_body(body: bytes):
+    result = json.loads(body)
+    return result.get("result", result)
+
+
+async def best_of(repeat: int, make_reader, parse) -> float:
+    timings = []
+    for _ in range(repeat):
+        reader = make_reader()
+        start = time.perf_counter()
+        await parse(reader)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="SSE parsing benchmark")
+    parser.add_argument("--sizes", default="1000,100000,1000000,10000000")
+    parser.add_argument("--notifications", type=int, default=50)
+    parser.add_argument("--chunk-size", type=int, default=64 * 1024)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    results = []
+    for size in [int(value) for value in args.sizes.split(",")]:
+        response = make_result(size)
+        sse_body = make_sse_stream(response, args.notifications)
+        json_body = json.dumps(response).encode()
+        row = {"result_bytes": size}
+
+        try:
+            line_by_line = await best_of(
+                args.repeat,
+                lambda: stream_reader(sse_body, args.chunk_size),
+                parse_line_by_line,
+            )
+        except ValueError as e:
+            row["line_by_line_default_limit"] = f"failed: {e}"
+            line_by_line = await best_of(
+                args.repeat,
+                lambda: stream_reader(sse_body, args.chunk_size, limit=len(sse_body)),
+                parse_line_by_line,
+            )
+        incremental = await best_of(
+            args.repeat,
+            lambda: stream_reader(sse_body, args.chunk_size),
+            parse_incremental,
+        )
+
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            parse_json_body(json_body)
+        json_only = (time.perf_counter() - start) / args.repeat
+
+        row.update({
+            "line_by_line_ms": round(line_by_line * 1000, 3),
+            "incremental_sse_ms": round(incremental * 1000, 3),
+            "json_body_ms": round(json_only * 1000, 3),
+            "sse_speedup": round(line_by_line / incremental, 2),
+        })
+        results.append(row)
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,157 @@
+"""
+Startup benchmark: import time and cold start to the first served request.
+
+For each target a fresh interpreter is started per run, so nothing is
+cached in-process:
+
+- import: time to import the module (``mcp_client``, the client API
+  ``main`` and ``mcp_hello.server``)
+- client-api: spawn the client API with uvicorn until ``GET /health``
+  answers and until the first ``GET /tools`` (or ``POST /query`` with
+  ``--query``) succeeds
+- server: spawn ``python -m mcp_hello.server`` until the first
+  ``say_hello`` call succeeds
+
+The client API reads its MCP server and LLM settings from the environment
+(see ``.env.example``); ``--query`` needs a reachable LLM.
+
+    uv run python benchmarks/bench_startup.py --runs 5
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+import aiohttp
+
+from mcp_hello.http_client_example import MCPHttpClient
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+API_DIR = os.path.join(ROOT, "dsp", "mcp-client", "api")
+
+IMPORTS = {
+    "mcp_client": (API_DIR, "mcp_client"),
+    "client_api": (API_DIR, "main"),
+    "mcp_hello.server": (ROOT, "mcp_hello.server"),
+}
+
+
+def import_time(directory: str, module: str) -> float:
+    code = (
+        "import sys, time; sys.path.insert(0, {!r}); start = time.perf_counter(); "
+        "import {}; print(time.perf_counter() - start)"
+    ).format(directory, module)
+    output = subprocess.run(
+        [sys.executable, "-c", code], cwd=directory, capture_output=True, text=True, check=True
+    ).stdout
+    return float(output.strip().splitlines()[-1])
+
+
+async def until_ok(request, timeout: float):
+    """Retry ``request`` until it succeeds; connection errors mean not up yet"""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            return await request()
+        except (aiohttp.ClientConnectionError, OSError):
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"No successful response within {timeout}s")
+            await asyncio.sleep(0.02)
+
+
+async def cold_start(command, cwd: str, requests, timeout: float):
+    """Seconds from spawning ``command`` until each of ``requests`` succeeds"""
+    start = time.perf_counter()
+    process = subprocess.Popen(command, cwd=cwd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        elapsed = []
+        for request in requests:
+            await until_ok(request, timeout)
+            elapsed.append(time.perf_counter() - start)
+        return elapsed
+    finally:
+        process.terminate()
+        await asyncio.to_thread(process.wait, 30)
+
+
+async def client_api_start(port: int, query: str, timeout: float):
+    base = f"http://127.0.0.1:{port}"
+
+    async def health():
+        async with aiohttp.ClientSession() as session:
+            async with session.get(f"{base}/health") as response:
+                response.raise_for_status()
+
+    async def request():
+        async with aiohttp.ClientSession() as session:
+            if query:
+                response = await session.post(f"{base}/query", json={"query": query})
+            else:
+                response = await session.get(f"{base}/tools")
+            async with response:
+                response.raise_for_status()
+
+    command = [
+        sys.executable, "-m", "uvicorn", "--app-dir", API_DIR, "main:app",
+        "--port", str(port), "--log-level", "warning",
+    ]
+    return await cold_start(command, API_DIR, [health, request], timeout)
+
+
+async def server_start(port: int, timeout: float) -> float:
+    async def request():
+        async with MCPHttpClient(f"http://127.0.0.1:{port}/mcp/", verbose=False) as client:
+            await client.call_tool("say_hello")
+
+    command = [sys.executable, "-m", "mcp_hello.server", "--port", str(port)]
+    return (await cold_start(command, ROOT, [request], timeout))[0]
+
+
+def summarize(samples):
+    return {
+        "median_s": round(statistics.median(samples), 4),
+        "min_s": round(min(samples), 4),
+        "max_s": round(max(samples), 4),
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Import time and cold start to first request")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--port", type=int, default=3198)
+    parser.add_argument("--query", default="", help="Measure the first POST /query instead of GET /tools")
+    parser.add_argument("--timeout", type=float, default=60)
+    parser.add_argument(
+        "--targets", default="import,client-api,server",
+        help="Comma separated: import, client-api, server",
+    )
+    args = parser.parse_args()
+    targets = args.targets.split(",")
+
+    results = {}
+    if "import" in targets:
+        for name, (directory, module) in IMPORTS.items():
+            samples = [import_time(directory, module) for _ in range(args.runs)]
+            results[f"import {name}"] = summarize(samples)
+    if "client-api" in targets:
+        samples = [await client_api_start(args.port, args.query, args.timeout) for _ in range(args.runs)]
+        results["client-api first /health"] = summarize([health for health, _ in samples])
+        results["client-api first " + ("/query" if args.query else "/tools")] = summarize(
+            [first for _, first in samples]
+        )
+    if "server" in targets:
+        samples = [await server_start(args.port, args.timeout) for _ in range(args.runs)]
+        results["server first say_hello"] = summarize(samples)
+
+    for name, result in results.items():
+        print(f"{name:<32} median {result['median_s'] * 1000:8.1f} ms")
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
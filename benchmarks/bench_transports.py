@@ -0,0 +1,107 @@
+"""
+Micro-benchmark: per-call tool latency over stdio, HTTP and in-process.
+
+Calls ``say_hello`` on the Hello World server sequentially through the
+same MCP client session API the client application uses:
+
+- stdio: the server in a child process over stdin/stdout pipes
+- http: ``python -m mcp_hello.server`` over streamable HTTP
+- inprocess: the FastMCP object imported here, over memory streams
+
+    uv run python benchmarks/bench_transports.py --calls 500
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from contextlib import asynccontextmanager
+
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
+from mcp.client.streamable_http import streamablehttp_client
+from mcp.shared.memory import create_connected_server_and_client_session
+
+from mcp_hello.benchmark import SubprocessServer, summarize
+
+ARGUMENTS = {"request": {"name": "World", "language": "en"}}
+
+
+@asynccontextmanager
+async def stdio_session():
+    params = StdioServerParameters(
+        command=sys.executable,
+        args=["-c", "from mcp_hello.server import mcp; mcp.run(show_banner=False)"],
+    )
+    async with stdio_client(params) as (read, write):
+        async with ClientSession(read, write) as session:
+            await session.initialize()
+            yield session
+
+
+@asynccontextmanager
+async def http_session(port: int):
+    server = SubprocessServer("127.0.0.1", port, workers=1)
+    await server.start()
+    try:
+        async with streamablehttp_client(f"{server.base}/mcp/") as (read, write, _):
+            async with ClientSession(read, write) as session:
+                await session.initialize()
+                yield session
+    finally:
+        await server.stop()
+
+
+@asynccontextmanager
+async def inprocess_session():
+    from mcp_hello.server import mcp
+
+    async with create_connected_server_and_client_session(mcp._mcp_server) as session:
+        yield session
+
+
+async def bench(session: ClientSession, calls: int, warmup: int = 20):
+    for _ in range(warmup):
+        await session.call_tool("say_hello", ARGUMENTS)
+    latencies = []
+    start = time.perf_counter()
+    for _ in range(calls):
+        call_start = time.perf_counter()
+        await session.call_tool("say_hello", ARGUMENTS)
+        latencies.append(time.perf_counter() - call_start)
+    return summarize(latencies, 0, time.perf_counter() - start)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Per-call latency by MCP transport")
+    parser.add_argument("--calls", type=int, default=500)
+    parser.add_argument("--port", type=int, default=3199, help="Port for the HTTP server")
+    parser.add_argument(
+        "--transports", default="stdio,http,inprocess",
+        help="Comma separated transports to measure",
+    )
+    args = parser.parse_args()
+
+    sessions = {
+        "stdio": stdio_session,
+        "http": lambda: http_session(args.port),
+        "inprocess": inprocess_session,
+    }
+    results = {}
+    for name in args.transports.split(","):
+        async with sessions[name]() as session:
+            results[name] = await bench(session, args.calls)
+
+    print(f"{'transport':<10} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'calls/s':>9}")
+    for name, result in results.items():
+        latency = result["latency_ms"]
+        print(
+            f"{name:<10} {latency['p50']:>8.3f} {latency['p95']:>8.3f} "
+            f"{latency['p99']:>8.3f} {result['throughput_rps']:>9.1f}"
+        )
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,258 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Callable, Dict, Optional, Set
+
+from mcp_client import MCPClient, is_transport_error
+from utils.logger import logger
+
+
+class MCPClientPool:
+    """Pool of connected MCPClient sessions.
+
+    Each client owns its own MCP session, so requests checked out from the
+    pool never share a transport. Clients are created lazily up to
+    ``max_size`` and ``min_size`` of them are connected on start. A client
+    whose transport fails while checked out is discarded instead of being
+    returned, and the pool is grown back to ``min_size`` in the background.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], MCPClient],
+        min_size: int = 1,
+        max_size: int = 4,
+        acquire_timeout: Optional[float] = None,
+    ):
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError(
+                f"Invalid pool size: min_size={min_size}, max_size={max_size}"
+            )
+        self.factory = factory
+        self.min_size = min_size
+        self.max_size = max_size
+        self.acquire_timeout = acquire_timeout
+        self.logger = logger
+
+        self._idle: asyncio.Queue = asyncio.Queue()
+        # client -> (owner task, stop event)
+        self._owners: Dict[MCPClient, tuple] = {}
+        self._size = 0
+        # Clients still being connected by a background warm-up
+        self._warming = 0
+        self._warm_task: Optional[asyncio.Task] = None
+        # Background connects replacing discarded clients
+        self._replenishing: Set[asyncio.Task] = set()
+        self._closed = False
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    @property
+    def idle(self) -> int:
+        return self._idle.qsize()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "size": self._size,
+            "idle": self.idle,
+            "in_use": self._size - self.idle,
+            "min_size": self.min_size,
+            "max_size": self.max_size,
+        }
+
+    async def start(self, wait: bool = True):
+        """Connect the initial ``min_size`` clients.
+
+        With ``wait=False`` they connect in the background and checkouts
+        wait for them instead of growing the pool, so a server can start
+        accepting requests before its MCP sessions are up.
+        """
+        self.logger.info(
+            f"Starting MCP client pool (min={self.min_size}, max={self.max_size})"
+        )
+        if not wait:
+            self._warming = self.min_size
+            self._warm_task = asyncio.create_task(self._warm_up())
+            return
+        for _ in range(self.min_size):
+            self._size += 1
+            try:
+                client = await self._spawn()
+            except Exception:
+                self._size -= 1
+                raise
+            self._idle.put_nowait(client)
+
+    async def _warm_up(self):
+        async def connect():
+            self._size += 1
+            try:
+                client = await self._spawn()
+            except Exception as e:
+                self._size -= 1
+                self.logger.error(f"Error warming up MCP client pool: {e}")
+                return
+            finally:
+                self._warming -= 1
+            await self.checkin(client)
+
+        await asyncio.gather(*(connect() for _ in range(self.min_size)))
+
+    async def _spawn(self) -> MCPClient:
+        """Create a client whose session lives in a dedicated owner task.
+
+        MCP transports are built on anyio task groups, which must be exited
+        from the task that entered them, so connect and cleanup both run in
+        the owner task rather than in whichever request grew the pool.
+        """
+        client = self.factory()
+        loop = asyncio.get_running_loop()
+        ready = loop.create_future()
+        stop = asyncio.Event()
+
+        async def owner():
+            try:
+                await client.connect_to_server()
+            except Exception as e:
+                if not ready.done():
+                    ready.set_exception(e)
+                return
+            ready.set_result(client)
+            await stop.wait()
+            try:
+                await client.cleanup()
+            except Exception as e:
+                self.logger.error(f"Error closing pooled client: {e}")
+
+        task = asyncio.create_task(owner())
+        try:
+            await ready
+        except BaseException:
+            task.cancel()
+            raise
+        self._owners[client] = (task, stop)
+        self.logger.info(f"MCP client pool grew to {self._size}")
+        return client
+
+    async def checkout(self) -> MCPClient:
+        """Take an idle client, growing the pool if it is below max_size"""
+        if self._closed:
+            raise RuntimeError("MCP client pool is closed")
+
+        try:
+            return self._idle.get_nowait()
+        except asyncio.QueueEmpty:
+            pass
+
+        if self._warming:
+            # Wait for a warming client; if the warm-up ends without one
+            # (e.g. it failed), fall through to growing the pool
+            getter = asyncio.ensure_future(self._idle.get())
+            done, _ = await asyncio.wait(
+                {getter, self._warm_task},
+                timeout=self.acquire_timeout,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            if getter in done:
+                return getter.result()
+            getter.cancel()
+            if not done:
+                raise asyncio.TimeoutError("Timed out waiting for MCP client pool warm-up")
+            return await self.checkout()
+
+        if self._size < self.max_size:
+            self._size += 1
+            try:
+                return await self._spawn()
+            except BaseException:
+                self._size -= 1
+                raise
+
+        return await asyncio.wait_for(self._idle.get(), self.acquire_timeout)
+
+    async def checkin(self, client: MCPClient):
+        """Return a client to the pool"""
+        if self._closed:
+            await self.discard(client)
+            return
+        self._idle.put_nowait(client)
+
+    async def discard(self, client: MCPClient):
+        """Drop a client from the pool and close its session"""
+        owner = self._owners.pop(client, None)
+        if owner is None:
+            return
+        self._size -= 1
+        task, stop = owner
+        stop.set()
+        await task
+
+    async def tools(self):
+        """The MCP tool list, without checking a client out.
+
+        Served from the registry of any connected client, busy or idle; if
+        every registry is stale, one client refreshes it over its session,
+        which multiplexes the request with whatever the client is running.
+        """
+        for client in list(self._owners):
+            tools = client.cached_mcp_tools()
+            if tools is not None:
+                return tools
+        for client in list(self._owners):
+            return await client.get_mcp_tools()
+        # No client connected yet
+        async with self.acquire() as client:
+            return await client.get_mcp_tools()
+
+    def _replenish(self):
+        """Connect clients in the background until the pool is back at
+        ``min_size``"""
+
+        async def connect():
+            try:
+                client = await self._spawn()
+            except Exception as e:
+                self._size -= 1
+                self.logger.error(f"Error replacing discarded MCP client: {e}")
+                return
+            await self.checkin(client)
+
+        while not self._closed and self._size < self.min_size:
+            self._size += 1
+            task = asyncio.create_task(connect())
+            self._replenishing.add(task)
+            task.add_done_callback(self._replenishing.discard)
+
+    @asynccontextmanager
+    async def acquire(self):
+        client = await self.checkout()
+        try:
+            yield client
+        except Exception as e:
+            if not is_transport_error(e):
+                await self.checkin(client)
+                raise
+            self.logger.error(f"Discarding MCP client after transport failure: {e}")
+            try:
+                await self.discard(client)
+            except Exception as close_error:
+                self.logger.error(f"Error closing failed MCP client: {close_error}")
+            self._replenish()
+            raise
+        except BaseException:
+            await self.checkin(client)
+            raise
+        else:
+            await self.checkin(client)
+
+    async def close(self):
+        self._closed = True
+        if self._warm_task is not None:
+            await self._warm_task
+        if self._replenishing:
+            await asyncio.gather(*self._replenishing)
+        while not self._idle.empty():
+            await self.discard(self._idle.get_nowait())
+        # Clients still checked out are closed as they are checked in
+        self.logger.info("MCP client pool closed")
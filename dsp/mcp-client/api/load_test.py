@@ -0,0 +1,144 @@
+"""
+Load test for the MCP Client API /query endpoint.
+
+Fires concurrent /query requests and reports throughput and latency. With
+--pool-sizes the API is started once per pool size (as a uvicorn subprocess
+with MCP_POOL_MIN_SIZE/MCP_POOL_MAX_SIZE set) so throughput can be compared
+as the pool grows.
+
+Examples:
+    python load_test.py --url http://localhost:8000 --requests 50 --concurrency 10
+    python load_test.py --pool-sizes 1,2,4,8 --requests 40 --concurrency 8
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def run_load(url: str, query: str, total: int, concurrency: int):
+    """Send ``total`` queries with at most ``concurrency`` in flight"""
+    latencies = []
+    errors = 0
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async with httpx.AsyncClient(base_url=url, timeout=300) as http:
+
+        async def one():
+            nonlocal errors
+            async with semaphore:
+                start = time.perf_counter()
+                try:
+                    response = await http.post("/query", json={"query": query})
+                    response.raise_for_status()
+                    latencies.append(time.perf_counter() - start)
+                except Exception as e:
+                    errors += 1
+                    print(f"Request failed: {e}", file=sys.stderr)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(total)))
+        elapsed = time.perf_counter() - start
+
+    return {
+        "requests": total,
+        "concurrency": concurrency,
+        "errors": errors,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(len(latencies) / elapsed, 3) if elapsed else 0.0,
+        "latency_mean_s": round(statistics.mean(latencies), 3) if latencies else 0.0,
+        "latency_p50_s": round(percentile(latencies, 50), 3),
+        "latency_p95_s": round(percentile(latencies, 95), 3),
+    }
+
+
+async def wait_until_ready(url: str, timeout: float = 120):
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(base_url=url, timeout=5) as http:
+        while time.monotonic() < deadline:
+            try:
+                response = await http.get("/tools")
+                if response.status_code == 200:
+                    return
+            except httpx.HTTPError:
+                pass
+            await asyncio.sleep(0.5)
+    raise TimeoutError(f"API at {url} did not become ready in {timeout}s")
+
+
+async def run_with_pool_size(pool_size: int, port: int, args):
+    """Start the API with a fixed pool size and load it"""
+    env = dict(
+        os.environ,
+        MCP_POOL_MIN_SIZE=str(pool_size),
+        MCP_POOL_MAX_SIZE=str(pool_size),
+    )
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port)],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    url = f"http://127.0.0.1:{port}"
+    try:
+        await wait_until_ready(url)
+        result = await run_load(url, args.query, args.requests, args.concurrency)
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+    return {"pool_size": pool_size, **result}
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Load test the /query endpoint")
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--query", default="What is this project about?")
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument(
+        "--pool-sizes",
+        help="Comma separated pool sizes; starts the API once per size",
+    )
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    if not args.pool_sizes:
+        result = await run_load(args.url, args.query, args.requests, args.concurrency)
+        print(json.dumps(result, indent=2))
+        return
+
+    results = []
+    for pool_size in [int(size) for size in args.pool_sizes.split(",")]:
+        result = await run_with_pool_size(pool_size, args.port, args)
+        print(json.dumps(result))
+        results.append(result)
+
+    baseline = results[0]["throughput_rps"] or 1.0
+    print()
+    print(f"{'pool':>6} {'rps':>10} {'speedup':>9} {'p50 s':>8} {'p95 s':>8}")
+    for result in results:
+        print(
+            f"{result['pool_size']:>6} {result['throughput_rps']:>10.3f} "
+            f"{result['throughput_rps'] / baseline:>8.2f}x "
+            f"{result['latency_p50_s']:>8.3f} {result['latency_p95_s']:>8.3f}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,9 +1,18 @@
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response, StreamingResponse
 from pydantic import BaseModel
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+import uuid
 from contextlib import asynccontextmanager
 from mcp_client import MCPClient
+from client_pool import MCPClientPool
+from utils.journal import ConversationJournal
+from utils.tool_cache import ToolResultCache
+from utils.completion_cache import CompletionCache
+from utils.tracing import Tracer
+from utils.conversation_store import ConversationStore
+from utils import serialization
 from dotenv import load_dotenv
 from pydantic_settings import BaseSettings
 
@@ -17,27 +26,62 @@ class Settings(BaseSettings):
     mcp_server_command: str = "python"
     mcp_server_timeout: int = 30
 
+    # MCP client pool
+    mcp_pool_min_size: int = 1
+    mcp_pool_max_size: int = 4
+    mcp_pool_acquire_timeout: float = 30
+    # Connect the initial pool clients before serving; off by default so the
+    # API accepts requests (and health checks) while they connect
+    mcp_pool_wait_on_start: bool = False
+
 
 settings = Settings()
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    client = MCPClient("nvidia") # groq nvidia
+    # One keep-alive LLM connection pool, conversation journal, tool result
+    # cache and tracer shared by every pooled client
+    llm_http_client = MCPClient.create_llm_http_client()
+    journal = ConversationJournal.from_env()
+    journal.start()
+    tool_cache = ToolResultCache.from_env()
+    app.state.tool_cache = tool_cache
+    completion_cache = CompletionCache.from_env()
+    app.state.completion_cache = completion_cache
+    tracer = Tracer.from_env()
+    app.state.tracer = tracer
+    conversations = ConversationStore.from_env()
+    app.state.conversations = conversations
+    pool = MCPClientPool(
+        lambda: MCPClient(
+            "nvidia",
+            http_client=llm_http_client,
+            journal=journal,
+            tool_cache=tool_cache,
+            tracer=tracer,
+            completion_cache=completion_cache,
+        ), # groq nvidia
+        min_size=settings.mcp_pool_min_size,
+        max_size=settings.mcp_pool_max_size,
+        acquire_timeout=settings.mcp_pool_acquire_timeout,
+    )
     try:
-        connected = await client.connect_to_server()
-        if not connected:
-            raise HTTPException(
-                status_code=500, detail="Failed to connect to MCP server"
-            )
-        app.state.client = client
+        await pool.start(wait=settings.mcp_pool_wait_on_start)
+        app.state.pool = pool
         yield
     except Exception as e:
         print(f"Error during lifespan: {e}")
         raise HTTPException(status_code=500, detail="Error during lifespan") from e
     finally:
         # shutdown
-        await client.cleanup()
+        await pool.close()
+        await conversations.close()
+        await journal.close()
+        if completion_cache is not None:
+            completion_cache.close()
+        tracer.close()
+        await llm_http_client.aclose()
 
 
 app = FastAPI(title="MCP Client API", lifespan=lifespan)
@@ -55,6 +99,8 @@ app.add_middleware(
 
 class QueryRequest(BaseModel):
     query: str
+    # Continue an earlier conversation; a new one is started when omitted
+    conversation_id: Optional[str] = None
 
 
 class Message(BaseModel):
@@ -67,21 +113,73 @@ class ToolCall(BaseModel):
     args: Dict[str, Any]
 
 
+def json_response(payload: Dict[str, Any]) -> Response:
+    """Encode a message-heavy payload directly instead of through FastAPI's
+    recursive jsonable_encoder"""
+    return Response(serialization.dumps_bytes(payload), media_type="application/json")
+
+
 @app.post("/query")
 async def process_query(request: QueryRequest):
-    """Process a query and return the response"""
+    """Process a query and return the messages of this turn"""
+    conversations = app.state.conversations
+    conversation_id = request.conversation_id or uuid.uuid4().hex
     try:
-        messages = await app.state.client.process_query(request.query)
-        return {"messages": messages}
+        # Turns of one conversation run one at a time
+        async with conversations.lock(conversation_id):
+            history = await conversations.get(conversation_id) or []
+            async with app.state.pool.acquire() as client:
+                messages = await client.process_query(request.query, conversation_id, history)
+            await conversations.save(conversation_id, messages)
+        return json_response({"conversation_id": conversation_id, "messages": messages[len(history):]})
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/query/stream")
+async def stream_query(request: QueryRequest):
+    """Process a query, streaming tokens and tool events as NDJSON"""
+    conversations = app.state.conversations
+    conversation_id = request.conversation_id or uuid.uuid4().hex
+
+    async def events():
+        try:
+            async with conversations.lock(conversation_id):
+                history = await conversations.get(conversation_id) or []
+                async with app.state.pool.acquire() as client:
+                    async for event in client.stream_query(request.query, conversation_id, history):
+                        if event["type"] == "done":
+                            await conversations.save(conversation_id, event["messages"])
+                            event = {**event, "messages": event["messages"][len(history):]}
+                        yield serialization.dumps_bytes(event) + b"\n"
+        except Exception as e:
+            yield serialization.dumps_bytes({"type": "error", "detail": str(e)}) + b"\n"
+
+    return StreamingResponse(events(), media_type="application/x-ndjson")
+
+
+@app.get("/conversations/{conversation_id}")
+async def get_conversation(conversation_id: str):
+    """Get the stored message history of a conversation"""
+    messages = await app.state.conversations.get(conversation_id)
+    if messages is None:
+        raise HTTPException(status_code=404, detail="Conversation not found")
+    return json_response({"conversation_id": conversation_id, "messages": messages})
+
+
+@app.delete("/conversations/{conversation_id}")
+async def delete_conversation(conversation_id: str):
+    """Forget a conversation"""
+    if not await app.state.conversations.delete(conversation_id):
+        raise HTTPException(status_code=404, detail="Conversation not found")
+    return {"conversation_id": conversation_id, "deleted": True}
+
+
 @app.get("/tools")
 async def get_tools():
     """Get the list of available tools"""
     try:
-        tools = await app.state.client.get_mcp_tools()
+        tools = await app.state.pool.tools()
         return {
             "tools": [
                 {
@@ -95,6 +193,50 @@ async def get_tools():
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/tools/cache")
+async def get_tool_cache_stats():
+    """Get tool result cache hit/miss counters"""
+    tool_cache = app.state.tool_cache
+    if tool_cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **tool_cache.stats()}
+
+@app.get("/llm/cache")
+async def get_completion_cache_stats():
+    """LLM completion cache statistics"""
+    completion_cache = app.state.completion_cache
+    if completion_cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **completion_cache.stats()}
+
+
+@app.delete("/llm/cache")
+async def clear_completion_cache():
+    """Drop every cached LLM completion, in memory and on disk"""
+    completion_cache = app.state.completion_cache
+    if completion_cache is None:
+        return {"enabled": False}
+    await completion_cache.clear()
+    return {"enabled": True, "cleared": True}
+
+
+@app.get("/health")
+async def health():
+    """Liveness check; answers while the MCP client pool is still warming up"""
+    return {"status": "ok", "pool": app.state.pool.stats()}
+
+@app.get("/stats")
+async def get_stats():
+    """Get per-stage latency percentiles for recent queries"""
+    tool_cache = app.state.tool_cache
+    return {
+        "stages": app.state.tracer.stats(),
+        "pool": app.state.pool.stats(),
+        "tool_cache": tool_cache.stats() if tool_cache is not None else None,
+        "completion_cache": app.state.completion_cache.stats() if app.state.completion_cache is not None else None,
+        "conversations": app.state.conversations.stats(),
+    }
+
 import os
 if __name__ == "__main__":
     import uvicorn
@@ -1,29 +1,98 @@
-from typing import Optional, Dict, Any, Union
+from typing import TYPE_CHECKING, Optional, Dict, Any, Union
 from contextlib import AsyncExitStack
 import traceback
 
 # from utils.logger import logger
-from mcp import ClientSession, StdioServerParameters
-from mcp.client.stdio import stdio_client
-from mcp.client.sse import sse_client
-from mcp.client.streamable_http import streamablehttp_client
-from datetime import datetime
+from datetime import timedelta
 from utils.logger import logger
+from utils.journal import ConversationJournal
+from utils.tool_cache import ToolResultCache
+from utils.completion_cache import CompletionCache
+from utils.tracing import Tracer
+from utils.context import ContextWindow
+from utils import serialization
+import asyncio
+import importlib
+import importlib.util
 import json
 import os
-import httpx
+import sys
+import time
+import uuid
+
+# The MCP transports, the MCP SDK itself, openai and httpx are imported
+# where they are first used, so a process only pays for the protocol and
+# provider it selects and the API starts serving sooner
+if TYPE_CHECKING:
+    import httpx
+    from mcp import ClientSession
+
+def is_transport_error(error: BaseException) -> bool:
+    """Whether ``error`` means the client's MCP transport is gone (server
+    process exited, connection or HTTP session closed), as opposed to a
+    failure of one request. A stdio pool reports the death of one of
+    several subprocesses as ``StdioWorkerExited``, which is not fatal."""
+    import anyio
+    import httpx
+    from mcp import types
+    from mcp.shared.exceptions import McpError
+
+    grouped = getattr(error, "exceptions", None)
+    if isinstance(grouped, tuple):
+        # Exception group raised out of an anyio task group
+        return any(is_transport_error(inner) for inner in grouped)
+    if isinstance(error, McpError):
+        return error.error.code == types.CONNECTION_CLOSED
+    if isinstance(error, httpx.HTTPStatusError):
+        # A terminated streamable HTTP session is answered with 404
+        return error.response.status_code == 404
+    return isinstance(error, (
+        anyio.ClosedResourceError,
+        anyio.BrokenResourceError,
+        anyio.EndOfStream,
+        ConnectionError,
+        httpx.TransportError,
+    ))
 
-from openai import OpenAI
 
 class MCPClient:
-    def __init__(self, provider: str = "groq"):
+    def __init__(
+        self,
+        provider: str = "groq",
+        http_client: Optional["httpx.AsyncClient"] = None,
+        journal: Optional[ConversationJournal] = None,
+        tool_cache: Optional[ToolResultCache] = None,
+        tracer: Optional[Tracer] = None,
+        completion_cache: Optional[CompletionCache] = None,
+    ):
         # Initialize session and client objects
-        self.session: Optional[ClientSession] = None
+        self.session: Optional["ClientSession"] = None
         self.exit_stack = AsyncExitStack()
         self.provider = provider.lower()
         self.tools = []
-        self.messages = []
+
+        # Tool registry cache: raw MCP tools and their OpenAI conversion,
+        # refreshed on notifications/tools/list_changed or after the TTL
+        self.mcp_tools = []
+        self.mcp_tools_cache_ttl = float(os.getenv("MCP_TOOLS_CACHE_TTL", "300"))
+        self._tools_fetched_at: Optional[float] = None
+        self._tools_lock = asyncio.Lock()
+
+        # Opt-in result cache for read-only tools (MCP_TOOL_CACHE_ENABLED)
+        self.tool_cache = tool_cache if tool_cache is not None else ToolResultCache.from_env()
+
+        # Opt-in cache of LLM completions for identical turns (LLM_CACHE_ENABLED)
+        self._owns_completion_cache = completion_cache is None
+        self.completion_cache = completion_cache if completion_cache is not None else CompletionCache.from_env()
         self.logger = logger
+
+        # Conversation journal; a shared one can be passed in by the caller
+        self._owns_journal = journal is None
+        self.journal = journal or ConversationJournal.from_env()
+
+        # Per-stage span timing (LLM turns, tool calls, conversion, logging)
+        self._owns_tracer = tracer is None
+        self.tracer = tracer or Tracer.from_env()
         
         # MCP Server Configuration
         self.mcp_server_script_path = os.getenv("MCP_SERVER_SCRIPT_PATH", "mcp_server.py")
@@ -34,20 +103,77 @@ class MCPClient:
         # Additional protocol-specific configuration
         self.mcp_server_url = os.getenv("MCP_SERVER_URL", "http://localhost:8080/mcp")
         self.mcp_server_headers = json.loads(os.getenv("MCP_SERVER_HEADERS", "{}"))
+        # Response encodings offered to sse/http servers, e.g. "identity" to
+        # turn compression off; unset, httpx offers every encoding it can
+        # decode (gzip and deflate, plus br and zstd when installed)
+        self.mcp_http_accept_encoding = os.getenv("MCP_HTTP_ACCEPT_ENCODING", "")
+        if self.mcp_http_accept_encoding:
+            self.mcp_server_headers.setdefault("Accept-Encoding", self.mcp_http_accept_encoding)
         self.mcp_sse_read_timeout = int(os.getenv("MCP_SSE_READ_TIMEOUT", "300"))
+        # inprocess: "package.module:attr" of the FastMCP server object; the
+        # server script path is imported instead when unset
+        self.mcp_server_module = os.getenv("MCP_SERVER_MODULE", "")
+
+        # stdio only: run several server subprocesses and spread tool calls
+        # across them (1 keeps the single session)
+        self.mcp_stdio_pool_size = max(1, int(os.getenv("MCP_STDIO_POOL_SIZE", "1")))
+        self.mcp_stdio_pool_spares = max(0, int(os.getenv("MCP_STDIO_POOL_SPARES", "0")))
+        self.mcp_stdio_pool_dispatch = os.getenv("MCP_STDIO_POOL_DISPATCH", "least_loaded").lower()
+
+        # Tool execution: max concurrent tool calls per LLM turn and per-call timeout
+        self.mcp_tool_concurrency = max(1, int(os.getenv("MCP_TOOL_CONCURRENCY", "8")))
+        self.mcp_tool_timeout = float(os.getenv("MCP_TOOL_TIMEOUT", "60"))
+
+        # Prompt budget: estimated tokens sent per LLM call (0 disables) and
+        # the largest tool result forwarded to the LLM
+        self.context_max_tokens = int(os.getenv("CONTEXT_MAX_TOKENS", "8000"))
+        self.context_chars_per_token = float(os.getenv("CONTEXT_CHARS_PER_TOKEN", "4"))
+        self.mcp_tool_result_max_chars = int(os.getenv("MCP_TOOL_RESULT_MAX_CHARS", "8000"))
         
-        # Initialize OpenAI-compatible client
-        proxy_url = os.environ.get("PROXY_URL")
-        self.llm = OpenAI(
+        # Initialize async OpenAI-compatible client. A shared http_client can be
+        # passed in so several clients reuse one keep-alive connection pool.
+        from openai import AsyncOpenAI
+
+        self._owns_http_client = http_client is None
+        if http_client is None:
+            http_client = self.create_llm_http_client()
+        self.llm = AsyncOpenAI(
             api_key=os.getenv(f"{provider.upper()}_API_KEY"),
             base_url=os.getenv(f"{provider.upper()}_BASE_URL"),
-            http_client=httpx.Client(verify=False, proxy=proxy_url)
+            http_client=http_client,
+            timeout=http_client.timeout,
         )
         self.model = model = os.getenv(f"{provider.upper()}_MODEL")
+        # Request parameters besides model, messages and tools; part of the
+        # completion cache key
+        self.llm_params = {"max_tokens": 1000}
+
+    @staticmethod
+    def create_llm_http_client() -> "httpx.AsyncClient":
+        """Create a pooled, keep-alive HTTP client for LLM requests"""
+        import httpx
+
+        limits = httpx.Limits(
+            max_connections=int(os.getenv("LLM_MAX_CONNECTIONS", "100")),
+            max_keepalive_connections=int(os.getenv("LLM_MAX_KEEPALIVE_CONNECTIONS", "20")),
+            keepalive_expiry=float(os.getenv("LLM_KEEPALIVE_EXPIRY", "30")),
+        )
+        timeout = httpx.Timeout(
+            float(os.getenv("LLM_TIMEOUT", "120")),
+            connect=float(os.getenv("LLM_CONNECT_TIMEOUT", "10")),
+        )
+        return httpx.AsyncClient(
+            verify=False,
+            proxy=os.environ.get("PROXY_URL"),
+            limits=limits,
+            timeout=timeout,
+        )
 
     # connect to the MCP server
     async def connect_to_server(self, server_script_path: str = None):
         try:
+            if self._owns_journal:
+                self.journal.start()
             self.logger.info(f"Connecting to MCP server using {self.mcp_server_protocol} protocol")
             
             if self.mcp_server_protocol == "stdio":
@@ -56,22 +182,17 @@ class MCPClient:
                 await self._connect_sse()
             elif self.mcp_server_protocol == "http":
                 await self._connect_http()
+            elif self.mcp_server_protocol == "inprocess":
+                await self._connect_inprocess(server_script_path)
             else:
                 raise ValueError(f"Unsupported MCP protocol: {self.mcp_server_protocol}")
 
-            await self.session.initialize()
+            # The in-memory transport hands back an initialized session
+            if self.mcp_server_protocol != "inprocess":
+                await self.session.initialize()
             self.logger.info(f"Connected to MCP server via {self.mcp_server_protocol}")
 
-            mcp_tools = await self.get_mcp_tools()
-            tool_dicts = [
-                {
-                    "name": tool.name,
-                    "description": tool.description,
-                    "input_schema": tool.inputSchema,
-                }
-                for tool in mcp_tools
-            ]
-            self.tools = self._convert_tools_for_openai(tool_dicts)
+            await self.refresh_tools()
             
             tool_names = [tool['function']['name'] for tool in self.tools]
             self.logger.info(f"Available tools: {tool_names}")
@@ -85,6 +206,9 @@ class MCPClient:
 
     async def _connect_stdio(self, server_script_path: str = None):
         """Connect using stdio protocol"""
+        from mcp import ClientSession, StdioServerParameters
+        from mcp.client.stdio import stdio_client
+
         # Use provided path or fall back to environment configuration
         script_path = server_script_path or self.mcp_server_script_path
         
@@ -99,16 +223,34 @@ class MCPClient:
             command=command, args=[script_path], env=None
         )
 
+        if self.mcp_stdio_pool_size > 1:
+            from stdio_pool import StdioSessionPool
+
+            pool = StdioSessionPool(
+                server_params,
+                size=self.mcp_stdio_pool_size,
+                spares=self.mcp_stdio_pool_spares,
+                dispatch=self.mcp_stdio_pool_dispatch,
+                message_handler=self._handle_message,
+            )
+            self.exit_stack.push_async_callback(pool.close)
+            # Session-like: initialize() starts the subprocesses
+            self.session = pool
+            return
+
         stdio_transport = await self.exit_stack.enter_async_context(
             stdio_client(server_params)
         )
         self.stdio, self.write = stdio_transport
         self.session = await self.exit_stack.enter_async_context(
-            ClientSession(self.stdio, self.write)
+            ClientSession(self.stdio, self.write, message_handler=self._handle_message)
         )
 
     async def _connect_sse(self):
         """Connect using SSE protocol"""
+        from mcp import ClientSession
+        from mcp.client.sse import sse_client
+
         sse_transport = await self.exit_stack.enter_async_context(
             sse_client(
                 url=self.mcp_server_url,
@@ -119,11 +261,14 @@ class MCPClient:
         )
         self.stdio, self.write = sse_transport
         self.session = await self.exit_stack.enter_async_context(
-            ClientSession(self.stdio, self.write)
+            ClientSession(self.stdio, self.write, message_handler=self._handle_message)
         )
 
     async def _connect_http(self):
         """Connect using HTTP protocol"""
+        from mcp import ClientSession
+        from mcp.client.streamable_http import streamablehttp_client
+
         http_transport = await self.exit_stack.enter_async_context(
             streamablehttp_client(
                 url=self.mcp_server_url,
@@ -134,17 +279,120 @@ class MCPClient:
         )
         self.stdio, self.write, self.get_session_id = http_transport
         self.session = await self.exit_stack.enter_async_context(
-            ClientSession(self.stdio, self.write)
+            ClientSession(self.stdio, self.write, message_handler=self._handle_message)
         )
 
-    # get mcp tool list
-    async def get_mcp_tools(self):
+    def _load_inprocess_server(self, server_script_path: str = None):
+        """Import the FastMCP server object for the inprocess protocol"""
+        target = self.mcp_server_module or server_script_path or self.mcp_server_script_path
+        if target.endswith(".py"):
+            # Import the script as a module; its __main__ block does not run
+            path = os.path.abspath(target)
+            module_name = os.path.splitext(os.path.basename(path))[0]
+            # As when run as a script, its directory is importable
+            if os.path.dirname(path) not in sys.path:
+                sys.path.insert(0, os.path.dirname(path))
+            module = sys.modules.get(module_name)
+            if module is None or getattr(module, "__file__", None) != path:
+                spec = importlib.util.spec_from_file_location(module_name, path)
+                module = importlib.util.module_from_spec(spec)
+                sys.modules[module_name] = module
+                spec.loader.exec_module(module)
+            attr = "mcp"
+        else:
+            module_name, _, attr = target.partition(":")
+            module = importlib.import_module(module_name)
+            attr = attr or "mcp"
+        server = getattr(module, attr)
+        # FastMCP wraps the low-level server that speaks the protocol
+        return getattr(server, "_mcp_server", server)
+
+    async def _connect_inprocess(self, server_script_path: str = None):
+        """Connect to a FastMCP server in this process over memory streams"""
+        from mcp.shared.memory import create_connected_server_and_client_session
+
+        server = self._load_inprocess_server(server_script_path)
+        self.session = await self.exit_stack.enter_async_context(
+            create_connected_server_and_client_session(
+                server, message_handler=self._handle_message
+            )
+        )
+
+    async def _handle_message(self, message):
+        """Handle incoming server messages; tracks tool list changes"""
+        from mcp import types
+
+        if isinstance(message, types.ServerNotification) and isinstance(
+            message.root, types.ToolListChangedNotification
+        ):
+            self.logger.info("MCP server tool list changed")
+            self.invalidate_tools()
+            if self.tool_cache is not None:
+                self.tool_cache.clear()
+
+    def invalidate_tools(self):
+        """Mark the cached tool registry stale so the next lookup refreshes it"""
+        self._tools_fetched_at = None
+
+    def _tools_fresh(self) -> bool:
+        if self._tools_fetched_at is None:
+            return False
+        if self.mcp_tools_cache_ttl <= 0:
+            return True
+        return time.monotonic() - self._tools_fetched_at < self.mcp_tools_cache_ttl
+
+    async def refresh_tools(self):
+        """Fetch the tool list from the server and rebuild the registry"""
+        async with self._tools_lock:
+            await self._fetch_tools()
+        return self.mcp_tools
+
+    async def _fetch_tools(self):
         try:
             response = await self.session.list_tools()
-            return response.tools
         except Exception as e:
             self.logger.error(f"Error getting MCP tools: {e}")
             raise
+        self.mcp_tools = response.tools
+        tool_dicts = [
+            {
+                "name": tool.name,
+                "description": tool.description,
+                "input_schema": tool.inputSchema,
+            }
+            for tool in self.mcp_tools
+        ]
+        self.tools = self._convert_tools_for_openai(tool_dicts)
+        self._tools_fetched_at = time.monotonic()
+
+    async def _ensure_tools(self):
+        if self._tools_fresh():
+            return
+        async with self._tools_lock:
+            # Another caller may have refreshed while we waited for the lock
+            if not self._tools_fresh():
+                await self._fetch_tools()
+
+    def cached_mcp_tools(self):
+        """Return the MCP tool list if the registry is fresh, else None"""
+        return self.mcp_tools if self._tools_fresh() else None
+
+    # get mcp tool list
+    async def get_mcp_tools(self):
+        """Return the MCP tool list, served from the registry cache when fresh"""
+        await self._ensure_tools()
+        return self.mcp_tools
+
+    async def get_openai_tools(self):
+        """Return the tools converted to OpenAI function calling format"""
+        await self._ensure_tools()
+        return self.tools
+
+    def _is_cacheable(self, tool_name: str) -> bool:
+        if self.tool_cache is None:
+            return False
+        tool = next((tool for tool in self.mcp_tools if tool.name == tool_name), None)
+        return tool is not None and self.tool_cache.is_cacheable(tool)
     
     def _convert_tools_for_openai(self, mcp_tools):
         """Convert MCP tools to OpenAI function calling format"""
@@ -186,147 +434,380 @@ class MCPClient:
                     "content": text_content
                 })
         return openai_messages
+
+    def new_context(self) -> ContextWindow:
+        """Create the budgeted prompt builder for one conversation"""
+        return ContextWindow(
+            self._convert_messages_for_openai,
+            max_tokens=self.context_max_tokens,
+            max_tool_result_chars=self.mcp_tool_result_max_chars,
+            chars_per_token=self.context_chars_per_token,
+        )
+
+    def _build_prompt(self, messages, context: Optional[ContextWindow] = None):
+        """Convert messages to OpenAI format within the token budget"""
+        context = context or self.new_context()
+        with self.tracer.span("convert_messages", messages=len(messages)) as span:
+            openai_messages = context.build(messages)
+            span.update(context.last_stats)
+        return openai_messages
     
 
     # process query
-    async def process_query(self, query: str):
+    async def process_query(self, query: str, conversation_id: Optional[str] = None, history=None):
+        messages = None
+        async for event in self.run_agent(query, conversation_id=conversation_id, history=history):
+            if event["type"] == "done":
+                messages = event["messages"]
+        return messages
+
+    async def stream_query(self, query: str, conversation_id: Optional[str] = None, history=None):
+        """Process a query, yielding LLM tokens and tool events as they happen"""
+        async for event in self.run_agent(query, stream=True, conversation_id=conversation_id, history=history):
+            yield event
+
+    async def run_agent(
+        self,
+        query: str,
+        stream: bool = False,
+        conversation_id: Optional[str] = None,
+        history=None,
+    ):
+        """Run the agent loop for a query as an async generator of events.
+
+        Events are dicts with a ``type`` of ``token`` (only when ``stream``
+        is set), ``tool_call``, ``tool_result`` or ``done``; the ``done``
+        event carries the conversation id and full message history.
+        ``history`` continues an earlier conversation with its prior messages.
+        """
         try:
             self.logger.info(f"Processing query: {query}")
-            user_message = {"role": "user", "content": query}
-            self.messages = [user_message]
-
-            while True:
-                response = await self.call_llm()
-                message = response.choices[0].message
-
-                # Handle text response
-                if message.content and not message.tool_calls:
-                    assistant_message = {
-                        "role": "assistant",
-                        "content": message.content,
-                    }
-                    self.messages.append(assistant_message)
-                    await self.log_conversation()
-                    break
-
-                # Handle tool calls
-                if message.tool_calls:
-                    # Ensure content is not empty for providers like NVIDIA that require min 1 character
-                    content = message.content if message.content and message.content.strip() else "I'll use the available tools to help you."
+            # Conversation state is local to the query so one client can be
+            # reused by many requests without sharing history
+            conversation_id = conversation_id or uuid.uuid4().hex
+            with self.tracer.span("query", conversation_id=conversation_id, stream=stream) as query_span:
+                messages = list(history or [])
+                messages.append({"role": "user", "content": query})
+                self.log_message(conversation_id, messages)
+                # Converted prompt kept across turns so only new messages
+                # are converted on each LLM call
+                context = self.new_context()
+
+                turn = 0
+                while True:
+                    turn += 1
+                    query_span["turns"] = turn
+                    with self.tracer.span("llm", turn=turn, provider=self.provider, model=self.model, stream=stream) as llm_span:
+                        if stream:
+                            message = None
+                            async for event in self.stream_llm(messages, context):
+                                if event["type"] == "message":
+                                    message = event["message"]
+                                else:
+                                    yield event
+                        else:
+                            response = await self.call_llm(messages, context)
+                            message = response.choices[0].message
+                            if response.usage:
+                                llm_span["usage_prompt_tokens"] = response.usage.prompt_tokens
+                        llm_span.update(context.last_stats)
+                    self.logger.info(
+                        f"Turn {turn}: ~{context.last_stats['prompt_tokens']} prompt tokens in "
+                        f"{context.last_stats['prompt_messages']} messages "
+                        f"({context.last_stats['truncated_messages']} tool outputs truncated, "
+                        f"{context.last_stats['dropped_messages']} earlier messages left out)"
+                    )
+                    if context.last_stats["over_budget"]:
+                        self.logger.warning(
+                            f"Turn {turn}: prompt exceeds the {context.max_tokens} token budget "
+                            f"even with only the current turn"
+                        )
+
+                    # Handle text response
+                    if message.content and not message.tool_calls:
+                        assistant_message = {
+                            "role": "assistant",
+                            "content": message.content,
+                        }
+                        messages.append(assistant_message)
+                        self.log_message(conversation_id, messages)
+                        break
+
+                    # Handle tool calls
+                    if message.tool_calls:
+                        # Ensure content is not empty for providers like NVIDIA that require min 1 character
+                        content = message.content if message.content and message.content.strip() else "I'll use the available tools to help you."
                     
-                    assistant_message = {
-                        "role": "assistant",
-                        "content": content,
-                        "tool_calls": [{
-                            "id": tc.id,
-                            "type": "function",
-                            "function": {
-                                "name": tc.function.name,
-                                "arguments": tc.function.arguments
+                        assistant_message = {
+                            "role": "assistant",
+                            "content": content,
+                            "tool_calls": [{
+                                "id": tc.id,
+                                "type": "function",
+                                "function": {
+                                    "name": tc.function.name,
+                                    "arguments": tc.function.arguments
+                                }
+                            } for tc in message.tool_calls]
+                        }
+                        messages.append(assistant_message)
+                        self.log_message(conversation_id, messages)
+
+                        for tool_call in message.tool_calls:
+                            yield {
+                                "type": "tool_call",
+                                "id": tool_call.id,
+                                "name": tool_call.function.name,
+                                "arguments": tool_call.function.arguments,
                             }
-                        } for tc in message.tool_calls]
-                    }
-                    self.messages.append(assistant_message)
-                    await self.log_conversation()
-
-                    for tool_call in message.tool_calls:
-                        tool_name = tool_call.function.name
-                        tool_args = json.loads(tool_call.function.arguments)
-                        tool_call_id = tool_call.id
-                        
-                        self.logger.info(f"Calling tool {tool_name} with args {tool_args}")
-                        
-                        try:
-                            result = await self.session.call_tool(tool_name, tool_args)
-                            self.logger.info(f"Tool {tool_name} result: {result}...")
-                            
-                            self.messages.append({
-                                "role": "tool",
-                                "tool_call_id": tool_call_id,
-                                "content": str(result.content),
-                            })
-                            await self.log_conversation()
-                        except Exception as e:
-                            self.logger.error(f"Error calling tool {tool_name}: {e}")
-                            raise
-
-            return self.messages
+
+                        with self.tracer.span("tool_turn", turn=turn, tools=len(message.tool_calls)):
+                            results = await self.call_tools(message.tool_calls)
+                        for tool_call, result in zip(message.tool_calls, results):
+                            with self.tracer.span("serialize_tool_result", tool=tool_call.function.name):
+                                tool_message = {
+                                    "role": "tool",
+                                    "tool_call_id": tool_call.id,
+                                    "content": serialization.tool_result_text(result),
+                                }
+                            messages.append(tool_message)
+                            self.log_message(conversation_id, messages)
+                            yield {
+                                "type": "tool_result",
+                                "id": tool_call.id,
+                                "name": tool_call.function.name,
+                                "content": tool_message["content"],
+                            }
+
+                yield {"type": "done", "conversation_id": conversation_id, "messages": messages}
 
         except Exception as e:
             self.logger.error(f"Error processing query: {e}")
             raise
 
+    # call tools
+    async def call_tools(self, tool_calls):
+        """Run the tool calls of one LLM turn concurrently.
+
+        At most ``mcp_tool_concurrency`` calls are in flight at once and each
+        one is bounded by ``mcp_tool_timeout``. Results are returned in the
+        same order as ``tool_calls``. A call that times out, fails or has
+        unparseable arguments yields an error result for the LLM instead of
+        failing the turn; only a dead transport aborts all of them.
+        """
+        semaphore = asyncio.Semaphore(self.mcp_tool_concurrency)
+        timeout = timedelta(seconds=self.mcp_tool_timeout)
+
+        async def call(tool_call):
+            tool_name = tool_call.function.name
+            try:
+                tool_args = serialization.loads(tool_call.function.arguments or "{}")
+            except ValueError as e:
+                self.logger.error(f"Invalid arguments for tool {tool_name}: {e}")
+                return self._tool_error(tool_name, f"invalid JSON arguments: {e}")
+
+            cacheable = self._is_cacheable(tool_name)
+            if cacheable:
+                cached = self.tool_cache.get(tool_name, tool_args)
+                if cached is not None:
+                    self.logger.info(f"Tool {tool_name} result served from cache")
+                    with self.tracer.span("tool_call", tool=tool_name, cached=True):
+                        return cached
+
+            async with semaphore:
+                self.logger.info(f"Calling tool {tool_name} with args {tool_args}")
+                try:
+                    with self.tracer.span("tool_call", tool=tool_name, cached=False):
+                        result = await self.session.call_tool(
+                            tool_name, tool_args, read_timeout_seconds=timeout
+                        )
+                    self.logger.info(f"Tool {tool_name} finished (error={result.isError})")
+                except Exception as e:
+                    self.logger.error(f"Error calling tool {tool_name}: {e}")
+                    if is_transport_error(e):
+                        raise
+                    return self._tool_error(tool_name, str(e) or type(e).__name__)
+
+            if cacheable and not result.isError:
+                self.tool_cache.put(tool_name, tool_args, result)
+            return result
+
+        tasks = [asyncio.ensure_future(call(tool_call)) for tool_call in tool_calls]
+        try:
+            return await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+
+    @staticmethod
+    def _tool_error(tool_name: str, reason: str):
+        """Error result standing in for a tool call that did not complete"""
+        from mcp.types import CallToolResult, TextContent
+
+        return CallToolResult(
+            content=[TextContent(type="text", text=f"Error calling tool {tool_name}: {reason}")],
+            isError=True,
+        )
+
+    async def _cached_completion(self, openai_messages, tools):
+        """Cache key and cached ``ChatCompletion`` of an LLM request; the key
+        is None when the completion cache is off"""
+        if self.completion_cache is None:
+            return None, None
+        key = self.completion_cache.make_key(self.model, openai_messages, tools, self.llm_params)
+        with self.tracer.span("llm_cache") as span:
+            cached = await self.completion_cache.get(key)
+            span["hit"] = cached is not None
+        if cached is None:
+            return key, None
+
+        from openai.types.chat import ChatCompletion
+
+        return key, ChatCompletion.model_validate_json(cached)
+
     # call llm
-    async def call_llm(self):
+    async def call_llm(self, messages, context: Optional[ContextWindow] = None):
         try:
             self.logger.info(f"Calling {self.provider} LLM")
             
             # Convert messages to OpenAI format if needed
-            openai_messages = self._convert_messages_for_openai(self.messages)
+            openai_messages = self._build_prompt(messages, context)
+            tools = await self.get_openai_tools()
             
-            response = self.llm.chat.completions.create(
+            key, cached = await self._cached_completion(openai_messages, tools)
+            if cached is not None:
+                self.logger.info("LLM completion served from cache")
+                return cached
+
+            response = await self.llm.chat.completions.create(
                 model=self.model,
-                max_tokens=1000,
                 messages=openai_messages,
-                tools=self.tools if self.tools else None,
+                tools=tools if tools else None,
+                **self.llm_params,
             )
-            
+
+            if key is not None:
+                await self.completion_cache.put(key, response.model_dump_json())
             return response
                 
         except Exception as e:
             self.logger.error(f"Error calling LLM: {e}")
             raise
 
-    # cleanup
-    async def cleanup(self):
+    async def stream_llm(self, messages, context: Optional[ContextWindow] = None):
+        """Stream a completion from the LLM.
+
+        Yields a ``token`` event per content delta and finally a ``message``
+        event with the assembled ``ChatCompletionMessage``, including any
+        tool calls accumulated from the deltas. Pass the conversation's
+        ``context`` so earlier messages are not converted again.
+        """
         try:
-            await self.exit_stack.aclose()
-            self.logger.info("Disconnected from MCP server")
-        except Exception as e:
-            self.logger.error(f"Error during cleanup: {e}")
-            traceback.print_exc()
-            raise
+            self.logger.info(f"Streaming {self.provider} LLM")
 
-    async def log_conversation(self):
-        os.makedirs("conversations", exist_ok=True)
+            openai_messages = self._build_prompt(messages, context)
+            tools = await self.get_openai_tools()
 
-        serializable_conversation = []
+            key, cached = await self._cached_completion(openai_messages, tools)
+            if cached is not None:
+                # Replay the cached completion as a single token event
+                self.logger.info("LLM completion served from cache")
+                message = cached.choices[0].message
+                if message.content:
+                    yield {"type": "token", "content": message.content}
+                yield {"type": "message", "message": message}
+                return
 
-        for message in self.messages:
-            try:
-                serializable_message = {"role": message["role"], "content": []}
-
-                # Handle both string and list content
-                if isinstance(message["content"], str):
-                    serializable_message["content"] = message["content"]
-                elif isinstance(message["content"], list):
-                    for content_item in message["content"]:
-                        if hasattr(content_item, "to_dict"):
-                            serializable_message["content"].append(
-                                content_item.to_dict()
-                            )
-                        elif hasattr(content_item, "dict"):
-                            serializable_message["content"].append(content_item.dict())
-                        elif hasattr(content_item, "model_dump"):
-                            serializable_message["content"].append(
-                                content_item.model_dump()
-                            )
-                        else:
-                            serializable_message["content"].append(content_item)
+            stream = await self.llm.chat.completions.create(
+                model=self.model,
+                messages=openai_messages,
+                tools=tools if tools else None,
+                stream=True,
+                **self.llm_params,
+            )
+
+            content = []
+            tool_calls = {}
+            completion_id, finish_reason = None, None
+            async with stream:
+                async for chunk in stream:
+                    completion_id = completion_id or chunk.id
+                    if not chunk.choices:
+                        continue
+                    finish_reason = chunk.choices[0].finish_reason or finish_reason
+                    delta = chunk.choices[0].delta
+                    if delta.content:
+                        content.append(delta.content)
+                        yield {"type": "token", "content": delta.content}
+                    for tc in delta.tool_calls or []:
+                        call = tool_calls.setdefault(
+                            tc.index, {"id": None, "name": "", "arguments": ""}
+                        )
+                        if tc.id:
+                            call["id"] = tc.id
+                        if tc.function and tc.function.name:
+                            call["name"] += tc.function.name
+                        if tc.function and tc.function.arguments:
+                            call["arguments"] += tc.function.arguments
 
-                serializable_conversation.append(serializable_message)
-            except Exception as e:
-                self.logger.error(f"Error processing message: {str(e)}")
-                self.logger.debug(f"Message content: {message}")
-                raise
+            from openai.types.chat import ChatCompletionMessage
 
-        timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-        filepath = os.path.join("conversations", f"conversation_{timestamp}.json")
+            message = ChatCompletionMessage.model_validate({
+                "role": "assistant",
+                "content": "".join(content) or None,
+                "tool_calls": [{
+                    "id": call["id"],
+                    "type": "function",
+                    "function": {
+                        "name": call["name"],
+                        "arguments": call["arguments"] or "{}",
+                    },
+                } for _, call in sorted(tool_calls.items())] or None,
+            })
 
+            if key is not None:
+                # Stored in the same shape as a non-streamed completion, so
+                # either path can serve the other's entries
+                from openai.types.chat import ChatCompletion
+
+                completion = ChatCompletion.model_validate({
+                    "id": completion_id or uuid.uuid4().hex,
+                    "object": "chat.completion",
+                    "created": int(time.time()),
+                    "model": self.model or "",
+                    "choices": [{
+                        "index": 0,
+                        "finish_reason": finish_reason or ("tool_calls" if tool_calls else "stop"),
+                        "message": message.model_dump(),
+                    }],
+                })
+                await self.completion_cache.put(key, completion.model_dump_json())
+            yield {"type": "message", "message": message}
+
+        except Exception as e:
+            self.logger.error(f"Error streaming LLM: {e}")
+            raise
+
+    # cleanup
+    async def cleanup(self):
         try:
-            with open(filepath, "w") as f:
-                json.dump(serializable_conversation, f, indent=2, default=str)
+            await self.exit_stack.aclose()
+            if self._owns_journal:
+                await self.journal.close()
+            if self._owns_tracer:
+                self.tracer.close()
+            if self._owns_http_client:
+                await self.llm.close()
+            if self._owns_completion_cache and self.completion_cache is not None:
+                self.completion_cache.close()
+            self.logger.info("Disconnected from MCP server")
         except Exception as e:
-            self.logger.error(f"Error writing conversation to file: {str(e)}")
-            self.logger.debug(f"Serializable conversation: {serializable_conversation}")
+            self.logger.error(f"Error during cleanup: {e}")
+            traceback.print_exc()
             raise
+
+    def log_message(self, conversation_id: str, messages):
+        """Journal the latest message of a conversation (non-blocking)"""
+        with self.tracer.span("log"):
+            self.journal.record(conversation_id, len(messages) - 1, messages[-1])
@@ -0,0 +1,305 @@
+import asyncio
+import itertools
+from typing import Any, Awaitable, Callable, List, Optional
+
+import anyio
+from mcp import ClientSession, StdioServerParameters, types
+from mcp.client.stdio import stdio_client
+from mcp.shared.exceptions import McpError
+
+from utils.logger import logger
+
+# The request could not be written: the worker was already gone
+_SEND_ERRORS = (anyio.ClosedResourceError, anyio.BrokenResourceError)
+
+
+class StdioWorkerExited(RuntimeError):
+    """A worker died while handling a call; the pool itself still has live
+    workers, so only that call failed"""
+
+
+class NoLiveWorkers(ConnectionError):
+    """Every worker of the pool is gone"""
+
+
+class _WatchedReadStream:
+    """Read stream of a worker's session that reports when the server's
+    output ends, i.e. the subprocess exited"""
+
+    def __init__(self, stream, on_end: Callable[[], None]):
+        self._stream = stream
+        self._on_end = on_end
+
+    async def __aenter__(self):
+        await self._stream.__aenter__()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return await self._stream.__aexit__(*exc_info)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return await self._stream.__anext__()
+        except StopAsyncIteration:
+            self._on_end()
+            raise
+
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
+
+class StdioWorker:
+    """One stdio server subprocess and its MCP session"""
+
+    def __init__(self, index: int):
+        self.index = index
+        self.session: Optional[ClientSession] = None
+        self.in_flight = 0
+        self.calls = 0
+        self.alive = False
+        self.stop = asyncio.Event()
+        self.task: Optional[asyncio.Task] = None
+
+
+class StdioSessionPool:
+    """Several stdio MCP server subprocesses behind one session-like API.
+
+    ``call_tool`` is dispatched to the least-loaded live worker (or round
+    robin), so a slow or CPU-heavy tool only ties up one subprocess. Up to
+    ``spares`` extra workers are kept connected but idle; when a worker's
+    process exits, whether busy or idle, it is retired, a spare takes its
+    place and a replacement is spawned in the background.
+
+    A call whose worker died is retried once on another worker if the
+    request never reached it, or if the tool is annotated read-only or
+    idempotent; otherwise it fails with ``StdioWorkerExited`` while the
+    pool stays usable. Only when no worker is left does the transport
+    error propagate.
+
+    Exposes the subset of ``ClientSession`` used by ``MCPClient``:
+    ``initialize``, ``list_tools`` and ``call_tool``.
+    """
+
+    def __init__(
+        self,
+        server_params: StdioServerParameters,
+        size: int = 2,
+        spares: int = 0,
+        dispatch: str = "least_loaded",
+        message_handler: Optional[Callable[[Any], Awaitable[None]]] = None,
+    ):
+        if size < 1 or spares < 0:
+            raise ValueError(f"Invalid stdio pool size: size={size}, spares={spares}")
+        if dispatch not in ("least_loaded", "round_robin"):
+            raise ValueError(f"Unsupported stdio pool dispatch: {dispatch}")
+        self.server_params = server_params
+        self.size = size
+        self.spares = spares
+        self.dispatch = dispatch
+        self.message_handler = message_handler
+        self.logger = logger
+
+        self.workers: List[StdioWorker] = []
+        self.idle_spares: List[StdioWorker] = []
+        self.respawns = 0
+        # Tools that are safe to run twice (readOnlyHint/idempotentHint)
+        self.retryable_tools: set = set()
+        self._counter = itertools.count()
+        self._round_robin = itertools.count()
+        self._tasks: set = set()
+        # Owner tasks of retired workers that are still shutting down
+        self._retired: set = set()
+        self._closed = False
+
+    async def _spawn(self) -> StdioWorker:
+        """Start a worker whose transport lives in a dedicated owner task.
+
+        Like pooled clients, the stdio transport's anyio task group has to be
+        exited from the task that entered it.
+        """
+        worker = StdioWorker(next(self._counter))
+        ready = asyncio.get_running_loop().create_future()
+
+        exited = asyncio.Event()
+
+        async def owner():
+            try:
+                async with stdio_client(self.server_params) as (read, write):
+                    read = _WatchedReadStream(read, exited.set)
+                    async with ClientSession(read, write, message_handler=self.message_handler) as session:
+                        await session.initialize()
+                        worker.session = session
+                        worker.alive = True
+                        ready.set_result(worker)
+                        # Until the pool stops the worker or its process exits
+                        waiters = [asyncio.ensure_future(worker.stop.wait()), asyncio.ensure_future(exited.wait())]
+                        try:
+                            await asyncio.wait(waiters, return_when=asyncio.FIRST_COMPLETED)
+                        finally:
+                            for waiter in waiters:
+                                waiter.cancel()
+                        if not worker.stop.is_set():
+                            worker.alive = False
+                            self._retire(worker)
+            except Exception as e:
+                if not ready.done():
+                    ready.set_exception(e)
+                else:
+                    self.logger.error(f"Error closing stdio worker {worker.index}: {e}")
+            finally:
+                worker.alive = False
+
+        worker.task = asyncio.create_task(owner())
+        try:
+            await ready
+        except BaseException:
+            worker.task.cancel()
+            raise
+        return worker
+
+    async def initialize(self):
+        """Start the active workers and warm spares"""
+        self.logger.info(f"Starting {self.size} stdio MCP servers ({self.spares} spares)")
+        workers = await asyncio.gather(
+            *(self._spawn() for _ in range(self.size + self.spares)),
+            return_exceptions=True,
+        )
+        errors = [worker for worker in workers if isinstance(worker, BaseException)]
+        started = [worker for worker in workers if not isinstance(worker, BaseException)]
+        if errors:
+            await asyncio.gather(*(self._stop(worker) for worker in started))
+            raise errors[0]
+        self.workers = started[:self.size]
+        self.idle_spares = started[self.size:]
+
+    def _pick(self) -> StdioWorker:
+        live = [worker for worker in self.workers if worker.alive]
+        if not live:
+            raise NoLiveWorkers("No live stdio MCP server in the pool")
+        if self.dispatch == "round_robin":
+            return live[next(self._round_robin) % len(live)]
+        # Least loaded; the rotating start spreads ties across workers
+        start = next(self._round_robin) % len(live)
+        return min(live[start:] + live[:start], key=lambda worker: worker.in_flight)
+
+    async def _stop(self, worker: StdioWorker):
+        worker.stop.set()
+        if worker.task is not None:
+            await worker.task
+
+    def _retire(self, worker: StdioWorker):
+        """Replace a worker whose process exited or transport broke"""
+        if self._closed:
+            return
+        if worker in self.idle_spares:
+            self.logger.warning(f"Spare stdio MCP server {worker.index} exited, replacing it")
+            self.idle_spares.remove(worker)
+            self._release(worker)
+            self._background(self._replace())
+            return
+        if worker not in self.workers:
+            return
+        self.logger.warning(f"stdio MCP server {worker.index} stopped responding, replacing it")
+        worker.alive = False
+        self.workers.remove(worker)
+        self._release(worker)
+        while self.idle_spares:
+            spare = self.idle_spares.pop(0)
+            if spare.alive:
+                self.workers.append(spare)
+                break
+        self._background(self._replace())
+
+    def _release(self, worker: StdioWorker):
+        """Stop a retired worker without waiting for it: this may run in the
+        worker's own owner task. ``close`` waits for it instead."""
+        worker.stop.set()
+        if worker.task is not None:
+            self._retired.add(worker.task)
+            worker.task.add_done_callback(self._retired.discard)
+
+    def _background(self, coro):
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _replace(self):
+        try:
+            worker = await self._spawn()
+        except Exception as e:
+            self.logger.error(f"Error respawning stdio MCP server: {e}")
+            return
+        self.respawns += 1
+        if self._closed:
+            await self._stop(worker)
+        elif len(self.workers) < self.size:
+            self.workers.append(worker)
+        else:
+            self.idle_spares.append(worker)
+
+    async def _run(self, method: str, *args, retryable: bool = False, **kwargs):
+        """Run a session request on a worker; ``retryable`` requests may be
+        repeated on another worker even if the dead one may have run them"""
+        for attempt in range(2):
+            worker = self._pick()
+            worker.in_flight += 1
+            worker.calls += 1
+            try:
+                return await getattr(worker.session, method)(*args, **kwargs)
+            except _SEND_ERRORS as e:
+                error, sent = e, False
+            except anyio.EndOfStream as e:
+                error, sent = e, True
+            except McpError as e:
+                if e.error.code != types.CONNECTION_CLOSED:
+                    raise
+                error, sent = e, True
+            finally:
+                worker.in_flight -= 1
+
+            self._retire(worker)
+            if not any(live.alive for live in self.workers):
+                raise error
+            if attempt or (sent and not retryable):
+                raise StdioWorkerExited(
+                    f"stdio MCP server {worker.index} exited while handling {method}"
+                ) from error
+            self.logger.info(f"Retrying {method} on another stdio MCP server")
+
+    async def list_tools(self) -> types.ListToolsResult:
+        result = await self._run("list_tools", retryable=True)
+        self.retryable_tools = {
+            tool.name
+            for tool in result.tools
+            if tool.annotations is not None
+            and (tool.annotations.readOnlyHint or tool.annotations.idempotentHint)
+        }
+        return result
+
+    async def call_tool(self, name: str, arguments: Optional[dict] = None, **kwargs) -> types.CallToolResult:
+        return await self._run("call_tool", name, arguments, retryable=name in self.retryable_tools, **kwargs)
+
+    def stats(self):
+        return {
+            "size": self.size,
+            "live": sum(worker.alive for worker in self.workers),
+            "spares": len(self.idle_spares),
+            "respawns": self.respawns,
+            "workers": [
+                {"index": worker.index, "in_flight": worker.in_flight, "calls": worker.calls}
+                for worker in self.workers
+            ],
+        }
+
+    async def close(self):
+        self._closed = True
+        for task in list(self._tasks):
+            task.cancel()
+        workers, self.workers = self.workers + self.idle_spares, []
+        self.idle_spares = []
+        await asyncio.gather(
+            *(self._stop(worker) for worker in workers), *self._retired, return_exceptions=True
+        )
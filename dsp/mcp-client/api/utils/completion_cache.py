@@ -0,0 +1,188 @@
+import asyncio
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from utils import serialization
+from utils.logger import logger
+
+
+class CompletionCache:
+    """LLM completions keyed on the exact request, in memory and on disk.
+
+    The key hashes the model, the converted prompt messages, the tool
+    schemas and the sampling parameters, so only an identical LLM turn
+    (including the intermediate tool-calling turns of an agent run) is
+    served from the cache. Completions are stored as their JSON: the most
+    recent ``max_size`` in an in-memory LRU, and up to ``max_disk_entries``
+    in SQLite, written through on every store so they survive restarts.
+    Entries expire ``ttl`` seconds after they were stored.
+    """
+
+    # Rows written between sweeps of expired and excess disk entries
+    SWEEP_EVERY = 100
+
+    def __init__(
+        self,
+        path: Optional[str] = "cache/completions.db",
+        max_size: int = 256,
+        max_disk_entries: int = 10000,
+        ttl: float = 3600.0,
+    ):
+        # None or "" keeps the cache in memory only
+        self.path = path or None
+        self.max_size = max_size
+        self.max_disk_entries = max_disk_entries
+        self.ttl = ttl
+        self.logger = logger
+
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.Lock()
+        self._writes = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_env(cls) -> Optional["CompletionCache"]:
+        """Build a cache from LLM_CACHE_* settings, or None if disabled"""
+        if os.getenv("LLM_CACHE_ENABLED", "false").lower() not in ("1", "true", "yes"):
+            return None
+        return cls(
+            path=os.getenv("LLM_CACHE_PATH", "cache/completions.db"),
+            max_size=int(os.getenv("LLM_CACHE_MAX_SIZE", "256")),
+            max_disk_entries=int(os.getenv("LLM_CACHE_MAX_DISK_ENTRIES", "10000")),
+            ttl=float(os.getenv("LLM_CACHE_TTL", "3600")),
+        )
+
+    @staticmethod
+    def make_key(model: str, messages: List[Dict[str, Any]], tools, params: Dict[str, Any]) -> str:
+        canonical = serialization.dumps_bytes(
+            {"model": model, "messages": messages, "tools": tools or [], "params": params},
+            sort_keys=True,
+        )
+        return hashlib.sha256(canonical).hexdigest()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._db is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._db = sqlite3.connect(self.path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS completions ("
+                "key TEXT PRIMARY KEY, completion TEXT NOT NULL, "
+                "stored_at REAL NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS completions_stored_at ON completions (stored_at)")
+        return self._db
+
+    async def get(self, key: str) -> Optional[str]:
+        """The completion JSON stored under ``key``, or None"""
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, completion = entry
+            if expires_at > time.time():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return completion
+            del self._entries[key]
+
+        if self.path is not None:
+            try:
+                row = await asyncio.to_thread(self._load, key)
+            except Exception as e:
+                self.logger.error(f"Error reading completion cache {self.path}: {e}")
+                row = None
+            if row is not None:
+                completion, expires_at = row
+                self._remember(key, completion, expires_at)
+                self.hits += 1
+                self.disk_hits += 1
+                return completion
+
+        self.misses += 1
+        return None
+
+    async def put(self, key: str, completion: str):
+        expires_at = time.time() + self.ttl
+        self._remember(key, completion, expires_at)
+        if self.path is not None:
+            try:
+                await asyncio.to_thread(self._write, key, completion, expires_at)
+            except Exception as e:
+                self.logger.error(f"Error writing completion cache {self.path}: {e}")
+
+    def _remember(self, key: str, completion: str, expires_at: float):
+        self._entries[key] = (expires_at, completion)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def _load(self, key: str):
+        with self._db_lock:
+            return self._connect().execute(
+                "SELECT completion, expires_at FROM completions WHERE key = ? AND expires_at > ?",
+                (key, time.time()),
+            ).fetchone()
+
+    def _write(self, key: str, completion: str, expires_at: float):
+        now = time.time()
+        with self._db_lock:
+            db = self._connect()
+            with db:
+                db.execute(
+                    "INSERT OR REPLACE INTO completions (key, completion, stored_at, expires_at) "
+                    "VALUES (?, ?, ?, ?)",
+                    (key, completion, now, expires_at),
+                )
+                self._writes += 1
+                if self._writes % self.SWEEP_EVERY == 0:
+                    self._sweep(db, now)
+
+    def _sweep(self, db: sqlite3.Connection, now: float):
+        """Drop expired rows, then the oldest beyond ``max_disk_entries``"""
+        db.execute("DELETE FROM completions WHERE expires_at <= ?", (now,))
+        excess = db.execute("SELECT COUNT(*) FROM completions").fetchone()[0] - self.max_disk_entries
+        if excess > 0:
+            db.execute(
+                "DELETE FROM completions WHERE key IN "
+                "(SELECT key FROM completions ORDER BY stored_at LIMIT ?)",
+                (excess,),
+            )
+
+    async def clear(self):
+        self._entries.clear()
+        if self.path is not None:
+            await asyncio.to_thread(self._clear)
+
+    def _clear(self):
+        with self._db_lock:
+            db = self._connect()
+            with db:
+                db.execute("DELETE FROM completions")
+
+    def close(self):
+        with self._db_lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "in_memory": len(self._entries),
+            "max_size": self.max_size,
+            "path": self.path,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
@@ -0,0 +1,128 @@
+from typing import Any, Callable, Dict, List
+
+
+class ContextWindow:
+    """Incrementally converted, token-budgeted prompt for one conversation.
+
+    Only messages added since the last ``build`` are converted. Tool results
+    larger than ``max_tool_result_chars`` are clipped on conversion, and when
+    the estimated prompt exceeds ``max_tokens`` the oldest tool outputs are
+    replaced by a short placeholder. If that is not enough, the oldest whole
+    turns (a user message and everything up to the next one, so tool calls
+    stay with their results) are left out of the prompt; the current turn is
+    always kept, and a prompt still over budget is counted in
+    ``over_budget``. The conversation history itself is never modified.
+    """
+
+    def __init__(
+        self,
+        convert: Callable[[List[Dict[str, Any]]], List[Dict[str, Any]]],
+        max_tokens: int = 8000,
+        max_tool_result_chars: int = 8000,
+        chars_per_token: float = 4.0,
+    ):
+        self.convert = convert
+        self.max_tokens = max_tokens
+        self.max_tool_result_chars = max_tool_result_chars
+        self.chars_per_token = chars_per_token
+
+        self.converted: List[Dict[str, Any]] = []
+        self.tokens: List[int] = []
+        self.total_tokens = 0
+        self._synced = 0
+        # Stats for the latest build, reported as span attributes
+        self.last_stats: Dict[str, int] = {}
+        # Builds whose prompt did not fit in max_tokens
+        self.over_budget = 0
+
+    def estimate_tokens(self, message: Dict[str, Any]) -> int:
+        chars = len(message.get("content") or "")
+        for tool_call in message.get("tool_calls") or []:
+            function = tool_call.get("function", {})
+            chars += len(function.get("name", "")) + len(function.get("arguments", ""))
+        # Per-message overhead for role and formatting
+        return int(chars / self.chars_per_token) + 4
+
+    def _clip(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        content = message.get("content")
+        limit = self.max_tool_result_chars
+        if message.get("role") != "tool" or not isinstance(content, str) or not limit or len(content) <= limit:
+            return message
+        return {**message, "content": f"{content[:limit]}... [truncated {len(content) - limit} chars]"}
+
+    def sync(self, messages: List[Dict[str, Any]]) -> int:
+        """Convert messages added since the last sync; returns how many"""
+        new_messages = messages[self._synced:]
+        if not new_messages:
+            return 0
+        for message in self.convert(new_messages):
+            message = self._clip(message)
+            tokens = self.estimate_tokens(message)
+            self.converted.append(message)
+            self.tokens.append(tokens)
+            self.total_tokens += tokens
+        self._synced = len(messages)
+        return len(new_messages)
+
+    def build(self, messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Return the OpenAI-format prompt for ``messages`` within the budget"""
+        converted = self.sync(messages)
+        prompt = list(self.converted)
+        tokens = list(self.tokens)
+        total = self.total_tokens
+        truncated = 0
+        dropped = 0
+
+        if self.max_tokens and total > self.max_tokens:
+            # Tool outputs before the latest assistant turn are shrunk first,
+            # oldest first, so the model keeps the results it just asked for
+            latest_turn = max(
+                (i for i, message in enumerate(prompt) if message.get("role") == "assistant"),
+                default=len(prompt),
+            )
+            for i, message in enumerate(prompt[:latest_turn]):
+                if total <= self.max_tokens:
+                    break
+                if message.get("role") != "tool":
+                    continue
+                placeholder = {
+                    **message,
+                    "content": f"[earlier tool output truncated: {len(message.get('content') or '')} chars]",
+                }
+                placeholder_tokens = self.estimate_tokens(placeholder)
+                total -= tokens[i] - placeholder_tokens
+                prompt[i] = placeholder
+                tokens[i] = placeholder_tokens
+                truncated += 1
+
+        if self.max_tokens and total > self.max_tokens:
+            prompt, total, dropped = self._drop_oldest_turns(prompt, tokens, total)
+
+        over_budget = bool(self.max_tokens and total > self.max_tokens)
+        self.over_budget += over_budget
+        self.last_stats = {
+            "prompt_messages": len(prompt),
+            "prompt_tokens": total,
+            "converted_messages": converted,
+            "truncated_messages": truncated,
+            "dropped_messages": dropped,
+            "over_budget": int(over_budget),
+        }
+        return prompt
+
+    def _drop_oldest_turns(self, prompt, tokens, total):
+        """Leave out whole turns, oldest first, until the prompt fits; leading
+        system messages and the current turn are kept"""
+        start = 0
+        while start < len(prompt) and prompt[start].get("role") == "system":
+            start += 1
+        # Where each turn after the first starts; messages before the first
+        # user message belong to the first turn
+        boundaries = [i for i in range(start + 1, len(prompt)) if prompt[i].get("role") == "user"]
+        cut = start
+        for next_turn in boundaries:
+            if total <= self.max_tokens:
+                break
+            total -= sum(tokens[cut:next_turn])
+            cut = next_turn
+        return prompt[:start] + prompt[cut:], total, cut - start
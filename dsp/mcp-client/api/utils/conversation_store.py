@@ -0,0 +1,233 @@
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from utils import serialization
+from utils.journal import serializable_message
+from utils.logger import logger
+
+
+class ConversationStore:
+    """Conversation histories in an in-memory LRU backed by SQLite.
+
+    At most ``max_conversations`` histories are held in memory, each trimmed
+    to its last ``max_messages`` messages. Saved histories stay in memory and
+    are written to the database when they are evicted or the store is
+    closed; a conversation that is not in memory is loaded from the database
+    on demand. Database access runs in a worker thread; evicted histories
+    stay readable until their write has finished.
+    """
+
+    def __init__(
+        self,
+        path: str = "conversations/sessions.db",
+        max_conversations: int = 1000,
+        max_messages: int = 200,
+    ):
+        self.path = path
+        self.max_conversations = max_conversations
+        self.max_messages = max_messages
+        self.logger = logger
+
+        self._entries: "OrderedDict[str, List[Dict[str, Any]]]" = OrderedDict()
+        self._dirty = set()
+        # Evicted histories whose write to the database is in flight
+        self._pending: Dict[str, List[Dict[str, Any]]] = {}
+        # Deleted while their write was in flight; the write skips them
+        self._deleted: set = set()
+        self._locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = weakref.WeakValueDictionary()
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.Lock()
+        self.hits = 0
+        self.loads = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @classmethod
+    def from_env(cls) -> "ConversationStore":
+        return cls(
+            path=os.getenv("CONVERSATION_STORE_PATH", "conversations/sessions.db"),
+            max_conversations=int(os.getenv("CONVERSATION_CACHE_SIZE", "1000")),
+            max_messages=int(os.getenv("CONVERSATION_MAX_MESSAGES", "200")),
+        )
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._db is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._db = sqlite3.connect(self.path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS conversations ("
+                "id TEXT PRIMARY KEY, messages TEXT NOT NULL, updated_at REAL NOT NULL)"
+            )
+        return self._db
+
+    def lock(self, conversation_id: str) -> asyncio.Lock:
+        """Lock serializing turns of one conversation"""
+        lock = self._locks.get(conversation_id)
+        if lock is None:
+            lock = self._locks[conversation_id] = asyncio.Lock()
+        return lock
+
+    def _trim(self, messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Keep the last ``max_messages``, starting at a user message"""
+        if not self.max_messages or len(messages) <= self.max_messages:
+            return messages
+        start = len(messages) - self.max_messages
+        # Never start on a tool result or assistant tool call whose
+        # counterpart was cut off
+        for index in range(start, len(messages)):
+            if messages[index].get("role") == "user":
+                return messages[index:]
+        # One turn longer than the window: keep that whole last turn
+        for index in range(start - 1, -1, -1):
+            if messages[index].get("role") == "user":
+                return messages[index:]
+        return messages
+
+    async def get(self, conversation_id: str) -> Optional[List[Dict[str, Any]]]:
+        """Return a conversation's history, or None if it is unknown"""
+        messages = self._entries.get(conversation_id)
+        if messages is not None:
+            self._entries.move_to_end(conversation_id)
+            self.hits += 1
+            return list(messages)
+
+        messages = self._pending.get(conversation_id)
+        if messages is not None:
+            # Evicted but not written yet: the database does not have it
+            self.hits += 1
+            await self._put(conversation_id, messages, dirty=False)
+            return list(messages)
+
+        messages = await asyncio.to_thread(self._load, conversation_id)
+        if messages is None:
+            self.misses += 1
+            return None
+        self.loads += 1
+        # Another task may have saved the conversation while we were loading
+        if conversation_id not in self._entries:
+            await self._put(conversation_id, messages, dirty=False)
+        return list(self._entries.get(conversation_id, messages))
+
+    async def save(self, conversation_id: str, messages: List[Dict[str, Any]]):
+        """Store a conversation's history; written to disk on eviction"""
+        await self._put(conversation_id, self._trim(list(messages)), dirty=True)
+
+    async def delete(self, conversation_id: str) -> bool:
+        found = self._entries.pop(conversation_id, None) is not None
+        if self._pending.pop(conversation_id, None) is not None:
+            found = True
+            self._deleted.add(conversation_id)
+        self._dirty.discard(conversation_id)
+        return await asyncio.to_thread(self._delete, conversation_id) or found
+
+    async def _put(self, conversation_id: str, messages: List[Dict[str, Any]], dirty: bool):
+        self._entries[conversation_id] = messages
+        self._entries.move_to_end(conversation_id)
+        if dirty:
+            self._dirty.add(conversation_id)
+            self._deleted.discard(conversation_id)
+
+        evicted = []
+        while len(self._entries) > self.max_conversations:
+            evicted_id, evicted_messages = self._entries.popitem(last=False)
+            self.evictions += 1
+            if evicted_id in self._dirty:
+                self._dirty.discard(evicted_id)
+                evicted.append((evicted_id, evicted_messages))
+                self._pending[evicted_id] = evicted_messages
+        if evicted:
+            written = False
+            try:
+                written = await self._persist(evicted)
+            finally:
+                for evicted_id, evicted_messages in evicted:
+                    # Unless a newer eviction of the same conversation is
+                    # being written by now
+                    if self._pending.get(evicted_id) is not evicted_messages:
+                        continue
+                    del self._pending[evicted_id]
+                    self._deleted.discard(evicted_id)
+                    if not written and evicted_id not in self._entries:
+                        # Keep it, as the oldest entry, until a write succeeds
+                        self._entries[evicted_id] = evicted_messages
+                        self._entries.move_to_end(evicted_id, last=False)
+                        self._dirty.add(evicted_id)
+
+    async def _persist(self, entries) -> bool:
+        try:
+            await asyncio.to_thread(self._write, entries)
+            return True
+        except Exception as e:
+            self.logger.error(f"Error writing conversations to {self.path}: {e}")
+            return False
+
+    async def flush(self):
+        """Write every modified in-memory conversation to the database"""
+        entries = [(conversation_id, self._entries[conversation_id]) for conversation_id in self._dirty]
+        self._dirty.clear()
+        if entries and not await self._persist(entries):
+            self._dirty.update(
+                conversation_id for conversation_id, _ in entries if conversation_id in self._entries
+            )
+
+    async def close(self):
+        await self.flush()
+        with self._db_lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "in_memory": len(self._entries),
+            "max_conversations": self.max_conversations,
+            "unsaved": len(self._dirty) + len(self._pending),
+            "hits": self.hits,
+            "loads": self.loads,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def _load(self, conversation_id: str) -> Optional[List[Dict[str, Any]]]:
+        with self._db_lock:
+            row = self._connect().execute(
+                "SELECT messages FROM conversations WHERE id = ?", (conversation_id,)
+            ).fetchone()
+        return serialization.loads(row[0]) if row else None
+
+    def _write(self, entries):
+        now = time.time()
+        rows = [
+            (
+                conversation_id,
+                serialization.dumps([serializable_message(message) for message in messages]),
+                now,
+            )
+            for conversation_id, messages in entries
+        ]
+        with self._db_lock:
+            # Checked under the lock that delete() also takes
+            rows = [row for row in rows if row[0] not in self._deleted]
+            db = self._connect()
+            with db:
+                db.executemany(
+                    "INSERT OR REPLACE INTO conversations (id, messages, updated_at) VALUES (?, ?, ?)",
+                    rows,
+                )
+
+    def _delete(self, conversation_id: str) -> bool:
+        with self._db_lock:
+            db = self._connect()
+            with db:
+                return db.execute(
+                    "DELETE FROM conversations WHERE id = ?", (conversation_id,)
+                ).rowcount > 0
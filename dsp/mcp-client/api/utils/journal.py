@@ -0,0 +1,147 @@
+import asyncio
+import os
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from utils import serialization
+from utils.logger import logger
+
+
+def serializable_message(message: Dict[str, Any]) -> Dict[str, Any]:
+    """Return a JSON-friendly copy of a conversation message"""
+    content = message["content"]
+    if isinstance(content, list):
+        items = []
+        for content_item in content:
+            if hasattr(content_item, "to_dict"):
+                items.append(content_item.to_dict())
+            elif hasattr(content_item, "dict"):
+                items.append(content_item.dict())
+            elif hasattr(content_item, "model_dump"):
+                items.append(content_item.model_dump())
+            else:
+                items.append(content_item)
+        content = items
+    return {**message, "content": content}
+
+
+class ConversationJournal:
+    """Append-only JSONL journal of conversation messages.
+
+    ``record`` only enqueues the message; a background task drains the queue
+    in batches and appends them to ``<directory>/<filename>`` from a worker
+    thread, rotating the file once it exceeds ``max_bytes``.
+    """
+
+    def __init__(
+        self,
+        directory: str = "conversations",
+        filename: str = "conversations.jsonl",
+        max_bytes: int = 10 * 1024 * 1024,
+        backup_count: int = 5,
+        flush_interval: float = 1.0,
+        batch_size: int = 500,
+        max_queue_size: int = 10000,
+    ):
+        self.directory = directory
+        self.path = os.path.join(directory, filename)
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.logger = logger
+
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue_size)
+        self._task: Optional[asyncio.Task] = None
+        self.dropped = 0
+
+    @classmethod
+    def from_env(cls) -> "ConversationJournal":
+        return cls(
+            directory=os.getenv("CONVERSATION_LOG_DIR", "conversations"),
+            max_bytes=int(os.getenv("CONVERSATION_LOG_MAX_BYTES", str(10 * 1024 * 1024))),
+            backup_count=int(os.getenv("CONVERSATION_LOG_BACKUPS", "5")),
+            flush_interval=float(os.getenv("CONVERSATION_LOG_FLUSH_INTERVAL", "1.0")),
+        )
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    def record(self, conversation_id: str, seq: int, message: Dict[str, Any]):
+        """Queue a message for writing without blocking the caller"""
+        entry = {
+            "conversation_id": conversation_id,
+            "seq": seq,
+            "timestamp": datetime.now().isoformat(),
+            "message": message,
+        }
+        try:
+            self._queue.put_nowait(entry)
+        except asyncio.QueueFull:
+            self.dropped += 1
+            self.logger.warning(
+                f"Conversation journal queue full, dropped message {seq} of {conversation_id}"
+            )
+
+    async def close(self):
+        """Flush queued messages and stop the writer task"""
+        if self._task is None:
+            return
+        await self._queue.put(None)
+        await self._task
+        self._task = None
+
+    async def _run(self):
+        closing = False
+        while not closing:
+            entry = await self._queue.get()
+            if entry is None:
+                break
+            batch = [entry]
+
+            # Collect whatever else arrives within the flush interval
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    entry = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if entry is None:
+                    closing = True
+                    break
+                batch.append(entry)
+
+            try:
+                await asyncio.to_thread(self._write, batch)
+            except Exception as e:
+                self.logger.error(f"Error writing conversation journal: {e}")
+
+    def _write(self, batch: List[Dict[str, Any]]):
+        lines = []
+        for entry in batch:
+            entry["message"] = serializable_message(entry["message"])
+            lines.append(serialization.dumps(entry))
+
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+            size = f.tell()
+
+        if self.max_bytes and size >= self.max_bytes:
+            self._rotate()
+
+    def _rotate(self):
+        """Shift journal files so the newest backup is ``<path>.1``"""
+        if self.backup_count <= 0:
+            os.remove(self.path)
+            return
+        for index in range(self.backup_count - 1, 0, -1):
+            source = f"{self.path}.{index}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.path}.{index + 1}")
+        os.replace(self.path, f"{self.path}.1")
@@ -6,7 +6,8 @@ logger = logging.getLogger("MCPClient")
 logger.setLevel(logging.DEBUG)
 
 # File handler with DEBUG level
-file_handler = logging.FileHandler("mcp_client.log")
+# Opened on the first record rather than at import
+file_handler = logging.FileHandler("mcp_client.log", delay=True)
 file_handler.setLevel(logging.DEBUG)
 file_handler.setFormatter(
     logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
@@ -0,0 +1,68 @@
+"""
+JSON encoding for the client API.
+
+Uses orjson when it is installed and the standard library otherwise;
+MCP_JSON_BACKEND=json forces the standard library. Output is compact UTF-8
+either way, and pydantic models (e.g. MCP content items) are encoded as
+their JSON-mode dump.
+"""
+
+import json
+import os
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+BACKEND = "orjson" if orjson is not None and os.getenv("MCP_JSON_BACKEND", "auto") != "json" else "json"
+
+
+def _default(value: Any) -> Any:
+    if hasattr(value, "model_dump"):
+        return value.model_dump(mode="json", exclude_none=True)
+    return str(value)
+
+
+def dumps_bytes(obj: Any, sort_keys: bool = False) -> bytes:
+    if BACKEND == "orjson":
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_SORT_KEYS if sort_keys else 0)
+        try:
+            return orjson.dumps(obj, default=_default, option=option)
+        except TypeError:
+            # e.g. integers beyond 64 bits, which the standard library handles
+            pass
+    return json.dumps(
+        obj, default=_default, ensure_ascii=False, sort_keys=sort_keys, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def dumps(obj: Any, sort_keys: bool = False) -> str:
+    if BACKEND == "orjson":
+        return dumps_bytes(obj, sort_keys).decode("utf-8")
+    return json.dumps(obj, default=_default, ensure_ascii=False, sort_keys=sort_keys, separators=(",", ":"))
+
+
+def loads(data: Any) -> Any:
+    """Parse JSON from str, bytes or bytearray"""
+    if BACKEND == "orjson":
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def tool_result_text(result) -> str:
+    """Text of an MCP tool result as passed to the LLM.
+
+    Tools that return structured content are given as that JSON; otherwise
+    text items are joined and other items (images, resources) are encoded
+    as JSON.
+    """
+    structured = getattr(result, "structuredContent", None)
+    if structured is not None and not result.isError:
+        return dumps(structured)
+    parts = []
+    for item in result.content:
+        text = getattr(item, "text", None)
+        parts.append(text if text is not None else dumps(item))
+    return "\n".join(parts)
@@ -0,0 +1,89 @@
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional
+
+from utils import serialization
+
+
+class ToolResultCache:
+    """LRU cache of MCP tool results with a TTL and a size bound.
+
+    Entries are keyed on the tool name plus its canonicalized arguments, so
+    argument order and whitespace do not affect hits.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 1024,
+        ttl: float = 300.0,
+        tools: Optional[Iterable[str]] = None,
+    ):
+        self.max_size = max_size
+        self.ttl = ttl
+        # Tools cached regardless of their annotations
+        self.tools = set(tools or [])
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+
+    @classmethod
+    def from_env(cls) -> Optional["ToolResultCache"]:
+        """Build a cache from MCP_TOOL_CACHE_* settings, or None if disabled"""
+        if os.getenv("MCP_TOOL_CACHE_ENABLED", "false").lower() not in ("1", "true", "yes"):
+            return None
+        tools = [
+            name.strip()
+            for name in os.getenv("MCP_TOOL_CACHE_TOOLS", "").split(",")
+            if name.strip()
+        ]
+        return cls(
+            max_size=int(os.getenv("MCP_TOOL_CACHE_MAX_SIZE", "1024")),
+            ttl=float(os.getenv("MCP_TOOL_CACHE_TTL", "300")),
+            tools=tools,
+        )
+
+    @staticmethod
+    def make_key(tool_name: str, arguments: Optional[Dict[str, Any]]) -> str:
+        return f"{tool_name}:{serialization.dumps(arguments or {}, sort_keys=True)}"
+
+    def is_cacheable(self, tool) -> bool:
+        """A tool is cacheable if configured by name or annotated read-only"""
+        if tool.name in self.tools:
+            return True
+        annotations = getattr(tool, "annotations", None)
+        return bool(annotations and annotations.readOnlyHint)
+
+    def get(self, tool_name: str, arguments: Optional[Dict[str, Any]]):
+        key = self.make_key(tool_name, arguments)
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, result = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return result
+            del self._entries[key]
+        self.misses += 1
+        return None
+
+    def put(self, tool_name: str, arguments: Optional[Dict[str, Any]], result):
+        key = self.make_key(tool_name, arguments)
+        self._entries[key] = (time.monotonic() + self.ttl, result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
@@ -0,0 +1,237 @@
+import os
+import queue
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+
+from utils import serialization
+from utils.logger import logger
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class RingBufferExporter:
+    """Keeps the most recent spans in memory and aggregates them per stage"""
+
+    # Numeric span attributes summarized alongside latency, e.g. prompt size
+    # per LLM turn
+    SUMMARIZED_ATTRIBUTES = ("prompt_tokens", "usage_prompt_tokens", "truncated_messages")
+
+    def __init__(self, size: int = 10000):
+        self.spans = deque(maxlen=size)
+
+    def export(self, span: Dict[str, Any]):
+        self.spans.append(span)
+
+    def aggregate(self) -> Dict[str, Dict[str, Any]]:
+        """Count, error count, latency percentiles (ms) and attribute summaries per span name"""
+        durations: Dict[str, List[float]] = {}
+        errors: Dict[str, int] = {}
+        attributes: Dict[str, Dict[str, List[float]]] = {}
+        for span in list(self.spans):
+            durations.setdefault(span["name"], []).append(span["duration_ms"])
+            if span.get("error"):
+                errors[span["name"]] = errors.get(span["name"], 0) + 1
+            for key in self.SUMMARIZED_ATTRIBUTES:
+                value = span["attributes"].get(key)
+                if isinstance(value, (int, float)):
+                    attributes.setdefault(span["name"], {}).setdefault(key, []).append(value)
+
+        stages = {}
+        for name, values in sorted(durations.items()):
+            values.sort()
+            stages[name] = {
+                "count": len(values),
+                "errors": errors.get(name, 0),
+                "mean_ms": round(sum(values) / len(values), 3),
+                "p50_ms": round(percentile(values, 50), 3),
+                "p95_ms": round(percentile(values, 95), 3),
+                "p99_ms": round(percentile(values, 99), 3),
+                "max_ms": round(values[-1], 3),
+            }
+            for key, samples in attributes.get(name, {}).items():
+                samples.sort()
+                stages[name][key] = {
+                    "mean": round(sum(samples) / len(samples), 1),
+                    "p50": percentile(samples, 50),
+                    "p95": percentile(samples, 95),
+                    "max": samples[-1],
+                }
+        return stages
+
+    def close(self):
+        pass
+
+
+class JsonLinesExporter:
+    """Appends one JSON line per span to a file.
+
+    ``export`` only enqueues the span; a writer thread drains the queue in
+    batches of up to ``batch_size``, gathering for at most
+    ``flush_interval`` seconds, so spans never cost file I/O on the event
+    loop. Spans arriving while ``max_queue_size`` are waiting are dropped.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        flush_interval: float = 1.0,
+        batch_size: int = 1000,
+        max_queue_size: int = 10000,
+    ):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.logger = logger
+        self.dropped = 0
+
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue_size)
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+
+    def export(self, span: Dict[str, Any]):
+        if self._thread is None:
+            self._start()
+        try:
+            self._queue.put_nowait(span)
+        except queue.Full:
+            self.dropped += 1
+
+    def _start(self):
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="trace-jsonl-writer", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            closing = False
+            while not closing:
+                span = self._queue.get()
+                if span is None:
+                    break
+                batch = [span]
+                # Collect whatever else arrives within the flush interval
+                deadline = time.monotonic() + self.flush_interval
+                while len(batch) < self.batch_size:
+                    timeout = deadline - time.monotonic()
+                    if timeout <= 0:
+                        break
+                    try:
+                        span = self._queue.get(timeout=timeout)
+                    except queue.Empty:
+                        break
+                    if span is None:
+                        closing = True
+                        break
+                    batch.append(span)
+                try:
+                    f.write("".join(serialization.dumps(span) + "\n" for span in batch))
+                    f.flush()
+                except Exception as e:
+                    self.logger.error(f"Error writing spans to {self.path}: {e}")
+
+    def close(self):
+        """Write the queued spans and stop the writer thread"""
+        if self._thread is None:
+            return
+        self._queue.put(None)
+        self._thread.join()
+        self._thread = None
+
+
+class OpenTelemetryExporter:
+    """Re-emits spans through the OpenTelemetry API, if it is installed"""
+
+    def __init__(self, tracer_name: str = "mcp_client"):
+        from opentelemetry import trace
+
+        self._tracer = trace.get_tracer(tracer_name)
+
+    def export(self, span: Dict[str, Any]):
+        attributes = {
+            key: value if isinstance(value, (str, bool, int, float)) else str(value)
+            for key, value in span["attributes"].items()
+        }
+        otel_span = self._tracer.start_span(
+            span["name"], start_time=span["start_ns"], attributes=attributes
+        )
+        if span.get("error"):
+            otel_span.set_attribute("error", True)
+        otel_span.end(end_time=span["start_ns"] + int(span["duration_ms"] * 1e6))
+
+    def close(self):
+        pass
+
+
+class Tracer:
+    """Times the stages of the agent loop and hands each span to its exporters"""
+
+    def __init__(self, exporters: Optional[List[Any]] = None):
+        self.exporters = exporters if exporters is not None else [RingBufferExporter()]
+        self.logger = logger
+
+    @classmethod
+    def from_env(cls) -> "Tracer":
+        """Build a tracer from TRACE_EXPORTERS (memory, jsonl, otel)"""
+        exporters: List[Any] = []
+        for name in os.getenv("TRACE_EXPORTERS", "memory").split(","):
+            name = name.strip().lower()
+            if name == "memory":
+                exporters.append(RingBufferExporter(int(os.getenv("TRACE_RING_SIZE", "10000"))))
+            elif name == "jsonl":
+                exporters.append(JsonLinesExporter(os.getenv("TRACE_JSONL_PATH", "traces/spans.jsonl")))
+            elif name == "otel":
+                try:
+                    exporters.append(OpenTelemetryExporter())
+                except ImportError:
+                    logger.warning("opentelemetry is not installed, skipping otel trace exporter")
+            elif name:
+                logger.warning(f"Unknown trace exporter: {name}")
+        return cls(exporters)
+
+    @contextmanager
+    def span(self, name: str, **attributes):
+        """Time the enclosed block as a span; attributes may be added inside it"""
+        start_ns = time.time_ns()
+        start = time.perf_counter()
+        error = False
+        try:
+            yield attributes
+        except BaseException:
+            error = True
+            raise
+        finally:
+            span = {
+                "name": name,
+                "start_ns": start_ns,
+                "duration_ms": (time.perf_counter() - start) * 1000,
+                "error": error,
+                "attributes": attributes,
+            }
+            for exporter in self.exporters:
+                try:
+                    exporter.export(span)
+                except Exception as e:
+                    self.logger.error(f"Error exporting span {name}: {e}")
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Aggregated per-stage stats from the in-memory exporter"""
+        for exporter in self.exporters:
+            if isinstance(exporter, RingBufferExporter):
+                return exporter.aggregate()
+        return {}
+
+    def close(self):
+        for exporter in self.exporters:
+            exporter.close()
@@ -0,0 +1,276 @@
+"""
+Load-testing benchmark for the MCP Hello World HTTP server.
+
+Drives concurrent tools/call and resources/read traffic through
+MCPHttpClient and reports throughput and latency percentiles as JSON.
+The server can be an existing URL, started in-process, or started as a
+subprocess (optionally with several workers). Results can be saved as a
+baseline and later runs compared against it to flag regressions.
+
+Examples:
+    uv run mcp-hello-bench --server inprocess --requests 500 --concurrency 20
+    uv run mcp-hello-bench --server subprocess --workers 4 --save-baseline base.json
+    uv run mcp-hello-bench --url http://localhost:3000/mcp/ --baseline base.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+import aiohttp
+
+from mcp_hello.http_client_example import MCPHttpClient
+
+# name -> (kind, target, arguments)
+OPERATIONS = {
+    "say_hello": ("tool", "say_hello", {"name": "Alice", "language": "es"}),
+    "get_server_info": ("tool", "get_server_info", {}),
+    "hello_world": ("resource", "file://hello-world", None),
+    "server_status": ("resource", "file://server-status", None),
+}
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def summarize(latencies: List[float], errors: int, elapsed: float) -> Dict[str, Any]:
+    ordered = sorted(latencies)
+    to_ms = 1000.0
+    return {
+        "requests": len(latencies) + errors,
+        "errors": errors,
+        "elapsed_s": round(elapsed, 4),
+        "throughput_rps": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": {
+            "mean": round(sum(ordered) / len(ordered) * to_ms, 3) if ordered else 0.0,
+            "p50": round(percentile(ordered, 50) * to_ms, 3),
+            "p95": round(percentile(ordered, 95) * to_ms, 3),
+            "p99": round(percentile(ordered, 99) * to_ms, 3),
+            "max": round(ordered[-1] * to_ms, 3) if ordered else 0.0,
+        },
+    }
+
+
+async def run_operation(url: str, operation: str, requests: int, concurrency: int):
+    """Issue ``requests`` calls of one operation from ``concurrency`` clients"""
+    kind, target, arguments = OPERATIONS[operation]
+    latencies: List[float] = []
+    errors = 0
+    remaining = requests
+
+    async def worker(client: MCPHttpClient):
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            start = time.perf_counter()
+            try:
+                if kind == "tool":
+                    await client.call_tool(target, arguments)
+                else:
+                    await client.get_resource(target)
+                latencies.append(time.perf_counter() - start)
+            except Exception:
+                errors += 1
+
+    clients = [MCPHttpClient(url, verbose=False) for _ in range(concurrency)]
+    for client in clients:
+        await client.__aenter__()
+    try:
+        start = time.perf_counter()
+        await asyncio.gather(*(worker(client) for client in clients))
+        elapsed = time.perf_counter() - start
+    finally:
+        for client in clients:
+            await client.__aexit__(None, None, None)
+
+    return summarize(latencies, errors, elapsed)
+
+
+async def wait_for_health(base: str, timeout: float = 30):
+    deadline = time.monotonic() + timeout
+    async with aiohttp.ClientSession() as session:
+        while time.monotonic() < deadline:
+            try:
+                async with session.get(f"{base}/health") as response:
+                    if response.status == 200:
+                        return
+            except aiohttp.ClientError:
+                pass
+            await asyncio.sleep(0.2)
+    raise TimeoutError(f"Server at {base} did not become healthy in {timeout}s")
+
+
+class InProcessServer:
+    """Serve the FastMCP HTTP app with uvicorn on the benchmark's event loop"""
+
+    def __init__(self, host: str, port: int):
+        import uvicorn
+
+        from mcp_hello.server import http_middleware, mcp
+
+        config = uvicorn.Config(
+            mcp.http_app(middleware=http_middleware()), host=host, port=port, log_level="warning"
+        )
+        self.server = uvicorn.Server(config)
+        self.task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        self.task = asyncio.create_task(self.server.serve())
+        while not self.server.started:
+            if self.task.done():
+                self.task.result()
+            await asyncio.sleep(0.05)
+
+    async def stop(self):
+        self.server.should_exit = True
+        await self.task
+
+
+class SubprocessServer:
+    """Run ``python -m mcp_hello.server`` as a child process"""
+
+    def __init__(self, host: str, port: int, workers: int):
+        self.base = f"http://{host}:{port}"
+        self.command = [
+            sys.executable, "-m", "mcp_hello.server",
+            "--host", host, "--port", str(port), "--workers", str(workers),
+        ]
+        self.process: Optional[subprocess.Popen] = None
+
+    async def start(self):
+        self.process = subprocess.Popen(
+            self.command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        await wait_for_health(self.base)
+
+    async def stop(self):
+        self.process.terminate()
+        await asyncio.to_thread(self.process.wait, 30)
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], threshold: float):
+    """Return regressions where throughput fell or p95 rose beyond ``threshold``"""
+    regressions = []
+    for operation, current in results["operations"].items():
+        previous = baseline.get("operations", {}).get(operation)
+        if not previous:
+            continue
+        old_rps, new_rps = previous["throughput_rps"], current["throughput_rps"]
+        if old_rps and new_rps < old_rps * (1 - threshold):
+            regressions.append({
+                "operation": operation,
+                "metric": "throughput_rps",
+                "baseline": old_rps,
+                "current": new_rps,
+            })
+        old_p95, new_p95 = previous["latency_ms"]["p95"], current["latency_ms"]["p95"]
+        if old_p95 and new_p95 > old_p95 * (1 + threshold):
+            regressions.append({
+                "operation": operation,
+                "metric": "latency_ms.p95",
+                "baseline": old_p95,
+                "current": new_p95,
+            })
+    return regressions
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark the MCP Hello World server")
+    parser.add_argument("--url", help="Benchmark an already running server at this MCP URL")
+    parser.add_argument(
+        "--server",
+        choices=["inprocess", "subprocess"],
+        default="subprocess",
+        help="How to start the server when --url is not given",
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=int(os.getenv("MCP_BENCH_PORT", "3900")))
+    parser.add_argument("--workers", type=int, default=1, help="Server workers (subprocess only)")
+    parser.add_argument("--requests", type=int, default=1000, help="Requests per operation")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument(
+        "--operations",
+        default=",".join(OPERATIONS),
+        help=f"Comma separated subset of: {', '.join(OPERATIONS)}",
+    )
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    parser.add_argument("--save-baseline", help="Save the report as a baseline file")
+    parser.add_argument("--baseline", help="Compare against a saved baseline file")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.10,
+        help="Relative change that counts as a regression (default 0.10)",
+    )
+    return parser.parse_args(argv)
+
+
+async def run(args: argparse.Namespace) -> int:
+    operations = [name.strip() for name in args.operations.split(",") if name.strip()]
+    unknown = [name for name in operations if name not in OPERATIONS]
+    if unknown:
+        raise ValueError(f"Unknown operations: {unknown}")
+
+    server = None
+    if args.url:
+        url = args.url
+    else:
+        url = f"http://{args.host}:{args.port}/mcp/"
+        if args.server == "inprocess":
+            server = InProcessServer(args.host, args.port)
+        else:
+            server = SubprocessServer(args.host, args.port, args.workers)
+        await server.start()
+
+    try:
+        results = {
+            "url": url,
+            "server": "external" if args.url else args.server,
+            "workers": args.workers,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "operations": {},
+        }
+        for operation in operations:
+            results["operations"][operation] = await run_operation(
+                url, operation, args.requests, args.concurrency
+            )
+    finally:
+        if server is not None:
+            await server.stop()
+
+    exit_code = 0
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        results["regressions"] = regressions
+        exit_code = 1 if regressions else 0
+
+    report = json.dumps(results, indent=2)
+    print(report)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(report)
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            f.write(report)
+    return exit_code
+
+
+def main(argv=None):
+    """Entry point for the mcp-hello-bench command"""
+    sys.exit(asyncio.run(run(parse_args(argv))))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+"""
+HTTP response compression for the MCP Hello World server.
+
+``CompressionMiddleware`` picks the best encoding the client accepts
+(zstd and brotli when their packages are installed, gzip always) and
+compresses responses:
+
+- complete bodies of at least ``minimum_size`` bytes
+- streamed bodies, including the SSE streams MCP answers with, chunk by
+  chunk: the compressor is flushed after every chunk, so an event is never
+  held back waiting for more data
+
+Bodies that are already encoded or not text-like (images, archives) are
+passed through unchanged.
+"""
+
+import zlib
+from typing import Dict, Iterable, List, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+DEFAULT_MINIMUM_SIZE = 1024
+
+
+class GzipCompressor:
+    def __init__(self, level: int = 6):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes, finish: bool) -> bytes:
+        mode = zlib.Z_FINISH if finish else zlib.Z_SYNC_FLUSH
+        return self._compressor.compress(data) + self._compressor.flush(mode)
+
+
+class BrotliCompressor:
+    def __init__(self, quality: int = 4):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes, finish: bool) -> bytes:
+        output = self._compressor.process(data)
+        return output + (self._compressor.finish() if finish else self._compressor.flush())
+
+
+class ZstdCompressor:
+    def __init__(self, level: int = 3):
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes, finish: bool) -> bytes:
+        output = self._compressor.compress(data)
+        if finish:
+            return output + self._compressor.flush()
+        return output + self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+
+# Encoding -> compressor, in order of preference
+COMPRESSORS = {"gzip": GzipCompressor}
+if brotli is not None:
+    COMPRESSORS = {"br": BrotliCompressor, **COMPRESSORS}
+if zstandard is not None:
+    COMPRESSORS = {"zstd": ZstdCompressor, **COMPRESSORS}
+
+
+def available_encodings() -> List[str]:
+    return list(COMPRESSORS)
+
+
+def parse_accept_encoding(value: str) -> Dict[str, float]:
+    """``"gzip;q=0.5, br"`` -> ``{"gzip": 0.5, "br": 1.0}``"""
+    accepted = {}
+    for item in value.split(","):
+        name, _, params = item.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if name:
+            accepted[name.strip().lower()] = quality
+    return accepted
+
+
+def choose_encoding(accept_encoding: str, encodings: Iterable[str]) -> Optional[str]:
+    """The first of ``encodings`` (in server preference order) the client
+    accepts with a non-zero quality"""
+    accepted = parse_accept_encoding(accept_encoding)
+    wildcard = accepted.get("*", 0.0)
+    for encoding in encodings:
+        if accepted.get(encoding, wildcard) > 0:
+            return encoding
+    return None
+
+
+def is_compressible(content_type: str) -> bool:
+    content_type = content_type.split(";", 1)[0].strip().lower()
+    return content_type.startswith("text/") or content_type.endswith(("json", "xml", "javascript"))
+
+
+class CompressionMiddleware:
+    """ASGI middleware compressing responses per the request's Accept-Encoding"""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = DEFAULT_MINIMUM_SIZE,
+        encodings: Optional[Iterable[str]] = None,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        # Server preference order, limited to the installed compressors
+        self.encodings = [
+            encoding for encoding in (encodings or available_encodings()) if encoding in COMPRESSORS
+        ]
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or not self.encodings:
+            await self.app(scope, receive, send)
+            return
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""), self.encodings)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        await CompressedResponder(self.app, encoding, self.minimum_size)(scope, receive, send)
+
+
+class CompressedResponder:
+    """Compresses one response; the start message is held until the first
+    body chunk shows whether the response is worth compressing"""
+
+    def __init__(self, app: ASGIApp, encoding: str, minimum_size: int):
+        self.app = app
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.send: Optional[Send] = None
+        self.start: Optional[Message] = None
+        self.compressor = None
+        self.decided = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        self.send = send
+        await self.app(scope, receive, self.send_compressed)
+
+    async def send_compressed(self, message: Message):
+        if message["type"] == "http.response.start":
+            self.start = message
+            return
+        if message["type"] != "http.response.body":
+            await self._start()
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if not self.decided:
+            self.decided = True
+            headers = Headers(raw=self.start["headers"])
+            compress = (
+                "content-encoding" not in headers
+                and is_compressible(headers.get("content-type", ""))
+                and (more_body or len(body) >= self.minimum_size)
+            )
+            if compress:
+                self.compressor = COMPRESSORS[self.encoding]()
+                response_headers = MutableHeaders(raw=self.start["headers"])
+                response_headers["Content-Encoding"] = self.encoding
+                response_headers.add_vary_header("Accept-Encoding")
+                if "content-length" in response_headers:
+                    del response_headers["Content-Length"]
+                if not more_body:
+                    body = self.compressor.compress(body, finish=True)
+                    response_headers["Content-Length"] = str(len(body))
+                    await self._start()
+                    await self.send({"type": "http.response.body", "body": body})
+                    return
+            await self._start()
+
+        if self.compressor is not None:
+            message = {
+                "type": "http.response.body",
+                "body": self.compressor.compress(body, finish=not more_body),
+                "more_body": more_body,
+            }
+        await self.send(message)
+
+    async def _start(self):
+        if self.start is not None:
+            await self.send(self.start)
+            self.start = None
+
@@ -0,0 +1,402 @@
+"""
+SQLite FTS5 documentation store.
+
+Documents live in a plain table with an external-content FTS5 index kept in
+sync by triggers. Searches are ranked with BM25 (title matches weigh more
+than body matches), paginated, served from a small pool of read-only
+connections and cached for a short TTL. Ingestion is incremental: each
+document carries a checksum and unchanged documents are skipped.
+
+Build or update an index from a directory of Markdown/text files or from
+JSON Lines (``{"id", "title", "body", "source"}`` per line):
+
+    uv run mcp-hello-docs ingest docs/ --db docs.db
+    uv run mcp-hello-docs ingest corpus.jsonl --db docs.db
+    uv run mcp-hello-docs search "mcp resources" --db docs.db
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import queue
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from mcp_hello import serialization
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    doc_id TEXT NOT NULL UNIQUE,
+    title TEXT NOT NULL,
+    body TEXT NOT NULL,
+    source TEXT NOT NULL DEFAULT '',
+    checksum TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS documents_fts USING fts5(
+    title, body, content='documents', content_rowid='id', tokenize='porter unicode61'
+);
+CREATE TRIGGER IF NOT EXISTS documents_ai AFTER INSERT ON documents BEGIN
+    INSERT INTO documents_fts(rowid, title, body) VALUES (new.id, new.title, new.body);
+END;
+CREATE TRIGGER IF NOT EXISTS documents_ad AFTER DELETE ON documents BEGIN
+    INSERT INTO documents_fts(documents_fts, rowid, title, body)
+    VALUES ('delete', old.id, old.title, old.body);
+END;
+CREATE TRIGGER IF NOT EXISTS documents_au AFTER UPDATE ON documents BEGIN
+    INSERT INTO documents_fts(documents_fts, rowid, title, body)
+    VALUES ('delete', old.id, old.title, old.body);
+    INSERT INTO documents_fts(rowid, title, body) VALUES (new.id, new.title, new.body);
+END;
+"""
+
+# BM25 column weights: title, body
+TITLE_WEIGHT = 10.0
+BODY_WEIGHT = 1.0
+MAX_LIMIT = 50
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+def match_expression(query: str) -> str:
+    """Turn free text into an FTS5 query matching all of its words.
+
+    Each word is quoted so punctuation and FTS5 operators in user input
+    cannot cause syntax errors.
+    """
+    return " ".join(f'"{token}"' for token in _TOKEN.findall(query.lower()))
+
+
+def checksum(title: str, body: str, source: str) -> str:
+    digest = hashlib.sha1()
+    for part in (title, body, source):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class DocumentStore:
+    """Searchable documentation index in a SQLite database file"""
+
+    def __init__(
+        self,
+        path: str = "docs.db",
+        pool_size: int = 4,
+        cache_size: int = 256,
+        cache_ttl: float = 60.0,
+    ):
+        self.path = path
+        self.pool_size = pool_size
+        self.cache_size = cache_size
+        self.cache_ttl = cache_ttl
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+        self._cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+        # Searches run in worker threads
+        self._cache_lock = threading.Lock()
+        self._pool: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._opened = 0
+        self._initialized = False
+        self._seed_lock = threading.Lock()
+        self._seeded = False
+
+    @classmethod
+    def from_env(cls, default_path: str = "docs.db") -> "DocumentStore":
+        return cls(
+            path=os.getenv("DOCS_DB_PATH", default_path),
+            pool_size=int(os.getenv("DOCS_READ_POOL_SIZE", "4")),
+            cache_size=int(os.getenv("DOCS_CACHE_SIZE", "256")),
+            cache_ttl=float(os.getenv("DOCS_CACHE_TTL", "60")),
+        )
+
+    def connect(self) -> sqlite3.Connection:
+        """Open a read-write connection, creating the schema if needed"""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        db = sqlite3.connect(self.path)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        db.executescript(SCHEMA)
+        return db
+
+    def _ensure_schema(self):
+        if not self._initialized:
+            self.connect().close()
+            self._initialized = True
+
+    @contextmanager
+    def reader(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a pooled read-only connection"""
+        try:
+            db = self._pool.get_nowait()
+        except queue.Empty:
+            self._ensure_schema()
+            db = sqlite3.connect(
+                f"file:{os.path.abspath(self.path)}?mode=ro", uri=True, check_same_thread=False
+            )
+            self._opened += 1
+        try:
+            yield db
+        finally:
+            # Keep at most pool_size idle connections around
+            if self._pool.qsize() < self.pool_size:
+                self._pool.put(db)
+            else:
+                db.close()
+
+    def ingest(self, documents: Iterable[Dict[str, Any]], batch_size: int = 1000) -> Dict[str, int]:
+        """Add or update documents, skipping those whose content is unchanged.
+
+        Each document needs ``id``, ``title`` and ``body``; ``source`` is
+        optional. Returns counts of added, updated and unchanged documents.
+        """
+        counts = {"added": 0, "updated": 0, "unchanged": 0}
+        db = self.connect()
+        try:
+            batch: List[Dict[str, Any]] = []
+            for document in documents:
+                batch.append(document)
+                if len(batch) >= batch_size:
+                    self._ingest_batch(db, batch, counts)
+                    batch = []
+            if batch:
+                self._ingest_batch(db, batch, counts)
+        finally:
+            db.close()
+        self.clear_cache()
+        return counts
+
+    def seed(self, documents: Iterable[Dict[str, Any]]) -> Optional[Dict[str, int]]:
+        """Ingest ``documents`` if the index is empty, so a fresh install
+        has something to search; returns the ingest counts, or None if the
+        index already had documents. Only the first successful call checks;
+        if the ingest fails, the next call tries again."""
+        with self._seed_lock:
+            if self._seeded:
+                return None
+            db = self.connect()
+            try:
+                empty = db.execute("SELECT NOT EXISTS (SELECT 1 FROM documents)").fetchone()[0]
+            finally:
+                db.close()
+            counts = self.ingest(documents) if empty else None
+            self._seeded = True
+            return counts
+
+    def optimize(self):
+        """Merge the index segments; worthwhile after a large bulk load"""
+        db = self.connect()
+        try:
+            with db:
+                db.execute("INSERT INTO documents_fts(documents_fts) VALUES ('optimize')")
+        finally:
+            db.close()
+
+    def _ingest_batch(self, db: sqlite3.Connection, batch: List[Dict[str, Any]], counts: Dict[str, int]):
+        rows = {}
+        for document in batch:
+            title, body = str(document["title"]), str(document["body"])
+            source = str(document.get("source", ""))
+            rows[str(document["id"])] = (title, body, source, checksum(title, body, source))
+
+        existing = {}
+        ids = list(rows)
+        for offset in range(0, len(ids), 500):
+            chunk = ids[offset:offset + 500]
+            existing.update(db.execute(
+                f"SELECT doc_id, checksum FROM documents WHERE doc_id IN ({','.join('?' * len(chunk))})",
+                chunk,
+            ).fetchall())
+
+        now = time.time()
+        inserts, updates = [], []
+        for doc_id, (title, body, source, digest) in rows.items():
+            if doc_id not in existing:
+                inserts.append((doc_id, title, body, source, digest, now))
+            elif existing[doc_id] != digest:
+                updates.append((title, body, source, digest, now, doc_id))
+            else:
+                counts["unchanged"] += 1
+
+        with db:
+            db.executemany(
+                "INSERT INTO documents (doc_id, title, body, source, checksum, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                inserts,
+            )
+            db.executemany(
+                "UPDATE documents SET title = ?, body = ?, source = ?, checksum = ?, updated_at = ? "
+                "WHERE doc_id = ?",
+                updates,
+            )
+        counts["added"] += len(inserts)
+        counts["updated"] += len(updates)
+
+    def search(self, query: str, limit: int = 10, offset: int = 0) -> Dict[str, Any]:
+        """Ranked full-text search with pagination"""
+        limit = max(1, min(int(limit), MAX_LIMIT))
+        offset = max(0, int(offset))
+        expression = match_expression(query)
+        if not expression:
+            return {"query": query, "total": 0, "limit": limit, "offset": offset, "results": []}
+
+        key = (expression, limit, offset)
+        with self._cache_lock:
+            cached = self._cache.get(key)
+            if cached is not None and time.monotonic() - cached[0] < self.cache_ttl:
+                self._cache.move_to_end(key)
+                self.cache_hits += 1
+                return cached[1]
+            self.cache_misses += 1
+
+        with self.reader() as db:
+            total = db.execute(
+                "SELECT count(*) FROM documents_fts WHERE documents_fts MATCH ?", (expression,)
+            ).fetchone()[0]
+            rows = db.execute(
+                "SELECT d.doc_id, d.title, d.source, "
+                "snippet(documents_fts, 1, '', '', ' ... ', 24), "
+                f"bm25(documents_fts, {TITLE_WEIGHT}, {BODY_WEIGHT}) AS rank "
+                "FROM documents_fts JOIN documents d ON d.id = documents_fts.rowid "
+                "WHERE documents_fts MATCH ? ORDER BY rank LIMIT ? OFFSET ?",
+                (expression, limit, offset),
+            ).fetchall()
+
+        result = {
+            "query": query,
+            "total": total,
+            "limit": limit,
+            "offset": offset,
+            "results": [
+                {"id": doc_id, "title": title, "source": source, "snippet": snippet, "score": round(-rank, 4)}
+                for doc_id, title, source, snippet, rank in rows
+            ],
+        }
+        with self._cache_lock:
+            self._cache[key] = (time.monotonic(), result)
+            self._cache.move_to_end(key)
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return result
+
+    def get(self, doc_id: str) -> Optional[Dict[str, Any]]:
+        with self.reader() as db:
+            row = db.execute(
+                "SELECT doc_id, title, body, source, updated_at FROM documents WHERE doc_id = ?",
+                (doc_id,),
+            ).fetchone()
+        if row is None:
+            return None
+        return dict(zip(("id", "title", "body", "source", "updated_at"), row))
+
+    def overview(self, recent: int = 5, excerpt_chars: int = 500) -> Dict[str, Any]:
+        """Document count and the most recently updated documents, each with
+        the start of its body"""
+        with self.reader() as db:
+            count = db.execute("SELECT count(*) FROM documents").fetchone()[0]
+            rows = db.execute(
+                "SELECT doc_id, title, source, substr(body, 1, ?) FROM documents "
+                "ORDER BY updated_at DESC, id DESC LIMIT ?",
+                (excerpt_chars, recent),
+            ).fetchall()
+        return {
+            "documents": count,
+            "recent": [
+                {"id": doc_id, "title": title, "source": source, "excerpt": excerpt}
+                for doc_id, title, source, excerpt in rows
+            ],
+        }
+
+    def clear_cache(self):
+        with self._cache_lock:
+            self._cache.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "cache_size": len(self._cache),
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+            "read_connections": self._opened,
+        }
+
+    def close(self):
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+def read_text_document(file_path: str, doc_id: str) -> Dict[str, Any]:
+    """A Markdown/text file as a document titled by its first heading"""
+    with open(file_path, encoding="utf-8", errors="replace") as f:
+        body = f.read()
+    title = os.path.splitext(os.path.basename(file_path))[0]
+    for line in body.splitlines():
+        if line.startswith("#"):
+            title = line.lstrip("#").strip() or title
+            break
+    return {"id": doc_id, "title": title, "body": body, "source": file_path}
+
+
+def read_documents(path: str) -> Iterator[Dict[str, Any]]:
+    """Yield documents from a JSON Lines file or a directory of text files.
+
+    Files under a directory use their relative path as id and their first
+    Markdown heading (or file name) as title.
+    """
+    if os.path.isfile(path):
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield serialization.loads(line)
+        return
+
+    for root, _, files in os.walk(path):
+        for name in sorted(files):
+            if not name.endswith((".md", ".markdown", ".txt", ".rst")):
+                continue
+            file_path = os.path.join(root, name)
+            yield read_text_document(file_path, os.path.relpath(file_path, path))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build and query the documentation index")
+    parser.add_argument("--db", default=os.getenv("DOCS_DB_PATH", os.path.join("data", "docs.db")), help="Index database file")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    ingest = commands.add_parser("ingest", help="Add or update documents from a directory or JSONL file")
+    ingest.add_argument("path")
+    ingest.add_argument("--batch-size", type=int, default=1000)
+    ingest.add_argument("--optimize", action="store_true", help="Merge index segments afterwards")
+
+    search = commands.add_parser("search", help="Search the index")
+    search.add_argument("query")
+    search.add_argument("--limit", type=int, default=10)
+    search.add_argument("--offset", type=int, default=0)
+
+    args = parser.parse_args(argv)
+    store = DocumentStore(args.db)
+    if args.command == "ingest":
+        start = time.perf_counter()
+        counts = store.ingest(read_documents(args.path), batch_size=args.batch_size)
+        if args.optimize:
+            store.optimize()
+        counts["seconds"] = round(time.perf_counter() - start, 3)
+        print(json.dumps(counts))
+    else:
+        print(json.dumps(store.search(args.query, args.limit, args.offset), indent=2, ensure_ascii=False))
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
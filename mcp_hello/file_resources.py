@@ -0,0 +1,114 @@
+"""
+File-backed resources served in chunks for the MCP Hello World server.
+
+Files under a directory (``MCP_FILES_DIR``) are exposed as
+``file://files/{name}``. Reading that URI returns the file's size, etag
+and chunk layout; the content is read page by page from
+``file://files/{name}/chunks/{index}`` or by byte range from
+``file://files/{name}/range/{offset}/{length}``. Reads slice a memory map
+of the file, so a request only touches the pages it returns and memory use
+does not grow with the file size.
+"""
+
+import mimetypes
+import mmap
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+
+class FileResources:
+    """Chunked, memory-mapped reads of the files in one directory"""
+
+    def __init__(self, root: str, chunk_size: int = DEFAULT_CHUNK_SIZE, max_open: int = 32):
+        self.root = os.path.realpath(root)
+        self.chunk_size = max(1, chunk_size)
+        # Open memory maps, most recently used last
+        self.max_open = max(1, max_open)
+        self._maps: "OrderedDict[str, Tuple[Tuple[int, int], Optional[mmap.mmap]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "FileResources":
+        return cls(
+            os.getenv("MCP_FILES_DIR", "files"),
+            chunk_size=int(os.getenv("MCP_FILE_CHUNK_SIZE", str(DEFAULT_CHUNK_SIZE))),
+            max_open=int(os.getenv("MCP_FILE_MAX_OPEN", "32")),
+        )
+
+    def resolve(self, name: str) -> str:
+        """Path of a served file; names may not leave the root directory"""
+        path = os.path.realpath(os.path.join(self.root, name))
+        if os.path.dirname(path) != self.root or not os.path.isfile(path):
+            raise FileNotFoundError(f"No such file resource: {name}")
+        return path
+
+    def list(self) -> List[Dict[str, Any]]:
+        if not os.path.isdir(self.root):
+            return []
+        return [
+            {"name": entry.name, "uri": f"file://files/{entry.name}", "size": entry.stat().st_size}
+            for entry in sorted(os.scandir(self.root), key=lambda entry: entry.name)
+            if entry.is_file()
+        ]
+
+    def info(self, name: str) -> Dict[str, Any]:
+        """Size, etag and chunk layout of a file"""
+        stat = os.stat(self.resolve(name))
+        return {
+            "name": name,
+            "size": stat.st_size,
+            "mime_type": mimetypes.guess_type(name)[0] or "application/octet-stream",
+            "etag": f"{stat.st_mtime_ns:x}-{stat.st_size:x}",
+            "chunk_size": self.chunk_size,
+            "chunks": -(-stat.st_size // self.chunk_size),
+            "chunk_uri": f"file://files/{name}/chunks/{{index}}",
+        }
+
+    def _map(self, name: str) -> Optional[mmap.mmap]:
+        """Memory map of a file, reopened when the file changed on disk"""
+        path = self.resolve(name)
+        stat = os.stat(path)
+        key = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            cached = self._maps.get(path)
+            if cached is not None and cached[0] == key:
+                self._maps.move_to_end(path)
+                return cached[1]
+            mapped = None
+            # Empty files cannot be mapped; the map keeps its own descriptor
+            if stat.st_size:
+                with open(path, "rb") as handle:
+                    mapped = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+                if hasattr(mmap, "MADV_SEQUENTIAL"):
+                    mapped.madvise(mmap.MADV_SEQUENTIAL)
+            # Replaced and evicted maps are not closed here: a read in
+            # another thread may still hold them, and they close once
+            # the last reference is gone
+            self._maps[path] = (key, mapped)
+            self._maps.move_to_end(path)
+            while len(self._maps) > self.max_open:
+                self._maps.popitem(last=False)
+            return mapped
+
+    def read_range(self, name: str, offset: int, length: int) -> bytes:
+        """Up to ``length`` bytes (at most one chunk) starting at ``offset``"""
+        if offset < 0 or length < 0:
+            raise ValueError("offset and length must not be negative")
+        mapped = self._map(name)
+        if mapped is None:
+            return b""
+        # Slicing copies only the requested bytes out of the page cache
+        return mapped[offset:offset + min(length, self.chunk_size)]
+
+    def read_chunk(self, name: str, index: int) -> bytes:
+        if index < 0:
+            raise ValueError("chunk index must not be negative")
+        return self.read_range(name, index * self.chunk_size, self.chunk_size)
+
+    def close(self):
+        with self._lock:
+            self._maps.clear()
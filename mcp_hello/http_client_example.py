@@ -1,38 +1,84 @@
 """
 HTTP client example for the MCP Hello World server.
 
-This demonstrates how to interact with the MCP server over HTTP using Server-Sent Events (SSE).
+This demonstrates how to interact with the MCP server over HTTP using Server-Sent Events (SSE),
+falling back to plain JSON bodies when the server is configured for JSON responses.
 """
 
 import asyncio
+import base64
 import json
 import aiohttp
 import uuid
-from typing import Dict, Any
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Set, Tuple
+
+from mcp_hello import serialization
+from mcp_hello.sse import SSEParser
 
 base_url = "http://localhost:3000/mcp/"
 
 
 class MCPHttpClient:
-    """Simple HTTP client for MCP server communication using SSE."""
-
-    def __init__(self, base_url: str = base_url):
+    """Simple HTTP client for MCP server communication using SSE.
+
+    Requests share one bounded, keep-alive connection pool, so many calls
+    can be in flight at once (see ``call_many``) or sent together as a
+    JSON-RPC batch (see ``batch``).
+    """
+
+    def __init__(
+        self,
+        base_url: str = base_url,
+        verbose: bool = True,
+        max_connections: int = 10,
+        keepalive_timeout: float = 30.0,
+        max_concurrency: int = 10,
+        accept_encoding: Optional[str] = None,
+    ):
         self.base_url = base_url.rstrip("/")
         self.session = None
         self.session_id = None
+        self.verbose = verbose
+        self.max_connections = max_connections
+        self.keepalive_timeout = keepalive_timeout
+        self.max_concurrency = max_concurrency
+        # Cleared the first time the server rejects a batch payload
+        self.supports_batch = True
+        # Last etag and content per resource, for conditional reads
+        self._resources: Dict[str, Tuple[str, Any]] = {}
+        # Built once and reused by every request
+        self._headers = {
+            'Content-Type': 'application/json',
+            'Accept': 'application/json, text/event-stream',
+            # Compressed responses are decoded transparently by aiohttp;
+            # "identity" turns compression off
+            'Accept-Encoding': accept_encoding or self.default_accept_encoding(),
+        }
+
+    @staticmethod
+    def default_accept_encoding() -> str:
+        """The response encodings aiohttp can decode"""
+        from aiohttp.compression_utils import HAS_BROTLI
+
+        return "gzip, deflate, br" if HAS_BROTLI else "gzip, deflate"
+
+    def _log(self, message: str):
+        if self.verbose:
+            print(message)
 
     async def __aenter__(self):
-        self.session = aiohttp.ClientSession()
+        connector = aiohttp.TCPConnector(
+            limit=self.max_connections,
+            limit_per_host=self.max_connections,
+            keepalive_timeout=self.keepalive_timeout,
+            ttl_dns_cache=300,
+        )
+        self.session = aiohttp.ClientSession(connector=connector, json_serialize=serialization.dumps)
         await self._initialize_session()
         return self
 
     async def _initialize_session(self):
         """Initialize MCP session with the server."""
-        headers = {
-            'Content-Type': 'application/json',
-            'Accept': 'application/json, text/event-stream'
-        }
-
         # Step 1: Initialize
         init_payload = {
             "jsonrpc": "2.0",
@@ -46,11 +92,11 @@ class MCPHttpClient:
         }
 
         try:
-            async with self.session.post(f"{self.base_url}/", json=init_payload, headers=headers) as response:
+            async with self.session.post(f"{self.base_url}/", json=init_payload, headers=self._headers) as response:
                 # Extract session ID from headers
                 self.session_id = response.headers.get('mcp-session-id')
                 if self.session_id:
-                    print(f"🔑 Session initialized: {self.session_id}")
+                    self._log(f"🔑 Session initialized: {self.session_id}")
 
                     # Step 2: Send initialized notification
                     initialized_payload = {
@@ -59,89 +105,314 @@ class MCPHttpClient:
                         "params": {}
                     }
 
-                    headers['mcp-session-id'] = self.session_id
-                    async with self.session.post(f"{self.base_url}/", json=initialized_payload, headers=headers) as init_response:
-                        print("✅ MCP handshake completed")
+                    self._headers['mcp-session-id'] = self.session_id
+                    async with self.session.post(f"{self.base_url}/", json=initialized_payload, headers=self._headers) as init_response:
+                        self._log("✅ MCP handshake completed")
                 else:
-                    print("⚠️  No session ID received")
+                    self._log("⚠️  No session ID received")
         except Exception as e:
-            print(f"⚠️  Session initialization failed: {e}")
+            self._log(f"⚠️  Session initialization failed: {e}")
             # Continue anyway, session might not be required for all operations
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         if self.session:
             await self.session.close()
 
-    async def _send_request(self, method: str, params: Dict[str, Any] = None) -> Dict[str, Any]:
-        """Send an MCP request using SSE transport."""
-        if not self.session:
-            raise RuntimeError("Client session not initialized. Use 'async with' context manager.")
-
-        # Create JSON-RPC request
-        request_id = str(uuid.uuid4())
-        payload = {
+    @staticmethod
+    def _make_request(method: str, params: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Create a JSON-RPC request with a fresh id."""
+        return {
             "jsonrpc": "2.0",
-            "id": request_id,
+            "id": str(uuid.uuid4()),
             "method": method,
             "params": params or {}
         }
 
-        headers = {
-            'Content-Type': 'application/json',
-            'Accept': 'application/json, text/event-stream'
-        }
+    async def _send_request(self, method: str, params: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Send an MCP request using SSE transport."""
+        if not self.session:
+            raise RuntimeError("Client session not initialized. Use 'async with' context manager.")
 
-        # Add session ID if available
-        if self.session_id:
-            headers['mcp-session-id'] = self.session_id
+        payload = self._make_request(method, params)
+        request_id = payload["id"]
 
-        # Send the request and read SSE response
-        async with self.session.post(f"{self.base_url}/", json=payload, headers=headers) as response:
+        # Send the request; the server answers with either a plain JSON body
+        # or an SSE stream that may also carry unrelated notifications
+        async with self.session.post(f"{self.base_url}/", json=payload, headers=self._headers) as response:
             response.raise_for_status()
-
-            # Read the SSE stream
-            async for line in response.content:
-                line = line.decode('utf-8').strip()
-                if line.startswith('data: '):
-                    data = line[6:]  # Remove 'data: ' prefix
-                    if data == '[DONE]':
-                        break
-                    try:
-                        result = json.loads(data)
-                        if result.get('id') == request_id:
-                            if 'error' in result:
-                                raise Exception(f"MCP Error: {result['error']}")
-                            return result.get('result', result)
-                    except json.JSONDecodeError:
-                        continue
-
-        raise Exception("No valid response received")
-
-    async def call_tool(self, tool_name: str, arguments: Dict[str, Any] = None) -> Dict[str, Any]:
-        """Call a tool on the MCP server."""
+            messages = await self._read_messages(response, {request_id})
+
+        return self._extract_result(messages.get(request_id, {}), request_id)
+
+    async def _read_messages(self, response: aiohttp.ClientResponse, request_ids: Set[str]) -> Dict[str, Dict[str, Any]]:
+        """Collect the JSON-RPC responses for ``request_ids``, keyed by id."""
+        found: Dict[str, Dict[str, Any]] = {}
+
+        def collect(message):
+            for item in message if isinstance(message, list) else [message]:
+                if isinstance(item, dict) and item.get('id') in request_ids:
+                    found[item['id']] = item
+
+        if response.content_type == "application/json":
+            collect(serialization.loads(await response.read()))
+            return found
+
+        # Read the SSE stream incrementally, only decoding events that
+        # can belong to one of the requests
+        parser = SSEParser()
+        markers = [request_id.encode() for request_id in request_ids]
+        async for chunk in response.content.iter_any():
+            for event in parser.feed(chunk):
+                if event.data == b"[DONE]":
+                    return found
+                if not any(marker in event.data for marker in markers):
+                    continue
+                try:
+                    collect(serialization.loads(event.data))
+                except json.JSONDecodeError:
+                    continue
+                if len(found) == len(request_ids):
+                    return found
+        return found
+
+    @staticmethod
+    def _extract_result(message: Dict[str, Any], request_id: str) -> Dict[str, Any]:
+        """Return the result of a JSON-RPC response, raising on errors."""
+        if message.get('id') != request_id:
+            raise Exception("No valid response received")
+        if 'error' in message:
+            raise Exception(f"MCP Error: {message['error']}")
+        return message.get('result', message)
+
+    @staticmethod
+    def _tool_params(tool_name: str, arguments: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Build tools/call params for a tool."""
         if tool_name == "say_hello":
             # say_hello expects arguments wrapped in a "request" object
-            params = {
+            return {
                 "name": tool_name,
                 "arguments": {
                     "request": arguments or {"name": "World", "language": "en"}
                 }
             }
-        else:
-            # Other tools use direct arguments
-            params = {
-                "name": tool_name,
-                "arguments": arguments or {}
-            }
+        # Other tools use direct arguments
+        return {
+            "name": tool_name,
+            "arguments": arguments or {}
+        }
+
+    async def call_tool(self, tool_name: str, arguments: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Call a tool on the MCP server."""
+        return await self._send_request("tools/call", self._tool_params(tool_name, arguments))
+
+    async def call_many(
+        self,
+        calls: Iterable[Tuple[str, Dict[str, Any]]],
+        concurrency: Optional[int] = None,
+        return_exceptions: bool = False,
+    ) -> List[Any]:
+        """
+        Call many tools concurrently over the shared connection pool.
+
+        Args:
+            calls: (tool_name, arguments) pairs
+            concurrency: Max calls in flight (defaults to max_concurrency)
+            return_exceptions: Return failures in place instead of raising
+
+        Returns:
+            The results in the same order as ``calls``
+        """
+        semaphore = asyncio.Semaphore(concurrency or self.max_concurrency)
+
+        async def call(tool_name, arguments):
+            async with semaphore:
+                return await self.call_tool(tool_name, arguments)
+
+        return await asyncio.gather(
+            *(call(tool_name, arguments) for tool_name, arguments in calls),
+            return_exceptions=return_exceptions,
+        )
+
+    async def batch(
+        self,
+        requests: Iterable[Tuple[str, Dict[str, Any]]],
+        return_exceptions: bool = False,
+    ) -> List[Any]:
+        """
+        Send several requests in one JSON-RPC batch (an array payload).
+
+        Responses are matched back to requests by id. Servers on MCP
+        protocol versions without batch support reject array payloads with
+        a single JSON-RPC error that belongs to none of the requests; the
+        client then remembers that and sends the requests concurrently
+        instead. Errors for individual requests of a batch are returned (or
+        raised) for those requests only and keep batching enabled.
+
+        Args:
+            requests: (method, params) pairs
+            return_exceptions: Return failures in place instead of raising
+
+        Returns:
+            The results in the same order as ``requests``
+        """
+        if not self.session:
+            raise RuntimeError("Client session not initialized. Use 'async with' context manager.")
+
+        payload = [self._make_request(method, params) for method, params in requests]
+        if not payload:
+            return []
 
-        return await self._send_request("tools/call", params)
+        messages = None
+        if self.supports_batch:
+            request_ids = {request["id"] for request in payload}
+            async with self.session.post(f"{self.base_url}/", json=payload, headers=self._headers) as response:
+                if response.status == 400:
+                    body = await response.read()
+                    try:
+                        error = serialization.loads(body)
+                    except ValueError:
+                        response.raise_for_status()
+                    if self._rejects_batch(error, request_ids):
+                        self.supports_batch = False
+                        self._log("⚠️  Server rejected JSON-RPC batch, sending requests concurrently")
+                    else:
+                        messages = {
+                            item["id"]: item
+                            for item in (error if isinstance(error, list) else [error])
+                            if isinstance(item, dict) and item.get("id") in request_ids
+                        }
+                        if not messages:
+                            response.raise_for_status()
+                else:
+                    response.raise_for_status()
+                    messages = await self._read_messages(response, request_ids)
+
+        if messages is None:
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+
+            async def send(request):
+                async with semaphore:
+                    return await self._send_request(request["method"], request["params"])
+
+            return await asyncio.gather(
+                *(send(request) for request in payload),
+                return_exceptions=return_exceptions,
+            )
+
+        results = []
+        for request in payload:
+            try:
+                results.append(self._extract_result(messages.get(request["id"], {}), request["id"]))
+            except Exception as e:
+                if not return_exceptions:
+                    raise
+                results.append(e)
+        return results
+
+    @staticmethod
+    def _rejects_batch(body: Any, request_ids: Set[str]) -> bool:
+        """Whether a 400 body rejects the array payload itself: one JSON-RPC
+        error (not an array of per-request responses) whose id is null or
+        otherwise not one of the batch's requests"""
+        return (
+            isinstance(body, dict)
+            and "error" in body
+            and body.get("id") not in request_ids
+        )
+
+    async def call_tools_batch(
+        self,
+        calls: Iterable[Tuple[str, Dict[str, Any]]],
+        return_exceptions: bool = False,
+    ) -> List[Any]:
+        """Call several tools in one JSON-RPC batch."""
+        return await self.batch(
+            [("tools/call", self._tool_params(tool_name, arguments)) for tool_name, arguments in calls],
+            return_exceptions=return_exceptions,
+        )
 
     async def get_resource(self, resource_uri: str) -> Any:
-        """Get a resource from the MCP server."""
+        """Get a resource from the MCP server. For large file resources
+        (``file://files/{name}``) use ``iter_resource`` instead."""
         return await self._send_request("resources/read", {
             "uri": resource_uri
         })
 
+    async def _read_chunk(self, chunk_uri: str) -> bytes:
+        contents = (await self.get_resource(chunk_uri))["contents"][0]
+        if "blob" in contents:
+            return base64.b64decode(contents["blob"])
+        return contents["text"].encode("utf-8")
+
+    async def iter_resource(self, resource_uri: str, readahead: int = 2) -> AsyncIterator[bytes]:
+        """Stream a chunked file resource, yielding its content chunk by chunk.
+
+        Up to ``readahead`` chunk reads are in flight at once, so memory use
+        stays at a few chunks however large the file is.
+        """
+        contents = (await self.get_resource(resource_uri))["contents"][0]
+        info = serialization.loads(contents["text"])
+        chunk_uri = info["chunk_uri"]
+        pending: List[asyncio.Task] = []
+        next_index = 0
+        try:
+            while next_index < info["chunks"] or pending:
+                while next_index < info["chunks"] and len(pending) < max(1, readahead):
+                    uri = chunk_uri.replace("{index}", str(next_index))
+                    pending.append(asyncio.ensure_future(self._read_chunk(uri)))
+                    next_index += 1
+                yield await pending.pop(0)
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def download_resource(self, resource_uri: str, path: str, readahead: int = 2) -> int:
+        """Write a chunked file resource to ``path``; returns the bytes written."""
+        written = 0
+        with open(path, "wb") as output:
+            async for chunk in self.iter_resource(resource_uri, readahead):
+                output.write(chunk)
+                written += len(chunk)
+        return written
+
+    async def get_resource_if_modified(self, resource_uri: str) -> Tuple[bool, Any]:
+        """Read a resource, transferring its content only when it changed
+        since the last read. Returns ``(modified, content)``."""
+        etag, content = self._resources.get(resource_uri, ("", None))
+        result = await self.call_tool("read_resource_if_modified", {"uri": resource_uri, "etag": etag})
+        current = result.get("structuredContent") or {}
+        if not current.get("modified", True):
+            return False, content
+        self._resources[resource_uri] = (current["etag"], current["content"])
+        return True, current["content"]
+
+    async def subscribe(self, resource_uri: str) -> Dict[str, Any]:
+        """Ask for notifications/resources/updated when the resource changes."""
+        return await self._send_request("resources/subscribe", {"uri": resource_uri})
+
+    async def unsubscribe(self, resource_uri: str) -> Dict[str, Any]:
+        return await self._send_request("resources/unsubscribe", {"uri": resource_uri})
+
+    async def notifications(self) -> AsyncIterator[Dict[str, Any]]:
+        """Yield server notifications (e.g. resource updates) from the
+        session's standalone SSE stream. Needs a stateful server."""
+        if not self.session_id:
+            raise RuntimeError("Notifications need a server session; the server may be stateless.")
+        headers = {
+            'Accept': 'text/event-stream',
+            'Accept-Encoding': self._headers['Accept-Encoding'],
+            'mcp-session-id': self.session_id,
+        }
+        timeout = aiohttp.ClientTimeout(total=None, sock_read=None)
+        async with self.session.get(f"{self.base_url}/", headers=headers, timeout=timeout) as response:
+            response.raise_for_status()
+            parser = SSEParser()
+            async for chunk in response.content.iter_any():
+                for event in parser.feed(chunk):
+                    message = serialization.loads(event.data)
+                    if "method" in message:
+                        yield message
+
     async def get_server_info(self) -> Dict[str, Any]:
         """Get server information by listing tools."""
         return await self._send_request("tools/list", {})
@@ -175,6 +446,10 @@ async def demo_client():
                 ("say_hello", {"name": "Alice", "language": "en"}),
                 ("say_hello", {"name": "María", "language": "es"}),
                 ("say_hello", {"name": "Jean", "language": "fr"}),
+                ("say_hello_batch", {"requests": [
+                    {"name": "Hans", "language": "de"},
+                    {"name": "Yuki", "language": "ja"},
+                ]}),
                 ("get_server_info", {}),
             ]
 
@@ -188,6 +463,19 @@ async def demo_client():
                     print(f"   ❌ Error calling {tool_name}: {e}")
                     print()
 
+            # Test concurrent and batched calls
+            print("🚀 Testing concurrent calls:")
+            try:
+                calls = [("say_hello", {"name": f"User {i}", "language": "it"}) for i in range(20)]
+                results = await client.call_many(calls, concurrency=5)
+                print(f"   ✅ {len(results)} greetings via call_many")
+                results = await client.call_tools_batch(calls[:5])
+                print(f"   ✅ {len(results)} greetings via JSON-RPC batch")
+                print()
+            except Exception as e:
+                print(f"   ❌ Error in concurrent calls: {e}")
+                print()
+
             # Test resource access
             print("📦 Testing resource access:")
 
@@ -206,6 +494,25 @@ async def demo_client():
                     print(f"   ❌ Error getting resource {resource_uri}: {e}")
                     print()
 
+            # Test conditional reads and change notifications
+            print("🔁 Testing conditional reads:")
+            try:
+                for _ in range(2):
+                    modified, status = await client.get_resource_if_modified("file://server-status")
+                    print(f"   ✅ server-status modified: {modified}")
+                await client.subscribe("file://server-status")
+                notifications = client.notifications()
+                waiting = asyncio.ensure_future(notifications.__anext__())
+                await asyncio.sleep(0.5)
+                await client.call_tool("say_hello", {"name": "Subscriber"})
+                notification = await asyncio.wait_for(waiting, timeout=5)
+                print(f"   ✅ Notification: {notification['method']} {notification['params']['uri']}")
+                await notifications.aclose()
+                print()
+            except Exception as e:
+                print(f"   ❌ Error in conditional reads: {e}")
+                print()
+
     except Exception as e:
         print(f"❌ Failed to connect to MCP server: {e}")
         print("💡 Make sure the server is running with: uv run python -m mcp_hello.server")
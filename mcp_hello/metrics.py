@@ -0,0 +1,281 @@
+"""
+Lightweight request metrics for the MCP Hello World server.
+
+Tool calls and resource reads are counted per name with call and error
+counters, an in-flight gauge and a latency histogram. Only registered tools,
+resources and resource templates get their own series; requests for any
+other name are counted under ``unknown``, so clients cannot create series.
+Recording a request is a few integer updates; the Prometheus text format is
+only built when ``/metrics`` is scraped.
+
+With several worker processes, each worker publishes its counters to a
+shared directory every ``publish_interval`` seconds and ``/metrics`` sums
+the published counters of all workers, so a scrape answered by any worker
+reports the whole server. Files not refreshed for ``STALE_INTERVALS``
+publish intervals belong to workers that have exited and are removed.
+"""
+
+import asyncio
+import glob
+import os
+import time
+from bisect import bisect_left
+from typing import Any, Dict, List, Optional, Tuple
+
+from fastmcp.server.middleware import CallNext, Middleware, MiddlewareContext
+
+from mcp_hello import serialization
+
+# Latency histogram upper bounds in seconds
+DEFAULT_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+# Series name of requests for tools and resources that are not registered
+UNKNOWN = "unknown"
+
+# Published files older than this many publish intervals are from dead workers
+STALE_INTERVALS = 5
+
+
+class RequestStats:
+    """Counters and latency histogram for one tool or resource"""
+
+    __slots__ = ("calls", "errors", "in_flight", "total_seconds", "bucket_counts")
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.calls = 0
+        self.errors = 0
+        self.in_flight = 0
+        self.total_seconds = 0.0
+        # One slot per bucket plus +Inf; not cumulative until rendered
+        self.bucket_counts = [0] * (len(buckets) + 1)
+
+
+class MetricsRegistry:
+    """Registry of per-tool and per-resource request statistics.
+
+    ``shared_dir`` is the directory worker processes publish their counters
+    to; None keeps the metrics to this process.
+    """
+
+    def __init__(
+        self,
+        buckets: Tuple[float, ...] = DEFAULT_BUCKETS,
+        shared_dir: Optional[str] = None,
+        publish_interval: float = 1.0,
+    ):
+        self.buckets = tuple(buckets)
+        self.started_at = time.time()
+        self.shared_dir = shared_dir
+        self.publish_interval = publish_interval
+        self._series: Dict[Tuple[str, str], RequestStats] = {}
+        self._publisher: Optional[asyncio.Task] = None
+
+    def _get(self, kind: str, name: str) -> RequestStats:
+        key = (kind, name)
+        stats = self._series.get(key)
+        if stats is None:
+            stats = self._series[key] = RequestStats(self.buckets)
+        return stats
+
+    def start(self, kind: str, name: str) -> RequestStats:
+        if self.shared_dir is not None and self._publisher is None:
+            self._publisher = asyncio.get_running_loop().create_task(self._publish_periodically())
+        stats = self._get(kind, name)
+        stats.calls += 1
+        stats.in_flight += 1
+        return stats
+
+    def finish(self, stats: RequestStats, duration: float, error: bool = False):
+        stats.in_flight -= 1
+        stats.total_seconds += duration
+        stats.bucket_counts[bisect_left(self.buckets, duration)] += 1
+        if error:
+            stats.errors += 1
+
+    @property
+    def uptime_seconds(self) -> float:
+        return time.time() - self.started_at
+
+    def snapshot(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """Live stats grouped by kind, e.g. ``{"tool": {"say_hello": {...}}}``"""
+        result: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        for (kind, name), stats in sorted(self._series.items()):
+            completed = stats.calls - stats.in_flight
+            result.setdefault(kind, {})[name] = {
+                "calls": stats.calls,
+                "errors": stats.errors,
+                "in_flight": stats.in_flight,
+                "avg_latency_ms": round(stats.total_seconds / completed * 1000, 3) if completed else 0.0,
+            }
+        return result
+
+    @property
+    def _published_path(self) -> str:
+        return os.path.join(self.shared_dir, f"{os.getpid()}.json")
+
+    def publish(self):
+        """Write this process's counters to the shared directory"""
+        state = [
+            [kind, name, stats.calls, stats.errors, stats.in_flight, stats.total_seconds, stats.bucket_counts]
+            for (kind, name), stats in self._series.items()
+        ]
+        path = self._published_path
+        with open(f"{path}.tmp", "wb") as f:
+            f.write(serialization.dumps_bytes(state))
+        # Readers never see a partially written file
+        os.replace(f"{path}.tmp", path)
+
+    async def _publish_periodically(self):
+        while True:
+            await asyncio.sleep(self.publish_interval)
+            try:
+                await asyncio.to_thread(self.publish)
+            except OSError:
+                pass
+
+    def merged_series(self) -> Dict[Tuple[str, str], RequestStats]:
+        """Counters of every worker: this process's live ones plus the last
+        ones published by the other live workers"""
+        if self.shared_dir is None:
+            return self._series
+        merged: Dict[Tuple[str, str], RequestStats] = {}
+
+        def add(key, calls, errors, in_flight, total_seconds, bucket_counts):
+            stats = merged.get(key)
+            if stats is None:
+                stats = merged[key] = RequestStats(self.buckets)
+            stats.calls += calls
+            stats.errors += errors
+            stats.in_flight += in_flight
+            stats.total_seconds += total_seconds
+            stats.bucket_counts = [a + b for a, b in zip(stats.bucket_counts, bucket_counts)]
+
+        own = self._published_path
+        stale_before = time.time() - STALE_INTERVALS * self.publish_interval
+        for path in glob.glob(os.path.join(self.shared_dir, "*.json")):
+            if path == own:
+                continue
+            try:
+                if os.path.getmtime(path) < stale_before:
+                    os.remove(path)
+                    continue
+                with open(path, "rb") as f:
+                    state = serialization.loads(f.read())
+            except (OSError, ValueError):
+                continue
+            for kind, name, *counters in state:
+                add((kind, name), *counters)
+        for key, stats in self._series.items():
+            add(key, stats.calls, stats.errors, stats.in_flight, stats.total_seconds, stats.bucket_counts)
+        return merged
+
+    def render_prometheus(self) -> str:
+        """Render all metrics in the Prometheus text exposition format"""
+        lines: List[str] = [
+            "# HELP mcp_uptime_seconds Seconds since the server process started.",
+            "# TYPE mcp_uptime_seconds gauge",
+            f"mcp_uptime_seconds {self.uptime_seconds:.3f}",
+        ]
+        series = sorted(self.merged_series().items())
+
+        def labels(kind: str, name: str) -> str:
+            escaped = name.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+            return f'kind="{kind}",name="{escaped}"'
+
+        for metric, help_text, metric_type, attr in (
+            ("mcp_requests_total", "Tool calls and resource reads.", "counter", "calls"),
+            ("mcp_request_errors_total", "Tool calls and resource reads that failed.", "counter", "errors"),
+            ("mcp_requests_in_flight", "Tool calls and resource reads in progress.", "gauge", "in_flight"),
+        ):
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} {metric_type}")
+            for (kind, name), stats in series:
+                lines.append(f"{metric}{{{labels(kind, name)}}} {getattr(stats, attr)}")
+
+        metric = "mcp_request_duration_seconds"
+        lines.append(f"# HELP {metric} Tool call and resource read latency.")
+        lines.append(f"# TYPE {metric} histogram")
+        for (kind, name), stats in series:
+            label = labels(kind, name)
+            cumulative = 0
+            for bound, count in zip(self.buckets, stats.bucket_counts):
+                cumulative += count
+                lines.append(f'{metric}_bucket{{{label},le="{bound}"}} {cumulative}')
+            cumulative += stats.bucket_counts[-1]
+            lines.append(f'{metric}_bucket{{{label},le="+Inf"}} {cumulative}')
+            lines.append(f"{metric}_sum{{{label}}} {stats.total_seconds:.6f}")
+            lines.append(f"{metric}_count{{{label}}} {cumulative}")
+
+        return "\n".join(lines) + "\n"
+
+
+class MetricsMiddleware(Middleware):
+    """FastMCP middleware recording tool calls and resource reads"""
+
+    def __init__(self, registry: MetricsRegistry):
+        self.registry = registry
+        # Registered names, refetched from the server only when a request
+        # names something not seen yet
+        self._tools: set = set()
+        self._resources: set = set()
+        self._templates: Dict[str, Any] = {}
+        self._refreshed_at: Dict[str, float] = {}
+
+    def _may_refresh(self, kind: str) -> bool:
+        """Refetch at most once per publish interval, so requests for unknown
+        names do not list the registries every time"""
+        now = time.monotonic()
+        if now - self._refreshed_at.get(kind, -self.registry.publish_interval) < self.registry.publish_interval:
+            return False
+        self._refreshed_at[kind] = now
+        return True
+
+    async def _record(self, kind: str, name: str, context: MiddlewareContext, call_next: CallNext) -> Any:
+        stats = self.registry.start(kind, name)
+        start = time.perf_counter()
+        error = True
+        try:
+            result = await call_next(context)
+            error = bool(getattr(result, "isError", False))
+            return result
+        finally:
+            self.registry.finish(stats, time.perf_counter() - start, error)
+
+    async def _tool_name(self, context: MiddlewareContext) -> str:
+        name = context.message.name
+        if name in self._tools:
+            return name
+        if context.fastmcp_context is not None and self._may_refresh("tool"):
+            self._tools = set(await context.fastmcp_context.fastmcp.get_tools())
+            if name in self._tools:
+                return name
+        return UNKNOWN
+
+    async def on_call_tool(self, context: MiddlewareContext, call_next: CallNext) -> Any:
+        return await self._record("tool", await self._tool_name(context), context, call_next)
+
+    def _known_resource(self, uri: str) -> Optional[str]:
+        if uri in self._resources:
+            return uri
+        for template in self._templates.values():
+            if template.matches(uri) is not None:
+                return template.uri_template
+        return None
+
+    async def _resource_name(self, context: MiddlewareContext) -> str:
+        """Reads through a resource template are recorded under the template,
+        so e.g. all chunks of all files share one series"""
+        uri = str(context.message.uri)
+        name = self._known_resource(uri)
+        if name is None and context.fastmcp_context is not None and self._may_refresh("resource"):
+            server = context.fastmcp_context.fastmcp
+            self._resources = set(await server.get_resources())
+            self._templates = await server.get_resource_templates()
+            name = self._known_resource(uri)
+        return name or UNKNOWN
+
+    async def on_read_resource(self, context: MiddlewareContext, call_next: CallNext) -> Any:
+        return await self._record("resource", await self._resource_name(context), context, call_next)
@@ -0,0 +1,54 @@
+"""
+JSON encoding shared by the MCP Hello World server and HTTP client.
+
+orjson is used when it is installed, the standard library otherwise
+(``MCP_JSON_BACKEND=json`` forces the standard library). ``dumps`` is also
+the server's FastMCP ``tool_serializer``, which renders the text content of
+tool results that return structured data.
+"""
+
+import json
+import os
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+BACKEND = "orjson" if orjson is not None and os.getenv("MCP_JSON_BACKEND", "auto") != "json" else "json"
+
+
+def _default(value: Any) -> Any:
+    if hasattr(value, "model_dump"):
+        return value.model_dump(mode="json")
+    return str(value)
+
+
+def dumps_bytes(obj: Any, sort_keys: bool = False) -> bytes:
+    if BACKEND == "orjson":
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_SORT_KEYS if sort_keys else 0)
+        try:
+            return orjson.dumps(obj, default=_default, option=option)
+        except TypeError:
+            # orjson rejects some values the standard library accepts,
+            # such as integers beyond 64 bits
+            pass
+    return json.dumps(
+        obj, default=_default, ensure_ascii=False, sort_keys=sort_keys, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def dumps(obj: Any, sort_keys: bool = False) -> str:
+    if BACKEND == "orjson":
+        return dumps_bytes(obj, sort_keys).decode("utf-8")
+    return json.dumps(obj, default=_default, ensure_ascii=False, sort_keys=sort_keys, separators=(",", ":"))
+
+
+def loads(data: Any) -> Any:
+    """Parse JSON from str, bytes, bytearray or memoryview"""
+    if BACKEND == "orjson":
+        return orjson.loads(data)
+    if isinstance(data, memoryview):
+        data = bytes(data)
+    return json.loads(data)
@@ -8,16 +8,44 @@ This server demonstrates basic MCP functionality with:
 - Basic server setup
 """
 
+import argparse
 import asyncio
 import os
-from typing import Any, Dict
+import shutil
+import tempfile
+from typing import Any, Dict, List
 
 from fastmcp import FastMCP
 from pydantic import BaseModel
+from starlette.middleware import Middleware
+from starlette.requests import Request
+from starlette.responses import JSONResponse, PlainTextResponse
+
+from mcp_hello import serialization
+from mcp_hello.compression import CompressionMiddleware, available_encodings
+from mcp_hello.file_resources import FileResources
+from mcp_hello.metrics import UNKNOWN, MetricsMiddleware, MetricsRegistry
+from mcp_hello.versioning import ResourceVersions, enable_subscriptions, normalize_uri
 
 
 # Create the FastMCP server with HTTP transport
-mcp = FastMCP("Hello World MCP Server")
+mcp = FastMCP("Hello World MCP Server", tool_serializer=serialization.dumps)
+
+# Per-tool and per-resource request metrics, served on /metrics
+metrics = MetricsRegistry(shared_dir=os.getenv("MCP_METRICS_DIR") or None)
+mcp.add_middleware(MetricsMiddleware(metrics))
+
+# Etags and versions for resources, plus resources/subscribe support; while
+# anyone is subscribed, resources are checked for changes every
+# MCP_RESOURCE_POLL_INTERVAL seconds
+versions = ResourceVersions(interval=float(os.getenv("MCP_RESOURCE_POLL_INTERVAL", "1.0")))
+enable_subscriptions(mcp, versions)
+
+HELLO_WORLD_URI = "file://hello-world"
+SERVER_STATUS_URI = "file://server-status"
+
+# Files in MCP_FILES_DIR, served in MCP_FILE_CHUNK_SIZE chunks
+files = FileResources.from_env()
 
 
 class GreetingRequest(BaseModel):
@@ -26,7 +54,44 @@ class GreetingRequest(BaseModel):
     language: str = "en"
 
 
-@mcp.tool()
+# Greeting templates per language. They are split around the name once at
+# import so building a greeting is a plain concatenation.
+GREETING_TEMPLATES = {
+    "en": "Hello, {name}!",
+    "es": "¡Hola, {name}!",
+    "fr": "Bonjour, {name}!",
+    "de": "Hallo, {name}!",
+    "it": "Ciao, {name}!",
+    "pt": "Olá, {name}!",
+    "ru": "Привет, {name}!",
+    "ja": "こんにちは、{name}さん！",
+    "ko": "안녕하세요, {name}님!",
+    "zh": "你好，{name}！"
+}
+
+_COMPILED_GREETINGS = {
+    language: tuple(template.split("{name}", 1))
+    for language, template in GREETING_TEMPLATES.items()
+}
+
+SUPPORTED_LANGUAGES = list(GREETING_TEMPLATES)
+
+
+def build_greeting(request: GreetingRequest) -> Dict[str, Any]:
+    """Build the greeting response for a single request"""
+    prefix, suffix = _COMPILED_GREETINGS.get(
+        request.language, _COMPILED_GREETINGS["en"]
+    )
+
+    return {
+        "greeting": prefix + request.name + suffix,
+        "language": request.language,
+        "name": request.name,
+        "message": f"Greeting generated successfully in {request.language}"
+    }
+
+
+@mcp.tool(annotations={"readOnlyHint": True, "idempotentHint": True})
 def say_hello(request: GreetingRequest) -> Dict[str, Any]:
     """
     A simple greeting tool that says hello in different languages.
@@ -37,30 +102,29 @@ def say_hello(request: GreetingRequest) -> Dict[str, Any]:
     Returns:
         A greeting message in the specified language
     """
-    greetings = {
-        "en": f"Hello, {request.name}!",
-        "es": f"¡Hola, {request.name}!",
-        "fr": f"Bonjour, {request.name}!",
-        "de": f"Hallo, {request.name}!",
-        "it": f"Ciao, {request.name}!",
-        "pt": f"Olá, {request.name}!",
-        "ru": f"Привет, {request.name}!",
-        "ja": f"こんにちは、{request.name}さん！",
-        "ko": f"안녕하세요, {request.name}님!",
-        "zh": f"你好，{request.name}！"
-    }
+    return build_greeting(request)
+
 
-    greeting = greetings.get(request.language, greetings["en"])
+@mcp.tool(annotations={"readOnlyHint": True, "idempotentHint": True})
+def say_hello_batch(requests: List[GreetingRequest]) -> Dict[str, Any]:
+    """
+    Say hello to many people in one call.
+
+    Args:
+        requests: The greeting requests, each with name and language
+
+    Returns:
+        The greetings in the same order as the requests
+    """
+    greetings = [build_greeting(request) for request in requests]
 
     return {
-        "greeting": greeting,
-        "language": request.language,
-        "name": request.name,
-        "message": f"Greeting generated successfully in {request.language}"
+        "greetings": greetings,
+        "count": len(greetings)
     }
 
 
-@mcp.tool()
+@mcp.tool(annotations={"readOnlyHint": True, "idempotentHint": True})
 def get_server_info() -> Dict[str, Any]:
     """
     Get information about this MCP server.
@@ -74,17 +138,64 @@ def get_server_info() -> Dict[str, Any]:
         "description": "A simple hello world MCP server using FastMCP",
         "capabilities": [
             "greeting generation",
+            "batch greeting generation",
             "multi-language support",
-            "server information"
+            "server information",
+            "conditional resource reads",
+            "resource change subscriptions"
         ],
-        "supported_languages": [
-            "en", "es", "fr", "de", "it",
-            "pt", "ru", "ja", "ko", "zh"
-        ]
+        "supported_languages": SUPPORTED_LANGUAGES
     }
 
 
-@mcp.resource("file://hello-world")
+def hello_world_content() -> str:
+    return "Hello, World! This is a resource from the MCP Hello World server."
+
+
+def server_status_content() -> Dict[str, Any]:
+    # Leave out the polling of the status itself and requests for unknown
+    # names, so that the status (and its etag) only changes when the server
+    # does other work
+    polling = {("resource", normalize_uri(SERVER_STATUS_URI)), ("tool", "read_resource_if_modified")}
+    stats = {}
+    for kind, entries in metrics.snapshot().items():
+        entries = {
+            name: entry for name, entry in entries.items()
+            if (kind, name) not in polling and name != UNKNOWN
+        }
+        if entries:
+            stats[kind] = entries
+    return {
+        "status": "running",
+        "uptime": f"{metrics.uptime_seconds:.0f}s",
+        "uptime_seconds": round(metrics.uptime_seconds, 3),
+        "pid": os.getpid(),
+        "tools_available": ["say_hello", "say_hello_batch", "get_server_info", "read_resource_if_modified"],
+        "resources_available": [HELLO_WORLD_URI, SERVER_STATUS_URI, "file://files"],
+        "stats": stats
+    }
+
+
+def server_status_fingerprint(status: Dict[str, Any]) -> Dict[str, Any]:
+    """The part of the status that defines its version: everything but the
+    ticking uptime and calls still in flight"""
+    return {
+        **{key: value for key, value in status.items() if key not in ("uptime", "uptime_seconds", "stats")},
+        "stats": {
+            kind: {
+                name: {key: value for key, value in entry.items() if key != "in_flight"}
+                for name, entry in entries.items()
+            }
+            for kind, entries in status["stats"].items()
+        },
+    }
+
+
+versions.register(HELLO_WORLD_URI, hello_world_content)
+versions.register(SERVER_STATUS_URI, server_status_content, server_status_fingerprint)
+
+
+@mcp.resource(HELLO_WORLD_URI)
 async def hello_world_resource() -> str:
     """
     A simple resource that returns a hello world message.
@@ -92,30 +203,137 @@ async def hello_world_resource() -> str:
     Returns:
         A hello world message
     """
-    return "Hello, World! This is a resource from the MCP Hello World server."
+    return hello_world_content()
 
 
-@mcp.resource("file://server-status")
+@mcp.resource(SERVER_STATUS_URI)
 async def server_status_resource() -> Dict[str, Any]:
     """
     A resource that returns the current server status.
 
     Returns:
-        Current server status information
+        Current server status information, including uptime and live
+        request statistics
     """
-    return {
-        "status": "running",
-        "uptime": "N/A",
-        "tools_available": ["say_hello", "get_server_info"],
-        "resources_available": ["file://hello-world", "file://server-status"]
-    }
+    return server_status_content()
+
+
+@mcp.resource("file://files")
+async def files_resource() -> List[Dict[str, Any]]:
+    """
+    The files served from the server's file directory.
+
+    Returns:
+        Name, URI and size of each file
+    """
+    return await asyncio.to_thread(files.list)
+
+
+@mcp.resource("file://files/{name}")
+async def file_info_resource(name: str) -> Dict[str, Any]:
+    """
+    Size, etag and chunk layout of a served file. Its content is read from
+    file://files/{name}/chunks/{index} (index 0 to chunks - 1) or
+    file://files/{name}/range/{offset}/{length}.
+    """
+    return await asyncio.to_thread(files.info, name)
+
+
+@mcp.resource("file://files/{name}/chunks/{index}", mime_type="application/octet-stream")
+async def file_chunk_resource(name: str, index: int) -> bytes:
+    """One chunk of a served file; the last chunk may be shorter"""
+    return await asyncio.to_thread(files.read_chunk, name, index)
+
+
+@mcp.resource("file://files/{name}/range/{offset}/{length}", mime_type="application/octet-stream")
+async def file_range_resource(name: str, offset: int, length: int) -> bytes:
+    """Up to length bytes of a served file from offset, at most one chunk"""
+    return await asyncio.to_thread(files.read_range, name, offset, length)
+
+
+# Not annotated read-only: the answer changes along with the resource, so
+# clients must not cache it
+@mcp.tool
+def read_resource_if_modified(uri: str, etag: str = "") -> Dict[str, Any]:
+    """
+    Conditionally read a resource.
+
+    Args:
+        uri: Resource URI, e.g. file://server-status
+        etag: Etag from a previous read, if any
+
+    Returns:
+        {"modified": false, "etag", "version"} when the etag is still
+        current, otherwise the content with its new etag and version
+    """
+    return versions.read_if_modified(uri, etag)
+
+
+@mcp.custom_route("/health", methods=["GET"])
+async def health(request: Request) -> JSONResponse:
+    """Liveness check; reports the worker process that served it"""
+    return JSONResponse({"status": "ok", "pid": os.getpid()})
 
 
-def main():
+@mcp.custom_route("/metrics", methods=["GET"])
+async def metrics_endpoint(request: Request) -> PlainTextResponse:
+    """Prometheus metrics for tool calls and resource reads"""
+    return PlainTextResponse(
+        metrics.render_prometheus(),
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+    )
+
+
+def http_middleware() -> List[Middleware]:
+    """
+    ASGI middleware of the HTTP app: response compression.
+
+    MCP_COMPRESSION is "auto" (every installed encoding: zstd, br, gzip),
+    "off", or a comma separated preference list; responses smaller than
+    MCP_COMPRESSION_MIN_SIZE bytes are sent as is.
+    """
+    setting = os.getenv("MCP_COMPRESSION", "auto").strip().lower()
+    if setting in ("off", "none", "false", "0", ""):
+        return []
+    encodings = available_encodings() if setting == "auto" else [name.strip() for name in setting.split(",")]
+    minimum_size = int(os.getenv("MCP_COMPRESSION_MIN_SIZE", "1024"))
+    return [Middleware(CompressionMiddleware, minimum_size=minimum_size, encodings=encodings)]
+
+
+def create_app():
+    """
+    ASGI app factory used when serving with several worker processes.
+
+    Workers do not share MCP session state, so the app is stateless: any
+    worker can serve any request.
+    """
+    return mcp.http_app(stateless_http=True, middleware=http_middleware())
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Hello World MCP Server")
+    parser.add_argument(
+        "--host", default=os.getenv("MCP_HOST", "0.0.0.0"), help="Server host address"
+    )
+    parser.add_argument(
+        "--port", type=int, default=int(os.getenv("MCP_PORT", "3000")), help="Server port"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=int(os.getenv("MCP_WORKERS", "1")),
+        help="Number of worker processes sharing the port",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
     """Main entry point for the MCP server"""
     # Configuration
-    host = os.getenv("MCP_HOST", "0.0.0.0")
-    port = int(os.getenv("MCP_PORT", "3000"))
+    args = parse_args(argv)
+    host = args.host
+    port = args.port
+    workers = max(1, args.workers)
 
     try:
         print("Starting Hello World MCP Server with HTTP transport...")
@@ -123,12 +341,38 @@ def main():
         print(f"Host: {host}")
         print(f"Port: {port}")
         print(f"URL: http://{host}:{port}")
-        print("Available tools: say_hello, get_server_info")
-        print("Available resources: file://hello-world, file://server-status")
+        print(f"Workers: {workers}")
+        print("Available tools: say_hello, say_hello_batch, get_server_info, read_resource_if_modified")
+        print("Available resources: file://hello-world, file://server-status (subscribable)")
+        print(f"File resources: file://files/{{name}} from {files.root}")
         print("Press Ctrl+C to stop the server")
 
-        # Run the server with HTTP transport
-        mcp.run(transport="http", host=host, port=port)
+        if workers == 1:
+            # Run the server with HTTP transport
+            mcp.run(transport="http", host=host, port=port, middleware=http_middleware())
+        else:
+            # uvicorn's supervisor pings each worker, restarts unresponsive
+            # ones and drains in-flight requests on shutdown
+            import uvicorn
+
+            # Workers inherit the directory they publish their metrics to,
+            # so /metrics on any of them reports all of them
+            metrics_dir = os.getenv("MCP_METRICS_DIR")
+            created = not metrics_dir
+            if created:
+                metrics_dir = os.environ["MCP_METRICS_DIR"] = tempfile.mkdtemp(prefix="mcp-metrics-")
+            try:
+                uvicorn.run(
+                    "mcp_hello.server:create_app",
+                    factory=True,
+                    host=host,
+                    port=port,
+                    workers=workers,
+                    timeout_graceful_shutdown=int(os.getenv("MCP_GRACEFUL_TIMEOUT", "30")),
+                )
+            finally:
+                if created:
+                    shutil.rmtree(metrics_dir, ignore_errors=True)
 
     except KeyboardInterrupt:
         print("\nServer stopped by user")
@@ -0,0 +1,86 @@
+"""
+Incremental parser for Server-Sent Events (text/event-stream) bodies.
+
+The parser works on raw bytes: chunks are appended to one reusable buffer,
+complete lines are sliced out of it, and event data is handed back as a
+bytearray so callers can pass it straight to ``json.loads`` without
+decoding every line first.
+"""
+
+from typing import List, NamedTuple, Optional
+
+
+class SSEEvent(NamedTuple):
+    """A dispatched SSE event. Multi-line data fields are joined with newlines."""
+    data: bytearray
+    event: Optional[str] = None
+    id: Optional[str] = None
+
+
+class SSEParser:
+    """Feed byte chunks in, get complete events out."""
+
+    def __init__(self):
+        self._buffer = bytearray()
+        # Offset up to which the buffer is known to hold no newline, so a
+        # long line arriving in many chunks is only scanned once
+        self._scanned = 0
+        self._data: List[bytearray] = []
+        self._event: Optional[str] = None
+        self._id: Optional[str] = None
+
+    def feed(self, chunk: bytes) -> List[SSEEvent]:
+        """Consume a chunk and return the events it completed"""
+        buffer = self._buffer
+        buffer += chunk
+        events = []
+        start = 0
+        end = buffer.find(b"\n", self._scanned)
+
+        while end != -1:
+            line_end = end - 1 if end > start and buffer[end - 1] == 0x0D else end
+            if line_end == start:
+                # Blank line dispatches the pending event
+                if self._data:
+                    events.append(self._dispatch())
+            elif buffer[start] != 0x3A:  # lines starting with ':' are comments
+                self._field(buffer, start, line_end)
+            start = end + 1
+            end = buffer.find(b"\n", start)
+
+        # Drop consumed bytes in place so the buffer is reused
+        del buffer[:start]
+        self._scanned = len(buffer)
+        return events
+
+    def flush(self) -> List[SSEEvent]:
+        """Dispatch a trailing event when the stream ends without a blank line"""
+        if self._buffer:
+            line = self._buffer.rstrip(b"\r")
+            self._field(line, 0, len(line))
+            self._buffer = bytearray()
+            self._scanned = 0
+        return [self._dispatch()] if self._data else []
+
+    def _field(self, buffer: bytearray, start: int, end: int):
+        """Parse the field on ``buffer[start:end]``, copying only its value"""
+        colon = buffer.find(b":", start, end)
+        if colon == -1:
+            name, value_start = buffer[start:end], end
+        else:
+            name, value_start = buffer[start:colon], colon + 1
+            if value_start < end and buffer[value_start] == 0x20:
+                value_start += 1
+        if name == b"data":
+            self._data.append(buffer[value_start:end])
+        elif name == b"event":
+            self._event = buffer[value_start:end].decode("utf-8")
+        elif name == b"id":
+            self._id = buffer[value_start:end].decode("utf-8")
+
+    def _dispatch(self) -> SSEEvent:
+        data = self._data[0] if len(self._data) == 1 else bytearray(b"\n".join(self._data))
+        event = SSEEvent(data=data, event=self._event, id=self._id)
+        self._data = []
+        self._event = None
+        return event
@@ -0,0 +1,164 @@
+"""
+Versioned resources and change subscriptions for the MCP Hello World server.
+
+Each registered resource has an etag (a hash of its content) and a version
+number that increases whenever the etag changes. Clients can ask for a
+resource only if its etag differs from the one they hold, and can
+subscribe to ``notifications/resources/updated`` instead of polling.
+
+Subscriptions are tracked per MCP session, so they need a stateful
+transport (stdio, or HTTP with a single worker).
+"""
+
+import asyncio
+import hashlib
+import logging
+import weakref
+from typing import Any, Callable, Dict, Optional
+
+from pydantic import AnyUrl
+
+from mcp_hello import serialization
+
+logger = logging.getLogger(__name__)
+
+
+class VersionedResource:
+    """Content source of one resource plus its latest etag and version"""
+
+    __slots__ = ("uri", "render", "fingerprint", "etag", "version")
+
+    def __init__(self, uri: str, render: Callable[[], Any], fingerprint: Optional[Callable[[Any], Any]]):
+        self.uri = uri
+        self.render = render
+        self.fingerprint = fingerprint
+        self.etag: Optional[str] = None
+        self.version = 0
+
+
+def normalize_uri(uri: str) -> str:
+    # The SDK hands subscribe handlers parsed URLs, which gain a trailing
+    # slash (file://server-status -> file://server-status/)
+    return str(AnyUrl(uri))
+
+
+def compute_etag(content: Any) -> str:
+    if isinstance(content, (bytes, bytearray)):
+        data = bytes(content)
+    elif isinstance(content, str):
+        data = content.encode("utf-8")
+    else:
+        data = serialization.dumps_bytes(content, sort_keys=True)
+    return hashlib.sha256(data).hexdigest()[:16]
+
+
+class ResourceVersions:
+    """Registry of versioned resources and their subscribers"""
+
+    def __init__(self, interval: float = 1.0):
+        # Seconds between change checks while anyone is subscribed
+        self.interval = interval
+        self._resources: Dict[str, VersionedResource] = {}
+        self._subscribers: Dict[str, "weakref.WeakSet"] = {}
+        self._watcher: Optional[asyncio.Task] = None
+        self.notifications_sent = 0
+
+    def register(self, uri: str, render: Callable[[], Any], fingerprint: Optional[Callable[[Any], Any]] = None):
+        """Track ``uri``; ``fingerprint`` selects the parts of the content
+        that define its version (e.g. leaving out a ticking uptime)"""
+        self._resources[normalize_uri(uri)] = VersionedResource(uri, render, fingerprint)
+
+    def _resource(self, uri: str) -> VersionedResource:
+        resource = self._resources.get(normalize_uri(uri))
+        if resource is None:
+            raise ValueError(f"Unknown versioned resource: {uri}")
+        return resource
+
+    def read(self, uri: str) -> Dict[str, Any]:
+        """Render a resource and return its content, etag and version"""
+        resource = self._resource(uri)
+        content = resource.render()
+        etag = compute_etag(resource.fingerprint(content) if resource.fingerprint else content)
+        if etag != resource.etag:
+            resource.etag = etag
+            resource.version += 1
+        return {"uri": resource.uri, "etag": etag, "version": resource.version, "content": content}
+
+    def read_if_modified(self, uri: str, etag: str = "") -> Dict[str, Any]:
+        """Return the resource, or only its etag when ``etag`` is still current"""
+        current = self.read(uri)
+        if etag and etag == current["etag"]:
+            return {"uri": current["uri"], "etag": etag, "version": current["version"], "modified": False}
+        return {**current, "modified": True}
+
+    def versions(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            resource.uri: {"etag": resource.etag, "version": resource.version}
+            for resource in self._resources.values()
+        }
+
+    def subscribe(self, uri: str, session):
+        resource = self._resource(uri)
+        # Record the version the subscriber starts from
+        self.read(resource.uri)
+        self._subscribers.setdefault(resource.uri, weakref.WeakSet()).add(session)
+        if self._watcher is None or self._watcher.done():
+            self._watcher = asyncio.create_task(self._watch())
+
+    def unsubscribe(self, uri: str, session):
+        subscribers = self._subscribers.get(self._resource(uri).uri)
+        if subscribers is not None:
+            subscribers.discard(session)
+
+    def subscriber_count(self) -> int:
+        return sum(len(subscribers) for subscribers in self._subscribers.values())
+
+    async def _watch(self):
+        """Check subscribed resources for changes and notify their subscribers"""
+        while self.subscriber_count():
+            await asyncio.sleep(self.interval)
+            for uri, subscribers in list(self._subscribers.items()):
+                if not subscribers:
+                    continue
+                before = self._resource(uri).etag
+                try:
+                    changed = self.read(uri)["etag"] != before
+                except Exception as e:
+                    logger.error(f"Error checking resource {uri}: {e}")
+                    continue
+                if changed:
+                    await self._notify(uri, subscribers)
+
+    async def _notify(self, uri: str, subscribers):
+        for session in list(subscribers):
+            try:
+                await session.send_resource_updated(AnyUrl(uri))
+                self.notifications_sent += 1
+            except Exception:
+                # The session is gone; drop its subscription
+                subscribers.discard(session)
+
+
+def enable_subscriptions(server, versions: ResourceVersions):
+    """Register resources/subscribe and resources/unsubscribe handlers on a
+    FastMCP server and advertise the capability"""
+    lowlevel = server._mcp_server
+
+    @lowlevel.subscribe_resource()
+    async def subscribe(uri: AnyUrl):
+        versions.subscribe(str(uri), lowlevel.request_context.session)
+
+    @lowlevel.unsubscribe_resource()
+    async def unsubscribe(uri: AnyUrl):
+        versions.unsubscribe(str(uri), lowlevel.request_context.session)
+
+    # The SDK reports subscribe=False regardless of registered handlers
+    get_capabilities = lowlevel.get_capabilities
+
+    def capabilities_with_subscribe(*args, **kwargs):
+        capabilities = get_capabilities(*args, **kwargs)
+        if capabilities.resources is not None:
+            capabilities.resources.subscribe = True
+        return capabilities
+
+    lowlevel.get_capabilities = capabilities_with_subscribe
@@ -1,22 +1,66 @@
+import asyncio
+import os
+
 from fastmcp import FastMCP
 
+from mcp_hello import serialization
+from mcp_hello.docs_store import DocumentStore, read_text_document
+
 # Create the FastMCP server instance
-mcp = FastMCP("mcp-documentation-server")
+mcp = FastMCP("mcp-documentation-server", tool_serializer=serialization.dumps)
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# Documentation index (build it with `mcp-hello-docs ingest <path>`);
+# DOCS_DB_PATH overrides data/docs.db next to this script
+docs = DocumentStore.from_env(os.path.join(HERE, "data", "docs.db"))
+
+
+def default_documents():
+    """Seed for an empty index: an MCP primer and the project README"""
+    yield {
+        "id": "how-to-use-mcp-servers",
+        "title": "How to Use MCP Servers",
+        "body": "MCP servers expose tools and resources for AI agents. A client connects "
+        "over stdio, SSE or streamable HTTP, lists the server's tools and calls them "
+        "with JSON arguments on behalf of the model.",
+        "source": "builtin",
+    }
+    readme = os.path.join(HERE, "README.md")
+    if os.path.exists(readme):
+        yield dict(read_text_document(readme, "README.md"), source="README.md")
+
 
-# Register the tool using FastMCP decorator
-@mcp.tool()
-def get_documentation_from_database() -> dict:
+def open_index() -> DocumentStore:
+    docs.seed(default_documents())
+    return docs
+
+
+# Register the tool using FastMCP decorator; read-only so clients may cache it
+@mcp.tool(annotations={"readOnlyHint": True, "idempotentHint": True})
+async def get_documentation_from_database(query: str = "") -> dict:
     """
-    This tool returns the documentation from the database for the project. 
+    This tool returns the documentation from the database for the project.
     It is very useful for figuring out what the project is about.
+    Without a query it returns an overview of the indexed documents;
+    with one it returns the best matching documents.
     """
-    ## actual implementation would query a real database here
-    
-    return {
-        "title": "How to Use MCP Servers",
-        "body": "This is a mocked documentation entry from the database. MCP servers expose tools and resources for AI agents.",
-        "source": "mocked_database"
-    }
+    store = await asyncio.to_thread(open_index)
+    if query:
+        return await asyncio.to_thread(store.search, query, 5, 0)
+    return await asyncio.to_thread(store.overview)
+
+
+@mcp.tool(annotations={"readOnlyHint": True, "idempotentHint": True})
+async def search_documentation(query: str, limit: int = 10, offset: int = 0) -> dict:
+    """
+    Full-text search over the project documentation.
+    Results are ranked by relevance (title matches first) and paginated
+    with limit (max 50) and offset; total is the number of matches.
+    """
+    store = await asyncio.to_thread(open_index)
+    return await asyncio.to_thread(store.search, query, limit, offset)
+
 
 if __name__ == "__main__":
-    mcp.run("stdio")
\ No newline at end of file
+    mcp.run("stdio")
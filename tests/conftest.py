@@ -0,0 +1,18 @@
+import os
+import sys
+
+import pytest
+
+# The client API imports its modules flat (``from utils import ...``)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "dsp", "mcp-client", "api"))
+
+
+@pytest.fixture(autouse=True, scope="session")
+def client_log_file(tmp_path_factory):
+    """Write the client's debug log to a temporary file, not the cwd"""
+    from utils.logger import file_handler
+
+    file_handler.close()
+    file_handler.baseFilename = str(tmp_path_factory.mktemp("logs") / "mcp_client.log")
+    yield file_handler.baseFilename
+    file_handler.close()
@@ -0,0 +1,36 @@
+"""stdio MCP server for the stdio pool tests"""
+
+import os
+
+from fastmcp import FastMCP
+
+mcp = FastMCP("stdio-pool-test")
+
+
+@mcp.tool(annotations={"readOnlyHint": True})
+def pid() -> int:
+    return os.getpid()
+
+
+@mcp.tool()
+def echo(text: str) -> str:
+    return text
+
+
+@mcp.tool()
+def crash() -> str:
+    """Exit mid-call, as a server with side effects that crashed would"""
+    os._exit(1)
+
+
+@mcp.tool(annotations={"idempotentHint": True})
+def crash_once(marker: str) -> str:
+    """Exit the first time it is called, succeed on retry"""
+    if not os.path.exists(marker):
+        open(marker, "w").close()
+        os._exit(1)
+    return "ok"
+
+
+if __name__ == "__main__":
+    mcp.run("stdio", show_banner=False)
@@ -0,0 +1,137 @@
+import asyncio
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+import anyio
+import pytest
+
+from client_pool import MCPClientPool
+from mcp_client import MCPClient
+
+
+class FakeClient:
+    def __init__(self):
+        self.connected = False
+        self.closed = False
+        self.mcp_tools = ["say_hello"]
+        self.fetches = 0
+
+    async def connect_to_server(self):
+        self.connected = True
+
+    async def cleanup(self):
+        self.closed = True
+
+    def cached_mcp_tools(self):
+        return self.mcp_tools if self.fetches else None
+
+    async def get_mcp_tools(self):
+        self.fetches += 1
+        return self.mcp_tools
+
+
+def test_client_is_reused_after_request_error():
+    async def run():
+        pool = MCPClientPool(FakeClient, min_size=1, max_size=1)
+        await pool.start()
+        with pytest.raises(ValueError):
+            async with pool.acquire() as client:
+                raise ValueError("bad tool arguments")
+        async with pool.acquire() as again:
+            assert again is client
+        await pool.close()
+
+    asyncio.run(run())
+
+
+def test_client_is_replaced_after_transport_failure():
+    async def run():
+        pool = MCPClientPool(FakeClient, min_size=1, max_size=1, acquire_timeout=5)
+        await pool.start()
+        with pytest.raises(anyio.ClosedResourceError):
+            async with pool.acquire() as dead:
+                raise anyio.ClosedResourceError()
+        assert dead.closed
+        async with pool.acquire() as client:
+            assert client is not dead and client.connected
+        assert pool.stats()["size"] == 1
+        await pool.close()
+
+    asyncio.run(run())
+
+
+def test_tools_are_served_while_every_client_is_busy():
+    async def run():
+        pool = MCPClientPool(FakeClient, min_size=1, max_size=1, acquire_timeout=0.5)
+        await pool.start()
+        async with pool.acquire() as client:
+            assert await asyncio.wait_for(pool.tools(), 0.1) == ["say_hello"]
+            assert await asyncio.wait_for(pool.tools(), 0.1) == ["say_hello"]
+        assert client.fetches == 1
+        await pool.close()
+
+    asyncio.run(run())
+
+
+class ToolCallingLLM:
+    """Stands in for the provider: asks for the tool named by the query,
+    then answers once the tool result is in"""
+
+    def __init__(self):
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    async def create(self, model, messages, tools=None, **params):
+        from openai.types.chat import ChatCompletion
+
+        if messages[-1]["role"] == "tool":
+            message = {"role": "assistant", "content": f"done: {messages[-1]['content']}"}
+        else:
+            name = messages[-1]["content"]
+            arguments = '{"text": "hi"}' if name == "echo" else "{}"
+            message = {"role": "assistant", "content": None, "tool_calls": [
+                {"id": "call_0", "type": "function", "function": {"name": name, "arguments": arguments}},
+            ]}
+        return ChatCompletion.model_validate({
+            "id": "completion", "object": "chat.completion", "created": 0, "model": model or "test",
+            "choices": [{"index": 0, "finish_reason": "stop", "message": message}],
+        })
+
+
+def test_query_survives_a_stdio_worker_crash(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("NVIDIA_API_KEY", "test")
+    monkeypatch.setenv("MCP_SERVER_PROTOCOL", "stdio")
+    monkeypatch.setenv("MCP_SERVER_COMMAND", sys.executable)
+    monkeypatch.setenv("MCP_SERVER_SCRIPT_PATH", os.path.join(os.path.dirname(__file__), "stdio_pool_server.py"))
+    monkeypatch.setenv("MCP_STDIO_POOL_SIZE", "2")
+
+    def factory():
+        client = MCPClient("nvidia")
+        client.llm = ToolCallingLLM()
+        return client
+
+    async def run():
+        pool = MCPClientPool(factory, min_size=1, max_size=1, acquire_timeout=5)
+        await pool.start()
+        try:
+            # The tool's subprocess exits mid-call
+            async with pool.acquire() as client:
+                messages = await client.process_query("crash")
+            assert "exited" in messages[-2]["content"]
+            assert messages[-1]["content"].startswith("done")
+
+            async with pool.acquire() as again:
+                assert again is client
+                deadline = time.monotonic() + 15
+                while client.session.respawns < 1:
+                    assert time.monotonic() < deadline
+                    await asyncio.sleep(0.05)
+                messages = await again.process_query("echo")
+            assert "hi" in messages[-2]["content"]
+            assert client.session.stats()["live"] == 2
+        finally:
+            await pool.close()
+
+    asyncio.run(run())
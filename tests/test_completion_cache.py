@@ -0,0 +1,69 @@
+import asyncio
+import sqlite3
+import time
+
+from utils.completion_cache import CompletionCache
+
+MESSAGES = [{"role": "user", "content": "hi"}]
+
+
+def test_key_ignores_dict_order_but_not_content():
+    key = CompletionCache.make_key("m", MESSAGES, None, {"temperature": 0, "max_tokens": 10})
+    assert key == CompletionCache.make_key("m", [{"content": "hi", "role": "user"}], [], {"max_tokens": 10, "temperature": 0})
+    assert key != CompletionCache.make_key("m", MESSAGES, None, {"temperature": 1, "max_tokens": 10})
+    assert key != CompletionCache.make_key("other", MESSAGES, None, {"temperature": 0, "max_tokens": 10})
+
+
+def test_memory_lru_falls_back_to_disk(tmp_path):
+    async def run():
+        cache = CompletionCache(path=str(tmp_path / "completions.db"), max_size=2)
+        for index in range(3):
+            await cache.put(f"k{index}", f"completion {index}")
+        assert list(cache._entries) == ["k1", "k2"]
+        assert await cache.get("k0") == "completion 0"
+        assert cache.disk_hits == 1
+        assert await cache.get("missing") is None
+        cache.close()
+
+        reopened = CompletionCache(path=str(tmp_path / "completions.db"))
+        assert await reopened.get("k2") == "completion 2"
+        assert reopened.stats()["hit_rate"] == 1.0
+        reopened.close()
+
+    asyncio.run(run())
+
+
+def test_expired_entries_are_not_served(tmp_path):
+    async def run():
+        cache = CompletionCache(path=str(tmp_path / "completions.db"), ttl=0.05)
+        await cache.put("k", "completion")
+        assert await cache.get("k") == "completion"
+        await asyncio.sleep(0.1)
+        assert await cache.get("k") is None
+        assert "k" not in cache._entries
+        cache.close()
+
+    asyncio.run(run())
+
+
+def test_sweep_drops_expired_then_oldest_rows(tmp_path):
+    async def run():
+        path = str(tmp_path / "completions.db")
+        cache = CompletionCache(path=path, max_size=1, max_disk_entries=3, ttl=60)
+        cache.SWEEP_EVERY = 5
+        cache.ttl = 0.01
+        await cache.put("expired", "old")
+        await asyncio.sleep(0.05)
+        cache.ttl = 60
+        for index in range(4):
+            await cache.put(f"k{index}", f"completion {index}")
+            time.sleep(0.001)
+        cache.close()
+
+        # The fifth write swept: the expired row and the oldest excess row are gone
+        db = sqlite3.connect(path)
+        keys = {key for key, in db.execute("SELECT key FROM completions")}
+        db.close()
+        assert keys == {"k1", "k2", "k3"}
+
+    asyncio.run(run())
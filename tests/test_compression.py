@@ -0,0 +1,76 @@
+import asyncio
+import gzip
+import zlib
+
+from mcp_hello.compression import CompressionMiddleware, choose_encoding, parse_accept_encoding
+
+
+def test_accept_encoding_qualities():
+    assert parse_accept_encoding("gzip;q=0.5, BR, zstd;q=bogus") == {"gzip": 0.5, "br": 1.0, "zstd": 0.0}
+    assert choose_encoding("gzip;q=0, br", ["gzip"]) is None
+    assert choose_encoding("gzip;q=0.1, br", ["zstd", "gzip"]) == "gzip"
+    assert choose_encoding("", ["gzip"]) is None
+
+
+def test_wildcard_applies_only_to_unlisted_encodings():
+    assert choose_encoding("*", ["zstd", "gzip"]) == "zstd"
+    assert choose_encoding("zstd;q=0, *", ["zstd", "gzip"]) == "gzip"
+    assert choose_encoding("gzip, *;q=0", ["zstd", "gzip"]) == "gzip"
+    assert choose_encoding("*;q=0", ["gzip"]) is None
+
+
+def app_sending(chunks, content_type=b"text/event-stream"):
+    async def app(scope, receive, send):
+        headers = [(b"content-type", content_type)]
+        if len(chunks) == 1:
+            headers.append((b"content-length", str(len(chunks[0])).encode()))
+        await send({"type": "http.response.start", "status": 200, "headers": headers})
+        for index, chunk in enumerate(chunks):
+            await send({"type": "http.response.body", "body": chunk, "more_body": index < len(chunks) - 1})
+
+    return app
+
+
+def request(app, accept_encoding=b"gzip"):
+    scope = {"type": "http", "method": "GET", "path": "/", "headers": [(b"accept-encoding", accept_encoding)]}
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message):
+        messages.append(message)
+
+    asyncio.run(CompressionMiddleware(app, encodings=["gzip"])(scope, receive, send))
+    return dict(messages[0]["headers"]), messages[1:]
+
+
+def test_streamed_chunks_are_decodable_as_they_arrive():
+    chunks = [f"event: message\ndata: {index}\n\n".encode() for index in range(5)]
+    headers, bodies = request(app_sending(chunks))
+    assert headers[b"content-encoding"] == b"gzip"
+    assert b"content-length" not in headers
+    decompressor = zlib.decompressobj(31)
+    for chunk, message in zip(chunks, bodies):
+        # Each event can be read without waiting for the next chunk
+        assert decompressor.decompress(message["body"]) == chunk
+    assert decompressor.eof
+
+
+def test_complete_body_gets_its_compressed_length():
+    body = b'{"text": "' + b"hello " * 1000 + b'"}'
+    headers, [message] = request(app_sending([body], b"application/json"))
+    assert headers[b"content-encoding"] == b"gzip"
+    assert b"accept-encoding" in headers[b"vary"].lower()
+    assert int(headers[b"content-length"]) == len(message["body"])
+    assert gzip.decompress(message["body"]) == body
+
+
+def test_small_refused_and_binary_bodies_are_untouched():
+    small = app_sending([b'{"ok": true}'], b"application/json")
+    large_image = app_sending([b"\x89PNG" * 1000], b"image/png")
+    json_body = app_sending([b"{}" * 1000], b"application/json")
+    for app, accept_encoding in ((small, b"gzip"), (large_image, b"gzip"), (json_body, b"gzip;q=0")):
+        headers, [message] = request(app, accept_encoding)
+        assert b"content-encoding" not in headers
+        assert int(headers[b"content-length"]) == len(message["body"])
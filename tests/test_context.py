@@ -0,0 +1,49 @@
+from utils.context import ContextWindow
+
+
+def window(max_tokens: int) -> ContextWindow:
+    return ContextWindow(lambda messages: [dict(message) for message in messages], max_tokens=max_tokens, chars_per_token=1)
+
+
+def conversation(turns: int):
+    messages = []
+    for turn in range(turns):
+        messages.append({"role": "user", "content": f"question {turn} " + "x" * 200})
+        messages.append({"role": "assistant", "content": f"answer {turn} " + "y" * 200})
+    return messages
+
+
+def test_oldest_turns_are_dropped_to_fit_the_budget():
+    context = window(max_tokens=1000)
+    messages = conversation(5) + [{"role": "user", "content": "latest question"}]
+    prompt = context.build(messages)
+    assert context.last_stats["prompt_tokens"] <= 1000
+    assert context.last_stats["dropped_messages"] > 0
+    assert context.last_stats["over_budget"] == 0
+    assert prompt[0]["role"] == "user"
+    assert prompt[-1]["content"] == "latest question"
+    assert len(messages) == 11
+
+
+def test_tool_calls_are_dropped_with_their_results():
+    context = window(max_tokens=150)
+    messages = [
+        {"role": "user", "content": "first " + "x" * 100},
+        {"role": "assistant", "content": "calling", "tool_calls": [
+            {"id": "call_0", "type": "function", "function": {"name": "search", "arguments": "{}"}},
+        ]},
+        {"role": "tool", "tool_call_id": "call_0", "content": "result"},
+        {"role": "assistant", "content": "done"},
+        {"role": "user", "content": "second"},
+    ]
+    prompt = context.build(messages)
+    assert [message["role"] for message in prompt] == ["user"]
+    assert context.last_stats["dropped_messages"] == 4
+
+
+def test_current_turn_over_budget_is_reported():
+    context = window(max_tokens=10)
+    prompt = context.build([{"role": "user", "content": "x" * 100}])
+    assert len(prompt) == 1
+    assert context.last_stats["over_budget"] == 1
+    assert context.over_budget == 1
@@ -0,0 +1,117 @@
+import asyncio
+import time
+
+from utils.conversation_store import ConversationStore
+
+
+def history(turn: int):
+    return [
+        {"role": "user", "content": f"question {turn}"},
+        {"role": "assistant", "content": f"answer {turn}"},
+    ]
+
+
+def test_evicted_history_is_readable_while_being_written(tmp_path):
+    async def run():
+        store = ConversationStore(path=str(tmp_path / "sessions.db"), max_conversations=1)
+        write = store._write
+
+        def slow_write(entries):
+            time.sleep(0.2)
+            write(entries)
+
+        store._write = slow_write
+        await store.save("a", history(0))
+        # Saving "b" evicts "a"; read it while its write is in flight
+        saving = asyncio.create_task(store.save("b", history(1)))
+        await asyncio.sleep(0.05)
+        assert await store.get("a") == history(0)
+        await saving
+        await store.close()
+
+        reopened = ConversationStore(path=str(tmp_path / "sessions.db"), max_conversations=1)
+        assert await reopened.get("a") == history(0)
+        assert await reopened.get("b") == history(1)
+        await reopened.close()
+
+    asyncio.run(run())
+
+
+def test_evicted_history_survives_restart(tmp_path):
+    async def run():
+        store = ConversationStore(path=str(tmp_path / "sessions.db"), max_conversations=2)
+        for turn in range(5):
+            await store.save(f"c{turn}", history(turn))
+        await store.close()
+
+        reopened = ConversationStore(path=str(tmp_path / "sessions.db"), max_conversations=2)
+        for turn in range(5):
+            assert await reopened.get(f"c{turn}") == history(turn)
+        assert await reopened.get("unknown") is None
+        await reopened.close()
+
+    asyncio.run(run())
+
+
+def test_delete_during_eviction_write_stays_deleted(tmp_path):
+    async def run():
+        store = ConversationStore(path=str(tmp_path / "sessions.db"), max_conversations=1)
+        write = store._write
+
+        def slow_write(entries):
+            time.sleep(0.2)
+            write(entries)
+
+        store._write = slow_write
+        await store.save("a", history(0))
+        saving = asyncio.create_task(store.save("b", history(1)))
+        await asyncio.sleep(0.05)
+        assert await store.delete("a")
+        await saving
+        assert await store.get("a") is None
+        await store.close()
+
+        reopened = ConversationStore(path=str(tmp_path / "sessions.db"), max_conversations=1)
+        assert await reopened.get("a") is None
+        await reopened.close()
+
+    asyncio.run(run())
+
+
+def test_failed_write_keeps_history_dirty(tmp_path):
+    async def run():
+        store = ConversationStore(path=str(tmp_path / "sessions.db"), max_conversations=1)
+        write = store._write
+
+        def failing_write(entries):
+            raise OSError("disk full")
+
+        store._write = failing_write
+        await store.save("a", history(0))
+        await store.save("b", history(1))
+        await store.flush()
+        # Neither the evicted nor the flushed history was lost
+        assert store.stats()["unsaved"] == 2
+
+        store._write = write
+        await store.close()
+        reopened = ConversationStore(path=str(tmp_path / "sessions.db"), max_conversations=2)
+        assert await reopened.get("a") == history(0)
+        assert await reopened.get("b") == history(1)
+        await reopened.close()
+
+    asyncio.run(run())
+
+
+def test_trim_keeps_a_turn_longer_than_the_window(tmp_path):
+    store = ConversationStore(path=str(tmp_path / "sessions.db"), max_messages=3)
+    turn = [
+        {"role": "user", "content": "question"},
+        {"role": "assistant", "tool_calls": [{"id": "1"}]},
+        {"role": "tool", "tool_call_id": "1", "content": "result"},
+        {"role": "assistant", "tool_calls": [{"id": "2"}]},
+        {"role": "tool", "tool_call_id": "2", "content": "result"},
+        {"role": "assistant", "content": "answer"},
+    ]
+    assert store._trim(history(0) + turn) == turn
+    assert store._trim(history(0) + history(1) + history(2)) == history(2)
@@ -0,0 +1,37 @@
+import pytest
+
+from mcp_hello.docs_store import DocumentStore
+
+PRIMER = {"id": "primer", "title": "How to Use MCP Servers", "body": "MCP servers expose tools.", "source": "builtin"}
+
+
+def test_empty_index_is_seeded(tmp_path):
+    store = DocumentStore(str(tmp_path / "docs.db"))
+    assert store.seed([PRIMER]) == {"added": 1, "updated": 0, "unchanged": 0}
+    overview = store.overview()
+    assert overview["documents"] == 1
+    assert overview["recent"][0]["excerpt"] == PRIMER["body"]
+    assert store.search("tools")["total"] == 1
+    store.close()
+
+
+def test_existing_index_is_not_seeded(tmp_path):
+    store = DocumentStore(str(tmp_path / "docs.db"))
+    store.ingest([{"id": "own", "title": "Own docs", "body": "Project specific notes"}])
+    assert DocumentStore(store.path).seed([PRIMER]) is None
+    assert store.overview()["documents"] == 1
+    store.close()
+
+
+def test_failed_seed_is_retried(tmp_path):
+    store = DocumentStore(str(tmp_path / "docs.db"))
+
+    def unreadable():
+        raise OSError("documents unavailable")
+        yield
+
+    with pytest.raises(OSError):
+        store.seed(unreadable())
+    assert store.seed([PRIMER]) == {"added": 1, "updated": 0, "unchanged": 0}
+    assert store.seed([PRIMER]) is None
+    store.close()
@@ -0,0 +1,90 @@
+import asyncio
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from mcp_hello.http_client_example import MCPHttpClient
+
+
+def response(request):
+    if request["method"] == "bad":
+        return {"jsonrpc": "2.0", "id": request["id"], "error": {"code": -32601, "message": "Method not found"}}
+    return {"jsonrpc": "2.0", "id": request["id"], "result": {"method": request["method"]}}
+
+
+async def serve(batch_status, batch_body):
+    """A server answering single requests normally and arrays via the given
+    status and body builder"""
+
+    async def handle(request):
+        payload = await request.json()
+        if isinstance(payload, list):
+            return web.json_response(batch_body(payload), status=batch_status)
+        if "id" not in payload:
+            return web.Response(status=202)
+        return web.json_response(response(payload))
+
+    app = web.Application()
+    app.router.add_post("/mcp/", handle)
+    server = TestServer(app)
+    await server.start_server()
+    return server
+
+
+def run_batch(batch_status, batch_body, requests):
+    async def run():
+        server = await serve(batch_status, batch_body)
+        try:
+            async with MCPHttpClient(str(server.make_url("/mcp/")), verbose=False) as client:
+                results = await client.batch(requests, return_exceptions=True)
+                return client.supports_batch, results
+        finally:
+            await server.close()
+
+    return asyncio.run(run())
+
+
+def test_error_for_one_request_keeps_batching_enabled():
+    for status in (200, 400):
+        supports_batch, results = run_batch(
+            status, lambda payload: [response(request) for request in payload], [("ping", {}), ("bad", {})]
+        )
+        assert supports_batch
+        assert results[0] == {"method": "ping"}
+        assert "Method not found" in str(results[1])
+
+
+def test_rejected_array_falls_back_to_concurrent_requests():
+    for rejected_id in (None, "server-error"):
+        supports_batch, results = run_batch(
+            400,
+            lambda payload: {"jsonrpc": "2.0", "id": rejected_id, "error": {"code": -32600, "message": "Invalid Request"}},
+            [("ping", {}), ("bad", {})],
+        )
+        assert not supports_batch
+        assert results[0] == {"method": "ping"}
+        assert isinstance(results[1], Exception)
+
+
+def test_non_json_400_is_raised():
+    async def run():
+        async def handle(request):
+            payload = await request.json()
+            if isinstance(payload, list):
+                return web.Response(status=400, text="bad request")
+            return web.json_response(response(payload))
+
+        app = web.Application()
+        app.router.add_post("/mcp/", handle)
+        server = TestServer(app)
+        await server.start_server()
+        try:
+            async with MCPHttpClient(str(server.make_url("/mcp/")), verbose=False) as client:
+                with pytest.raises(Exception):
+                    await client.batch([("ping", {})])
+                return client.supports_batch
+        finally:
+            await server.close()
+
+    assert asyncio.run(run())
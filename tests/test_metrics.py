@@ -0,0 +1,84 @@
+import asyncio
+import os
+import time
+
+from fastmcp import Client
+
+from mcp_hello.metrics import STALE_INTERVALS, UNKNOWN, MetricsMiddleware, MetricsRegistry
+from mcp_hello.server import metrics, mcp
+
+
+def test_unknown_names_share_one_series():
+    async def run():
+        async with Client(mcp) as client:
+            for index in range(5):
+                await client.call_tool("say_hello", {"request": {"name": "Ada"}})
+                await client.call_tool_mcp(f"nope_{index}", {})
+                try:
+                    await client.read_resource(f"file://bogus-{index}")
+                except Exception:
+                    pass
+
+    asyncio.run(run())
+    names = {name for _, name in metrics._series}
+    assert "say_hello" in names
+    assert UNKNOWN in names
+    assert not any(name.startswith(("nope_", "file://bogus")) for name in names)
+    assert metrics._series[("tool", UNKNOWN)].calls >= 5
+
+
+def test_published_counters_of_workers_are_summed(tmp_path):
+    async def run():
+        workers = [MetricsRegistry(shared_dir=str(tmp_path)) for _ in range(2)]
+        for registry in workers:
+            registry.finish(registry.start("tool", "say_hello"), 0.01)
+            registry._publisher.cancel()
+        return workers
+
+    first, second = asyncio.run(run())
+    # Both registries live in this process, so give them distinct files
+    first.publish()
+    (tmp_path / f"{os.getpid()}.json").rename(tmp_path / "worker-1.json")
+    merged = second.merged_series()
+    assert merged[("tool", "say_hello")].calls == 2
+    assert 'mcp_requests_total{kind="tool",name="say_hello"} 2' in second.render_prometheus()
+
+
+def test_registered_names_are_not_listed_per_request(monkeypatch):
+    middleware = next(m for m in mcp.middleware if isinstance(m, MetricsMiddleware))
+    listed = []
+    get_tools = type(mcp).get_tools
+
+    async def counting_get_tools(self):
+        listed.append(1)
+        return await get_tools(self)
+
+    monkeypatch.setattr(type(mcp), "get_tools", counting_get_tools)
+    middleware._tools = set()
+    middleware._refreshed_at.clear()
+
+    async def run():
+        async with Client(mcp) as client:
+            listed.clear()
+            for _ in range(5):
+                await client.call_tool("say_hello", {"request": {"name": "Ada"}})
+                await client.call_tool_mcp("nope", {})
+
+    asyncio.run(run())
+    # One refresh for the first miss, none for the later ones
+    assert len(listed) == 1
+
+
+def test_stale_worker_files_are_dropped(tmp_path):
+    registry = MetricsRegistry(shared_dir=str(tmp_path), publish_interval=0.1)
+    registry._get("tool", "say_hello").calls = 1
+    registry.publish()
+    (tmp_path / f"{os.getpid()}.json").rename(tmp_path / "worker-1.json")
+    registry.publish()
+    (tmp_path / f"{os.getpid()}.json").rename(tmp_path / "worker-2.json")
+    assert registry.merged_series()[("tool", "say_hello")].calls == 3
+
+    expired = time.time() - STALE_INTERVALS * registry.publish_interval - 1
+    os.utime(tmp_path / "worker-1.json", (expired, expired))
+    assert registry.merged_series()[("tool", "say_hello")].calls == 2
+    assert not (tmp_path / "worker-1.json").exists()
@@ -0,0 +1,59 @@
+import json
+
+from mcp_hello.sse import SSEParser
+
+STREAM = (
+    b": keep-alive\r\n"
+    b"event: message\r\n"
+    b"id: 7\r\n"
+    b'data: {"jsonrpc": "2.0",\r\n'
+    b'data:  "id": 1}\r\n'
+    b"\r\n"
+    b"data: second\n"
+    b"\n"
+)
+
+
+def parse(chunks):
+    parser = SSEParser()
+    events = []
+    for chunk in chunks:
+        events.extend(parser.feed(chunk))
+    return events + parser.flush()
+
+
+def test_events_are_the_same_for_every_split():
+    expected = parse([STREAM])
+    assert [bytes(event.data) for event in expected] == [b'{"jsonrpc": "2.0",\n "id": 1}', b"second"]
+    assert (expected[0].event, expected[0].id) == ("message", "7")
+    assert expected[1].event is None
+    # Including splits between the CR and LF of a line ending
+    for split in range(1, len(STREAM)):
+        assert parse([STREAM[:split], STREAM[split:]]) == expected
+
+
+def test_byte_at_a_time():
+    assert parse([STREAM[i:i + 1] for i in range(len(STREAM))]) == parse([STREAM])
+
+
+def test_multi_line_data_is_valid_json():
+    event, _ = parse([STREAM])
+    assert json.loads(event.data) == {"jsonrpc": "2.0", "id": 1}
+
+
+def test_line_longer_than_a_chunk():
+    payload = json.dumps({"text": "x" * 100_000}).encode()
+    stream = b"data: " + payload + b"\r\n\r\n"
+    parser = SSEParser()
+    events = []
+    for start in range(0, len(stream), 1000):
+        events.extend(parser.feed(stream[start:start + 1000]))
+        # Nothing is dispatched until the blank line arrives
+        assert events == [] or start + 1000 >= len(stream)
+    assert [bytes(event.data) for event in events] == [payload]
+
+
+def test_trailing_event_without_blank_line():
+    parser = SSEParser()
+    assert parser.feed(b"data: last\r") == []
+    assert [bytes(event.data) for event in parser.flush()] == [b"last"]
@@ -0,0 +1,91 @@
+import asyncio
+import os
+import signal
+import sys
+import time
+
+import pytest
+from mcp import StdioServerParameters
+
+from stdio_pool import StdioSessionPool, StdioWorkerExited
+
+SERVER = StdioServerParameters(
+    command=sys.executable, args=[os.path.join(os.path.dirname(__file__), "stdio_pool_server.py")]
+)
+
+
+async def started(**kwargs) -> StdioSessionPool:
+    pool = StdioSessionPool(SERVER, **kwargs)
+    await pool.initialize()
+    await pool.list_tools()
+    return pool
+
+
+async def wait_for(condition, timeout: float = 15.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("condition not met in time")
+        await asyncio.sleep(0.05)
+
+
+async def worker_pids(pool: StdioSessionPool):
+    results = [await worker.session.call_tool("pid", {}) for worker in pool.workers]
+    return [result.structuredContent["result"] for result in results]
+
+
+def test_round_robin_spreads_calls_over_workers():
+    async def run():
+        pool = await started(size=2, dispatch="round_robin")
+        try:
+            results = [await pool.call_tool("pid", {}) for _ in range(4)]
+            assert len({result.structuredContent["result"] for result in results}) == 2
+        finally:
+            await pool.close()
+
+    asyncio.run(run())
+
+
+def test_crash_during_non_idempotent_call_fails_only_that_call():
+    async def run():
+        pool = await started(size=2)
+        try:
+            with pytest.raises(StdioWorkerExited):
+                await pool.call_tool("crash", {})
+            assert (await pool.call_tool("echo", {"text": "still here"})).isError is False
+            await wait_for(lambda: pool.respawns == 1 and pool.stats()["live"] == 2)
+        finally:
+            await pool.close()
+
+    asyncio.run(run())
+
+
+def test_crash_during_idempotent_call_is_retried(tmp_path):
+    async def run():
+        pool = await started(size=2)
+        try:
+            result = await pool.call_tool("crash_once", {"marker": str(tmp_path / "crashed")})
+            assert result.structuredContent["result"] == "ok"
+            await wait_for(lambda: pool.respawns == 1)
+        finally:
+            await pool.close()
+
+    asyncio.run(run())
+
+
+def test_idle_worker_exit_is_noticed_and_a_spare_takes_over():
+    async def run():
+        pool = await started(size=2, spares=1)
+        try:
+            spare = pool.idle_spares[0]
+            killed = (await worker_pids(pool))[0]
+            os.kill(killed, signal.SIGKILL)
+            # No call is routed to the dead worker to notice it
+            await wait_for(lambda: spare in pool.workers)
+            await wait_for(lambda: pool.respawns == 1 and len(pool.idle_spares) == 1)
+            assert killed not in await worker_pids(pool)
+            assert pool.stats()["live"] == 2
+        finally:
+            await pool.close()
+
+    asyncio.run(run())
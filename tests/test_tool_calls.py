@@ -0,0 +1,64 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from fastmcp import FastMCP
+
+from mcp_client import MCPClient
+from utils import serialization
+
+server = FastMCP("tool-calls-test")
+
+
+@server.tool()
+async def fast(name: str) -> str:
+    return f"hello {name}"
+
+
+@server.tool()
+async def slow() -> str:
+    await asyncio.sleep(5)
+    return "too late"
+
+
+@server.tool()
+async def broken() -> str:
+    raise RuntimeError("boom")
+
+
+def tool_call(call_id: str, name: str, arguments: str = "{}"):
+    return SimpleNamespace(id=call_id, function=SimpleNamespace(name=name, arguments=arguments))
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("NVIDIA_API_KEY", "test")
+    monkeypatch.setenv("MCP_SERVER_PROTOCOL", "inprocess")
+    monkeypatch.setenv("MCP_SERVER_MODULE", "test_tool_calls:server")
+    monkeypatch.setenv("MCP_TOOL_TIMEOUT", "0.5")
+    return MCPClient("nvidia")
+
+
+def test_failed_tool_calls_become_error_results(client):
+    async def run():
+        await client.connect_to_server()
+        try:
+            return await client.call_tools([
+                tool_call("call_0", "slow"),
+                tool_call("call_1", "fast", '{"name": "Ada"}'),
+                tool_call("call_2", "broken"),
+                tool_call("call_3", "fast", "{not json"),
+                tool_call("call_4", "fast", '{"name": "Lin"}'),
+            ])
+        finally:
+            await client.cleanup()
+
+    results = asyncio.run(run())
+    texts = [serialization.tool_result_text(result) for result in results]
+    assert [result.isError for result in results] == [True, False, True, True, False]
+    assert "Timed out" in texts[0]
+    assert "hello Ada" in texts[1]
+    assert "boom" in texts[2]
+    assert "invalid JSON arguments" in texts[3]
+    assert "hello Lin" in texts[4]
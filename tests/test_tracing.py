@@ -0,0 +1,26 @@
+import json
+
+from utils.tracing import JsonLinesExporter, Tracer
+
+
+def test_jsonl_spans_are_written_by_the_writer_thread(tmp_path):
+    path = tmp_path / "traces" / "spans.jsonl"
+    exporter = JsonLinesExporter(str(path), flush_interval=0.01)
+    tracer = Tracer([exporter])
+    for turn in range(250):
+        with tracer.span("llm", turn=turn):
+            pass
+    tracer.close()
+
+    spans = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [span["attributes"]["turn"] for span in spans] == list(range(250))
+    assert exporter.dropped == 0
+
+
+def test_spans_beyond_the_queue_are_dropped(tmp_path):
+    exporter = JsonLinesExporter(str(tmp_path / "spans.jsonl"), max_queue_size=1)
+    # No writer thread draining the queue
+    exporter._thread = object()
+    for turn in range(3):
+        exporter.export({"name": "llm", "attributes": {"turn": turn}})
+    assert exporter.dropped == 2